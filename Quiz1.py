@@ -3,19 +3,18 @@ Quiz de Economía/Finanzas con ML - Versión Mejorada
 """
 import sys
 import os
-import sqlite3
-import random
+import base64
+import getpass
 
 # Verificar e instalar dependencias automáticamente si es necesario
 try:
     import tkinter as tk
-    from tkinter import ttk, messagebox
-    import pandas as pd
-    import numpy as np
-    import matplotlib
-    matplotlib.use('TkAgg')
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import matplotlib.pyplot as plt
+    from tkinter import messagebox
+    from importlib.util import find_spec
+    # pandas, numpy y matplotlib sólo se verifican aquí; se importan al usarlos
+    for _modulo in ("pandas", "numpy", "matplotlib"):
+        if find_spec(_modulo) is None:
+            raise ImportError(f"No module named '{_modulo}'")
 except ImportError as e:
     print(f"Error: {e}")
     print("Instalando dependencias necesarias...")
@@ -27,49 +26,24 @@ except ImportError as e:
         print(f"Error instalando dependencias: {install_error}")
     sys.exit(1)
 
+from esquema import insertar_preguntas
+from banco import RUTA_INSTANTANEA, BancoPreguntas as BancoComun, DatabaseManager as GestorComun
+from motor_quiz import MAX_PREGUNTAS, SEGUNDOS_POR_PREGUNTA, QuizEngine
+from cronometro import CuentaRegresiva, formato_reloj
+from registro_intentos import EscritorIntentos
+from render_graficos import RenderizadorGraficos
+from tareas import EjecutorTareas
+from controles import NavegadorPreguntas, ListaTemasVirtual
+from pantallas import GestorPantallas
+from agregados import ResumenResultados
+
 print("Iniciando aplicación Quiz...")
 
 # =============== BASE DE DATOS MEJORADA ===============
 
-class DatabaseManager:
+class DatabaseManager(GestorComun):
     """Gestor de base de datos SQLite integrada con más preguntas"""
     
-    def __init__(self):
-        self.db_path = "quiz_economia.db"
-        self.init_database()
-    
-    def init_database(self):
-        """Inicializa la base de datos con preguntas de 3 dificultades"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Crear tabla de preguntas
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS preguntas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                categoria TEXT NOT NULL,
-                tema TEXT NOT NULL,
-                dificultad INTEGER NOT NULL CHECK (dificultad IN (1, 2, 3)),
-                pregunta TEXT NOT NULL,
-                opcion_a TEXT NOT NULL,
-                opcion_b TEXT NOT NULL,
-                opcion_c TEXT NOT NULL,
-                opcion_d TEXT NOT NULL,
-                correcta TEXT NOT NULL CHECK (correcta IN ('a', 'b', 'c', 'd'))
-            )
-        ''')
-        
-        # Verificar si ya hay datos
-        cursor.execute("SELECT COUNT(*) FROM preguntas")
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            self._insertar_datos_ejemplo(cursor)
-        
-        conn.commit()
-        conn.close()
-        print(f"Base de datos inicializada con {count} preguntas existentes")
-    
     def _insertar_datos_ejemplo(self, cursor):
         """Inserta preguntas de ejemplo con 3 niveles de dificultad - MÁS PREGUNTAS"""
         preguntas = [
@@ -371,171 +345,30 @@ class DatabaseManager:
              'Solo amplifica ganancias', 'Solo amplifica pérdidas', 'b')
         ]
         
-        cursor.executemany('''
-            INSERT INTO preguntas (categoria, tema, dificultad, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', preguntas)
+        insertar_preguntas(cursor, preguntas)
         
         print(f"Insertadas {len(preguntas)} preguntas en la base de datos")
 
-    def obtener_preguntas(self, categorias, temas, dificultad=None):
-        """Obtiene preguntas filtradas de la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-            SELECT * FROM preguntas 
-            WHERE categoria IN ({}) AND tema IN ({})
-        '''.format(','.join('?' * len(categorias)), ','.join('?' * len(temas)))
-        
-        params = categorias + temas
-        
-        if dificultad:
-            query += ' AND dificultad = ?'
-            params.append(dificultad)
-        
-        query += ' ORDER BY RANDOM()'
-        
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
-        
-        return df
-
-    def obtener_temas_disponibles(self, categorias):
-        """Obtiene temas disponibles para las categorías dadas"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-            SELECT DISTINCT tema FROM preguntas 
-            WHERE categoria IN ({})
-            ORDER BY tema
-        '''.format(','.join('?' * len(categorias)))
-        
-        cursor = conn.cursor()
-        cursor.execute(query, categorias)
-        temas = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        
-        return temas
-
-    def obtener_estadisticas_dificultad(self):
-        """Obtiene estadísticas por dificultad"""
-        conn = sqlite3.connect(self.db_path)
-        query = '''
-            SELECT dificultad, COUNT(*) as cantidad 
-            FROM preguntas 
-            GROUP BY dificultad 
-            ORDER BY dificultad
-        '''
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
-
 # =============== MÓDULOS DEL QUIZ ===============
 
-class BancoPreguntas:
+class BancoPreguntas(BancoComun):
     """Gestión de preguntas desde base de datos"""
     
-    def __init__(self):
-        self.db = DatabaseManager()
-    
-    def temas_disponibles(self, categorias):
-        return self.db.obtener_temas_disponibles(categorias)
-    
-    def filtrar(self, categorias, temas, dificultad=None):
-        return self.db.obtener_preguntas(categorias, temas, dificultad)
-    
-    def samplear(self, df, n=8):
-        if len(df) <= n:
-            return df.copy()
-        return df.sample(n=n, random_state=42).copy()
-    
-    def mostrar_estadisticas(self):
-        """Muestra estadísticas de la base de datos"""
-        return self.db.obtener_estadisticas_dificultad()
-
-class QuizEngine:
-    """Lógica del quiz integrada"""
-    
-    def __init__(self, df_preguntas):
-        self.df_preguntas = df_preguntas.reset_index(drop=True)
-        self.total = len(df_preguntas)
-        self.idx = 0
-        self.elegidas = [''] * self.total
-        self.tiempos = [0] * self.total
-        self.inicio_pregunta = None
-    
-    def pregunta_actual(self):
-        if self.idx < self.total:
-            return self.df_preguntas.iloc[self.idx]
-        return None
-    
-    def iniciar_pregunta(self):
-        self.inicio_pregunta = pd.Timestamp.now()
-    
-    def marcar_respuesta(self, letra):
-        self.elegidas[self.idx] = letra
-    
-    def ir_siguiente(self):
-        if self.idx < self.total - 1:
-            if self.inicio_pregunta is not None:
-                fin = pd.Timestamp.now()
-                self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-            self.idx += 1
-            return True
-        return False
-    
-    def ir_anterior(self):
-        if self.idx > 0:
-            if self.inicio_pregunta is not None:
-                fin = pd.Timestamp.now()
-                self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-            self.idx -= 1
-            return True
-        return False
-    
-    def finalizar(self):
-        if self.inicio_pregunta is not None and self.tiempos[self.idx] == 0:
-            fin = pd.Timestamp.now()
-            self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-        
-        correctas = 0
-        resultados = []
-        
-        for i in range(self.total):
-            pregunta = self.df_preguntas.iloc[i]
-            elegida = self.elegidas[i]
-            correcta = str(pregunta['correcta']).lower().strip()
-            es_correcta = (elegida != '' and elegida.lower() == correcta)
-            
-            if es_correcta:
-                correctas += 1
-            
-            resultados.append({
-                'id': pregunta['id'],
-                'categoria': pregunta['categoria'],
-                'tema': pregunta['tema'],
-                'dificultad': pregunta['dificultad'],
-                'pregunta': pregunta['pregunta'],
-                'opcion_elegida': elegida,
-                'correcta': correcta,
-                'correcta_bool': es_correcta,
-                'tiempo_seg': self.tiempos[i]
-            })
-        
-        df_resultados = pd.DataFrame(resultados)
-        return correctas, self.total, df_resultados
+    gestor = DatabaseManager
 
 # =============== GRÁFICAS MEJORADAS ===============
 
-def grafico_barras_por_tema(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
+def grafico_barras_por_tema(fig, resumen):
+    ax = fig.subplots()
     try:
-        if 'tema' in df.columns and 'correcta_bool' in df.columns:
-            resultado_por_tema = df.groupby('tema')['correcta_bool'].mean() * 100
-            bars = ax.bar(resultado_por_tema.index, resultado_por_tema.values, color='skyblue')
+        if resumen.n:
+            por_tema = resumen.por_tema
+            bars = ax.bar(por_tema.etiquetas, por_tema.porcentajes, color='skyblue')
             ax.set_title('Aciertos por Tema')
             ax.set_ylabel('Porcentaje Correcto (%)')
-            plt.xticks(rotation=45, ha='right')
+            ax.tick_params(axis='x', labelrotation=45)
+            for etiqueta in ax.get_xticklabels():
+                etiqueta.set_horizontalalignment('right')
             
             # Agregar valores en las barras
             for bar in bars:
@@ -547,15 +380,12 @@ def grafico_barras_por_tema(df):
     fig.tight_layout()
     return fig
 
-def grafico_linea_evolucion(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
+def grafico_linea_evolucion(fig, resumen):
+    ax = fig.subplots()
     try:
-        if 'correcta_bool' in df.columns:
-            df_sorted = df.reset_index(drop=True)
-            acumulado_correcto = df_sorted['correcta_bool'].cumsum()
-            preguntas = range(1, len(df_sorted) + 1)
-            porcentaje_acumulado = (acumulado_correcto / preguntas) * 100
-            ax.plot(preguntas, porcentaje_acumulado, marker='o', linewidth=2, markersize=4, color='green')
+        if resumen.n:
+            preguntas = range(1, resumen.n + 1)
+            ax.plot(preguntas, resumen.acumulado, marker='o', linewidth=2, markersize=4, color='green')
             ax.set_title('Evolución del Desempeño')
             ax.set_xlabel('Número de Pregunta')
             ax.set_ylabel('Porcentaje Acumulado (%)')
@@ -569,14 +399,13 @@ def grafico_linea_evolucion(df):
     fig.tight_layout()
     return fig
 
-def grafico_dificultad(df):
+def grafico_dificultad(fig, resumen):
     """Gráfico para mostrar desempeño por dificultad"""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    ax = fig.subplots()
     try:
-        if 'dificultad' in df.columns and 'correcta_bool' in df.columns:
-            resultado_por_dificultad = df.groupby('dificultad')['correcta_bool'].mean() * 100
+        if resumen.n:
             dificultades = ['Fácil', 'Medio', 'Difícil']
-            valores = [resultado_por_dificultad.get(i, 0) for i in range(1, 4)]
+            valores = [resumen.por_dificultad.porcentaje(i) for i in range(1, 4)]
             colors = ['#4CAF50', '#FF9800', '#F44336']  # Verde, Naranja, Rojo
             bars = ax.bar(dificultades, valores, color=colors)
             ax.set_title('Desempeño por Dificultad')
@@ -596,16 +425,16 @@ def grafico_dificultad(df):
     fig.tight_layout()
     return fig
 
-def grafico_desempeno_comparativo(df):
+def grafico_desempeno_comparativo(fig, resumen):
     """NUEVA GRÁFICA: Compara desempeño por categoría y dificultad"""
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
+    ax1, ax2 = fig.subplots(1, 2)
     
     try:
-        # Gráfico 1: Desempeño por categoría
-        if 'categoria' in df.columns and 'correcta_bool' in df.columns:
-            resultado_por_categoria = df.groupby('categoria')['correcta_bool'].mean() * 100
-            categorias = [cat.capitalize() for cat in resultado_por_categoria.index]
-            bars1 = ax1.bar(categorias, resultado_por_categoria.values, 
+        if resumen.n:
+            # Gráfico 1: Desempeño por categoría
+            por_categoria = resumen.por_categoria
+            categorias = [cat.capitalize() for cat in por_categoria.etiquetas]
+            bars1 = ax1.bar(categorias, por_categoria.porcentajes, 
                            color=['#FF6B6B', '#4ECDC4', '#45B7D1'])
             ax1.set_title('Desempeño por Categoría')
             ax1.set_ylabel('Porcentaje Correcto (%)')
@@ -615,11 +444,9 @@ def grafico_desempeno_comparativo(df):
                 ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
                         f'{height:.1f}%', ha='center', va='bottom')
         
-        # Gráfico 2: Distribución de preguntas por dificultad
-        if 'dificultad' in df.columns:
-            distribucion = df['dificultad'].value_counts().sort_index()
+            # Gráfico 2: Distribución de preguntas por dificultad
             labels = ['Fácil', 'Medio', 'Difícil']
-            sizes = [distribucion.get(i, 0) for i in range(1, 4)]
+            sizes = [resumen.por_dificultad.total(i) for i in range(1, 4)]
             colors = ['#4CAF50', '#FF9800', '#F44336']
             ax2.pie(sizes, labels=labels, colors=colors, autopct='%1.1f%%', startangle=90)
             ax2.set_title('Distribución de Dificultad')
@@ -633,26 +460,8 @@ def grafico_desempeno_comparativo(df):
 
 # =============== INTERFAZ MEJORADA ===============
 
-class ScrollableFrame(tk.Frame):
-    """Frame con scroll para mejor visualización de temas"""
-    def __init__(self, parent, *args, **kwargs):
-        tk.Frame.__init__(self, parent, *args, **kwargs)
-        
-        # Crear canvas y scrollbar
-        self.canvas = tk.Canvas(self, borderwidth=0, background="#ffffff")
-        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, background="#ffffff")
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-        
-        self.canvas.pack(side="left", fill="both", expand=True)
-        self.scrollbar.pack(side="right", fill="y")
+# Colores suaves diferentes para cada opción de respuesta
+COLORES_OPCIONES = ['#E8F5E8', '#E8F4FD', '#FFF4E8', '#FDE8E8']
 
 class QuizApp:
     def __init__(self, root):
@@ -666,37 +475,91 @@ class QuizApp:
         self.sel_macro = tk.BooleanVar(value=True)
         self.sel_fin = tk.BooleanVar(value=True)
         self.dificultad = tk.StringVar(value="todas")
-        self.temas_vars = {}
+        self.n_preguntas = tk.StringVar(value="8")
+        # 'azar' (clave precalculada) o 'reservorio' (una pasada por el cursor)
+        self.metodo_muestreo = tk.StringVar(value='azar')
+        
+        # Cargar datos desde base de datos en segundo plano, para que la
+        # pantalla de inicio aparezca sin esperar a SQLite ni a pandas
+        self.banco = None
+        self.registro = None
+        self.renderizador = RenderizadorGraficos()
+        # Las consultas al banco corren fuera del hilo de Tk
+        self.tareas = EjecutorTareas(self.root)
+        
+        # Cada pantalla se construye una sola vez; navegar sólo las alterna
+        self.pantallas = GestorPantallas(self.root)
+        self.pantallas.registrar('inicio', self._construir_inicio)
+        self.pantallas.registrar('configuracion', self._construir_configuracion)
+        self.pantallas.registrar('quiz', self._construir_quiz)
+        self.pantallas.registrar('resultados', self._construir_resultados)
         
-        # Cargar datos desde base de datos
-        self.banco = BancoPreguntas()
+        self.mostrar_inicio()
+        self.tareas.lanzar('banco', self._cargar_banco, al_terminar=self._banco_cargado,
+                           al_fallar=self._error_banco)
+    
+    @staticmethod
+    def _cargar_banco():
+        """Hilo de fondo: inicializa la base de datos y lee las estadísticas"""
+        # Con una instantánea exportada (python instantanea.py) no hace falta cargar el índice
+        ruta = RUTA_INSTANTANEA if os.path.exists(RUTA_INSTANTANEA) else None
+        banco = BancoPreguntas(indice_memoria=True, instantanea=ruta)
+        return banco, banco.mostrar_estadisticas()
+    
+    def _error_banco(self, error):
+        messagebox.showerror("Error", f"No se pudo cargar la base de datos:\n{error}")
+    
+    def _error_consulta(self, error):
+        messagebox.showerror("Error", f"No se pudo consultar la base de datos:\n{error}")
+    
+    def _banco_cargado(self, resultado):
+        """Hilo de Tk: guarda el banco ya cargado y completa la pantalla de inicio"""
+        banco, stats = resultado
+        self.banco = banco
+        self.registro = EscritorIntentos(banco.db.conexiones)
         
         # Mostrar estadísticas iniciales
-        stats = self.banco.mostrar_estadisticas()
         print("Estadísticas de la base de datos:")
         for _, row in stats.iterrows():
             print(f"Dificultad {row['dificultad']}: {row['cantidad']} preguntas")
         
-        self.mostrar_inicio()
-    
-    def limpiar_pantalla(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+        self._mostrar_estadisticas_inicio(stats)
     
     def mostrar_inicio(self):
-        self.limpiar_pantalla()
+        self.pantallas.mostrar('inicio')
         
+        if self.banco is not None:
+            self.tareas.lanzar('estadisticas', self.banco.mostrar_estadisticas,
+                               al_terminar=self._mostrar_estadisticas_inicio,
+                               al_fallar=self._error_consulta)
+    
+    def _construir_inicio(self, marco):
         # Título principal
-        titulo = tk.Label(self.root, text="🎓 Quiz de Economía y Finanzas", 
+        titulo = tk.Label(marco, text="🎓 Quiz de Economía y Finanzas", 
                          font=('Arial', 20, 'bold'), bg='white', fg='navy')
         titulo.pack(pady=30)
         
-        subtitulo = tk.Label(self.root, text="Base de Datos con 60+ Preguntas y 3 Niveles de Dificultad", 
+        subtitulo = tk.Label(marco, text="Base de Datos con 60+ Preguntas y 3 Niveles de Dificultad", 
                            font=('Arial', 12), bg='white', fg='gray')
         subtitulo.pack(pady=5)
         
-        # Estadísticas rápidas
-        stats = self.banco.mostrar_estadisticas()
+        # Estadísticas rápidas (se completan cuando termina la carga del banco)
+        self.lbl_stats = tk.Label(marco, text="Cargando preguntas...", 
+                                 font=('Arial', 11), bg='white', justify='left')
+        self.lbl_stats.pack(pady=10)
+        
+        # Botón para comenzar
+        self.btn_comenzar = tk.Button(marco, text="Comenzar Quiz", 
+                                     font=('Arial', 14, 'bold'), bg='green', fg='white',
+                                     command=self.mostrar_configuracion,
+                                     width=20, height=2, state='disabled')
+        self.btn_comenzar.pack(pady=30)
+    
+    def _mostrar_estadisticas_inicio(self, stats):
+        """Completa la pantalla de inicio con las estadísticas del banco"""
+        if not self.lbl_stats.winfo_exists():
+            return
+        
         stats_text = "Preguntas disponibles:\n"
         total_preguntas = 0
         for _, row in stats.iterrows():
@@ -706,25 +569,22 @@ class QuizApp:
         
         stats_text += f"\nTotal: {total_preguntas} preguntas"
         
-        lbl_stats = tk.Label(self.root, text=stats_text, 
-                           font=('Arial', 11), bg='white', justify='left')
-        lbl_stats.pack(pady=10)
-        
-        # Botón para comenzar
-        btn_comenzar = tk.Button(self.root, text="Comenzar Quiz", 
-                               font=('Arial', 14, 'bold'), bg='green', fg='white',
-                               command=self.mostrar_configuracion,
-                               width=20, height=2)
-        btn_comenzar.pack(pady=30)
+        self.lbl_stats.config(text=stats_text)
+        self.btn_comenzar.config(state='normal')
     
     def mostrar_configuracion(self):
-        self.limpiar_pantalla()
-        
-        titulo = tk.Label(self.root, text="Configurar Quiz", 
+        self.pantallas.mostrar('configuracion')
+        # Un muestreo lanzado desde una configuración anterior ya no corresponde
+        self.tareas.cancelar('quiz')
+        self.btn_iniciar.config(state='normal', text="🎯 Comenzar Quiz")
+        self.actualizar_temas()
+    
+    def _construir_configuracion(self, marco):
+        titulo = tk.Label(marco, text="Configurar Quiz", 
                          font=('Arial', 18, 'bold'), bg='white')
         titulo.pack(pady=20)
         
-        main_frame = tk.Frame(self.root, bg='white')
+        main_frame = tk.Frame(marco, bg='white')
         main_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
         # Categorías
@@ -744,9 +604,9 @@ class QuizApp:
                                    bg='white', padx=10, pady=10)
         temas_frame.pack(side='left', fill='both', expand=True, padx=10)
         
-        # Frame scrollable para temas
-        self.scrollable_temas = ScrollableFrame(temas_frame, height=200)
-        self.scrollable_temas.pack(fill='both', expand=True)
+        # Lista de temas virtual: sólo crea casillas para las filas visibles
+        self.lista_temas = ListaTemasVirtual(temas_frame, height=200)
+        self.lista_temas.pack(fill='both', expand=True)
         
         # Dificultad
         dificultad_frame = tk.LabelFrame(main_frame, text="Nivel de Dificultad", font=('Arial', 11, 'bold'),
@@ -762,46 +622,51 @@ class QuizApp:
         tk.Radiobutton(dificultad_frame, text="🎯 Difícil (Nivel 3)", variable=self.dificultad, 
                       value="3", font=('Arial', 10), bg='white', fg='red').pack(anchor='w', pady=5)
         
+        # Número de preguntas (exámenes de práctica de hasta MAX_PREGUNTAS)
+        tk.Label(dificultad_frame, text="Número de preguntas:", font=('Arial', 10, 'bold'),
+                bg='white').pack(anchor='w', pady=(15, 2))
+        tk.Spinbox(dificultad_frame, from_=1, to=MAX_PREGUNTAS, textvariable=self.n_preguntas,
+                   font=('Arial', 10), width=8).pack(anchor='w')
+        
+        # Cómo se eligen las preguntas (ver BancoPreguntas.muestrear)
+        tk.Label(dificultad_frame, text="Selección de preguntas:", font=('Arial', 10, 'bold'),
+                bg='white').pack(anchor='w', pady=(15, 2))
+        tk.Radiobutton(dificultad_frame, text="Rápida (clave aleatoria)", variable=self.metodo_muestreo,
+                      value='azar', font=('Arial', 10), bg='white').pack(anchor='w')
+        tk.Radiobutton(dificultad_frame, text="Uniforme (recorre la selección)", variable=self.metodo_muestreo,
+                      value='reservorio', font=('Arial', 10), bg='white').pack(anchor='w')
+        
         # Botones
-        btn_frame = tk.Frame(self.root, bg='white')
+        btn_frame = tk.Frame(marco, bg='white')
         btn_frame.pack(fill='x', pady=20)
         
         tk.Button(btn_frame, text="Volver al Inicio", font=('Arial', 10),
                  command=self.mostrar_inicio).pack(side='left', padx=20)
         
-        tk.Button(btn_frame, text="🎯 Comenzar Quiz", font=('Arial', 12, 'bold'), bg='blue', fg='white',
-                 command=self.iniciar_quiz, width=15).pack(side='right', padx=20)
-        
-        self.actualizar_temas()
+        self.btn_iniciar = tk.Button(btn_frame, text="🎯 Comenzar Quiz", font=('Arial', 12, 'bold'),
+                                     bg='blue', fg='white', command=self.iniciar_quiz, width=15)
+        self.btn_iniciar.pack(side='right', padx=20)
     
     def actualizar_temas(self):
-        # Limpiar frame de temas
-        for widget in self.scrollable_temas.scrollable_frame.winfo_children():
-            widget.destroy()
-        
         categorias = []
         if self.sel_micro.get(): categorias.append('micro')
         if self.sel_macro.get(): categorias.append('macro')
         if self.sel_fin.get(): categorias.append('finanzas')
         
         if not categorias:
-            label = tk.Label(self.scrollable_temas.scrollable_frame, text="Selecciona al menos una categoría", 
-                            font=('Arial', 10), bg='white', fg='gray')
-            label.pack(pady=10)
+            # Una consulta anterior que llegue tarde no debe pisar este aviso
+            self.tareas.cancelar('temas')
+            self.lista_temas.aviso("Selecciona al menos una categoría")
             return
         
-        temas = self.banco.temas_disponibles(categorias)
-        self.temas_vars = {}
-        
-        # Crear checkboxes para cada tema
-        for tema in temas:
-            var = tk.BooleanVar(value=True)
-            self.temas_vars[tema] = var
-            frame_tema = tk.Frame(self.scrollable_temas.scrollable_frame, bg='white')
-            frame_tema.pack(fill='x', pady=2)
-            
-            tk.Checkbutton(frame_tema, text=tema, variable=var,
-                          font=('Arial', 9), bg='white', width=30, anchor='w').pack(side='left')
+        # Cada clic reemplaza la consulta anterior; sólo se dibuja la última
+        self.lista_temas.aviso("Cargando temas...")
+        self.tareas.lanzar('temas', self.banco.temas_disponibles, categorias,
+                           al_terminar=self._mostrar_temas, al_fallar=self._error_consulta)
+    
+    def _mostrar_temas(self, temas):
+        if self.lista_temas.winfo_exists():
+            self.lista_temas.cargar(temas)
     
     def iniciar_quiz(self):
         categorias = []
@@ -813,7 +678,11 @@ class QuizApp:
             messagebox.showwarning("Error", "Selecciona al menos una categoría")
             return
         
-        temas_sel = [tema for tema, var in self.temas_vars.items() if var.get()]
+        if self.tareas.ocupada('temas'):
+            messagebox.showinfo("Un momento", "Todavía se están cargando los temas")
+            return
+        
+        temas_sel = self.lista_temas.seleccionados()
         if not temas_sel:
             messagebox.showwarning("Error", "Selecciona al menos un tema")
             return
@@ -821,13 +690,35 @@ class QuizApp:
         # Procesar dificultad seleccionada
         dificultad_seleccionada = None if self.dificultad.get() == "todas" else int(self.dificultad.get())
         
-        df_filtrado = self.banco.filtrar(categorias, temas_sel, dificultad_seleccionada)
-        if len(df_filtrado) == 0:
-            messagebox.showwarning("Error", "No hay preguntas para esta selección")
+        try:
+            n_preguntas = int(self.n_preguntas.get())
+        except ValueError:
+            n_preguntas = 0
+        if not 1 <= n_preguntas <= MAX_PREGUNTAS:
+            messagebox.showwarning("Error", f"El número de preguntas debe estar entre 1 y {MAX_PREGUNTAS}")
+            return
+        
+        # El muestreo corre en segundo plano; el botón queda deshabilitado mientras tanto
+        self.btn_iniciar.config(state='disabled', text="Preparando...")
+        self.tareas.lanzar('quiz', self.banco.muestrear, categorias, temas_sel,
+                           dificultad_seleccionada, n_preguntas, self.metodo_muestreo.get(),
+                           al_terminar=self._quiz_listo, al_fallar=self._error_quiz)
+    
+    def _error_quiz(self, error):
+        if self.pantallas.actual == 'configuracion':
+            self.btn_iniciar.config(state='normal', text="🎯 Comenzar Quiz")
+        self._error_consulta(error)
+    
+    def _quiz_listo(self, df_quiz):
+        """Hilo de Tk: arranca el quiz con las preguntas muestreadas"""
+        if self.pantallas.actual != 'configuracion':
+            # El usuario salió de la configuración mientras se muestreaba
             return
+        self.btn_iniciar.config(state='normal', text="🎯 Comenzar Quiz")
         
-        n_preguntas = min(8, len(df_filtrado))
-        df_quiz = self.banco.samplear(df_filtrado, n=n_preguntas)
+        if len(df_quiz) == 0:
+            messagebox.showwarning("Error", "No hay preguntas para esta selección")
+            return
         
         # Mostrar info sobre las preguntas seleccionadas
         niveles = df_quiz['dificultad'].value_counts().sort_index()
@@ -837,17 +728,24 @@ class QuizApp:
             info_dificultad += f"• {nombre_nivel}: {cantidad} preguntas\n"
         
         self.quiz = QuizEngine(df_quiz)
-        self.tiempo_restante = 600
+        self.cuenta = None
         self.timer_id = None
         
         messagebox.showinfo("Configuración Lista", info_dificultad)
         self.mostrar_quiz()
     
     def mostrar_quiz(self):
-        self.limpiar_pantalla()
+        self.pantallas.mostrar('quiz')
+        self.navegador.configurar(self.quiz.total, self.quiz.respondidas_en)
         
+        self.cargar_pregunta_actual()
+        # El tiempo disponible crece con el largo del quiz (10 minutos para 8 preguntas)
+        self.cuenta = CuentaRegresiva(SEGUNDOS_POR_PREGUNTA * self.quiz.total)
+        self.iniciar_timer()
+    
+    def _construir_quiz(self, marco):
         # Header con información
-        header_frame = tk.Frame(self.root, bg='lightgray', height=60)
+        header_frame = tk.Frame(marco, bg='lightgray', height=60)
         header_frame.pack(fill='x', padx=10, pady=5)
         header_frame.pack_propagate(False)
         
@@ -863,8 +761,12 @@ class QuizApp:
                                  font=('Arial', 14, 'bold'), bg='lightgray', fg='red')
         self.lbl_timer.pack(side='right', padx=10)
         
+        # Navegador por páginas: salta directamente a cualquier pregunta
+        self.navegador = NavegadorPreguntas(marco, al_elegir=self.ir_a_pregunta)
+        self.navegador.pack(fill='x', padx=10)
+        
         # Pregunta
-        pregunta_frame = tk.LabelFrame(self.root, text="PREGUNTA", font=('Arial', 12, 'bold'),
+        pregunta_frame = tk.LabelFrame(marco, text="PREGUNTA", font=('Arial', 12, 'bold'),
                                       bg='white', padx=20, pady=15)
         pregunta_frame.pack(fill='x', padx=15, pady=10)
         
@@ -873,12 +775,11 @@ class QuizApp:
         self.lbl_pregunta.pack(anchor='w')
         
         # Opciones - MEJOR VISIBILIDAD
-        opciones_frame = tk.LabelFrame(self.root, text="SELECCIONA TU RESPUESTA", 
+        opciones_frame = tk.LabelFrame(marco, text="SELECCIONA TU RESPUESTA", 
                                       font=('Arial', 12, 'bold'), bg='white', padx=20, pady=15)
         opciones_frame.pack(fill='both', expand=True, padx=15, pady=10)
         
         self.botones_opciones = []
-        opciones_colors = ['#E8F5E8', '#E8F4FD', '#FFF4E8', '#FDE8E8']  # Colores suaves diferentes
         
         for i in range(4):
             btn_frame = tk.Frame(opciones_frame, bg='white')
@@ -886,17 +787,17 @@ class QuizApp:
             
             btn = tk.Button(btn_frame, text="", font=('Arial', 11),
                            command=lambda idx=i: self.seleccionar_opcion(idx),
-                           width=80, height=2, bg=opciones_colors[i], 
+                           width=80, height=2, bg=COLORES_OPCIONES[i], 
                            relief='raised', bd=2, anchor='w', justify='left')
             btn.pack(fill='x', padx=5)
             self.botones_opciones.append(btn)
         
         # Feedback
-        self.lbl_feedback = tk.Label(self.root, text="", font=('Arial', 12, 'bold'), bg='white')
+        self.lbl_feedback = tk.Label(marco, text="", font=('Arial', 12, 'bold'), bg='white')
         self.lbl_feedback.pack(pady=10)
         
         # Navegación
-        nav_frame = tk.Frame(self.root, bg='white', pady=20)
+        nav_frame = tk.Frame(marco, bg='white', pady=20)
         nav_frame.pack(fill='x', padx=20, pady=10)
         
         tk.Button(nav_frame, text="← Anterior", font=('Arial', 11),
@@ -907,9 +808,6 @@ class QuizApp:
         
         tk.Button(nav_frame, text="🏁 Finalizar Quiz", font=('Arial', 11, 'bold'), bg='red', fg='white',
                  command=self.finalizar_quiz, width=15).pack(side='right', padx=5)
-        
-        self.cargar_pregunta_actual()
-        self.iniciar_timer()
     
     def cargar_pregunta_actual(self):
         pregunta = self.quiz.pregunta_actual()
@@ -920,6 +818,7 @@ class QuizApp:
         self.quiz.iniciar_pregunta()
         
         self.lbl_info.config(text=f"Pregunta {self.quiz.idx + 1}/{self.quiz.total}")
+        self.navegador.actualizar(self.quiz.idx)
         
         # Mostrar nivel de dificultad con color
         nivel = pregunta['dificultad']
@@ -937,7 +836,7 @@ class QuizApp:
         ]
         
         for i, texto in enumerate(opciones):
-            self.botones_opciones[i].config(text=texto)
+            self.botones_opciones[i].config(text=texto, bg=COLORES_OPCIONES[i])
         
         respuesta_actual = self.quiz.elegidas[self.quiz.idx]
         if respuesta_actual:
@@ -954,16 +853,18 @@ class QuizApp:
         letra = letras[indice]
         self.quiz.marcar_respuesta(letra)
         
-        # Colores originales
-        opciones_colors = ['#E8F5E8', '#E8F4FD', '#FFF4E8', '#FDE8E8']
-        
         for i, btn in enumerate(self.botones_opciones):
             if i == indice:
                 btn.config(bg='lightblue')  # Seleccionado
             else:
-                btn.config(bg=opciones_colors[i])  # Color original
+                btn.config(bg=COLORES_OPCIONES[i])  # Color original
         
         self.lbl_feedback.config(text=f"Seleccionado: {letra.upper()}", fg='blue')
+        self.navegador.marcar(self.quiz.idx)
+    
+    def ir_a_pregunta(self, i):
+        if self.quiz.ir_a(i):
+            self.cargar_pregunta_actual()
     
     def anterior_pregunta(self):
         if self.quiz.ir_anterior():
@@ -979,35 +880,126 @@ class QuizApp:
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
         
-        if self.tiempo_restante <= 0:
+        # Se mide contra un plazo fijo: un tick que llega tarde no se acumula
+        if self.cuenta.vencida():
             messagebox.showinfo("Tiempo agotado", "Se acabó el tiempo del quiz.")
             self.finalizar_quiz()
             return
         
-        minutos = self.tiempo_restante // 60
-        segundos = self.tiempo_restante % 60
-        self.lbl_timer.config(text=f"Tiempo: {minutos:02d}:{segundos:02d}")
+        restante = self.cuenta.segundos_mostrados()
+        self.lbl_timer.config(text=f"Tiempo: {formato_reloj(restante)}")
         
-        self.tiempo_restante -= 1
-        self.timer_id = self.root.after(1000, self.iniciar_timer)
+        self.timer_id = self.root.after(self.cuenta.ms_hasta_tick(), self.iniciar_timer)
     
     def finalizar_quiz(self):
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
         
-        puntaje, total, df_detalle = self.quiz.finalizar()
-        self.mostrar_resultados(puntaje, total, df_detalle)
+        puntaje, total, aciertos = self.quiz.finalizar_compacto()
+        resumen = ResumenResultados.desde_motor(self.quiz, aciertos)
+        
+        # Guardar el intento en segundo plano (no bloquea la interfaz)
+        self.registro.registrar(getpass.getuser(), puntaje, total,
+                                self.quiz.filas_respuestas(aciertos),
+                                duracion_seg=self.cuenta.transcurrido())
+        self.mostrar_resultados(puntaje, total, resumen)
+    
+    def _crear_marcador(self, parent, tamano=(6, 4), **pack):
+        """Label del tamaño de la gráfica donde se colocará su imagen"""
+        vacia = tk.PhotoImage(width=int(tamano[0] * 100), height=int(tamano[1] * 100))
+        marcador = tk.Label(parent, image=vacia, compound='center',
+                            font=('Arial', 11), bg='#F5F5F5', fg='gray')
+        marcador.vacia = vacia
+        marcador.tamano = tamano
+        marcador.futuro = None
+        marcador.pack(**pack)
+        return marcador
+    
+    def _mostrar_grafico(self, marcador, nombre, funcion, resumen):
+        """Vuelve el marcador a su estado vacío y lo reemplaza al llegar la imagen"""
+        marcador.config(image=marcador.vacia, text="Generando gráfica...")
+        marcador.image = marcador.vacia
+        futuro = self.renderizador.solicitar(nombre, funcion, resumen, resumen.clave(), marcador.tamano)
+        marcador.futuro = futuro
+        self._colocar_imagen(marcador, futuro)
     
-    def mostrar_resultados(self, puntaje, total, df_detalle):
-        self.limpiar_pantalla()
+    def _colocar_imagen(self, marcador, futuro):
+        # El marcador puede haberse destruido o estar esperando ya otra gráfica
+        if not marcador.winfo_exists() or marcador.futuro is not futuro:
+            return
+        if not futuro.done():
+            self.root.after(30, self._colocar_imagen, marcador, futuro)
+            return
+        try:
+            imagen = tk.PhotoImage(data=base64.b64encode(futuro.result()), format='png')
+        except Exception as e:
+            marcador.config(text=f"No se pudo generar la gráfica: {e}")
+            return
+        marcador.config(image=imagen, text='')
+        marcador.image = imagen
+    
+    def mostrar_resultados(self, puntaje, total, resumen):
+        self.pantallas.mostrar('resultados')
+        self.canvas_resultados.yview_moveto(0)
+        
+        # Puntaje principal
+        porcentaje = (puntaje / total) * 100 if total > 0 else 0
+        color = 'green' if porcentaje >= 70 else 'orange' if porcentaje >= 50 else 'red'
+        
+        puntaje_text = f"Puntaje Final: {puntaje}/{total} ({porcentaje:.1f}%)"
+        self.lbl_puntaje.config(text=puntaje_text, fg=color)
+        
+        # Mensaje según desempeño
+        if porcentaje >= 80:
+            mensaje = "¡Excelente! Dominas los conceptos económicos y financieros."
+        elif porcentaje >= 60:
+            mensaje = "¡Buen trabajo! Tienes un buen conocimiento de los temas."
+        elif porcentaje >= 40:
+            mensaje = "¡No está mal! Sigue practicando para mejorar."
+        else:
+            mensaje = "¡Sigue estudiando! Revisa los conceptos básicos."
+        
+        self.lbl_mensaje.config(text=mensaje)
+        
+        # Las gráficas se dibujan en segundo plano; mientras tanto se ven marcadores
+        self._mostrar_grafico(self.marcadores['comparativo'], 'comparativo',
+                              grafico_desempeno_comparativo, resumen)
+        self._mostrar_grafico(self.marcadores['dificultad'], 'dificultad', grafico_dificultad, resumen)
+        self._mostrar_grafico(self.marcadores['evolucion'], 'evolucion', grafico_linea_evolucion, resumen)
+        
+        # Agregar datos al texto
+        texto_detalle = self.texto_detalle
+        texto_detalle.config(state='normal')
+        texto_detalle.delete('1.0', 'end')
+        texto_detalle.insert('end', "RESUMEN DE RESPUESTAS:\n\n")
+        
+        for i, (categoria, dificultad, elegida, correcta, acierto) in enumerate(resumen.detalle):
+            estado = "✅ CORRECTO" if acierto else "❌ INCORRECTO"
+            nivel = ["🎯 Fácil", "🎯 Medio", "🎯 Difícil"][dificultad - 1]
+            categoria = categoria.capitalize()
+            
+            texto_detalle.insert('end', f"Pregunta {i+1} | {categoria} | {nivel}\n")
+            texto_detalle.insert('end', f"   Estado: {estado}\n")
+            texto_detalle.insert('end', f"   Tu respuesta: {elegida.upper() if elegida else 'No respondida'}\n")
+            texto_detalle.insert('end', f"   Correcta: {correcta.upper()}\n")
+            
+            # Resaltar preguntas incorrectas
+            if not acierto:
+                texto_detalle.insert('end', f"   ⚠️  Necesitas repasar este tema\n")
+            
+            texto_detalle.insert('end', "-" * 60 + "\n\n")
         
+        texto_detalle.config(state='disabled')
+    
+    def _construir_resultados(self, marco):
         # Frame principal con scroll para resultados
-        main_frame = tk.Frame(self.root, bg='white')
+        main_frame = tk.Frame(marco, bg='white')
         main_frame.pack(fill='both', expand=True)
         
         canvas = tk.Canvas(main_frame, bg='white')
         scrollbar = tk.Scrollbar(main_frame, orient="vertical", command=canvas.yview)
         scrollable_frame = tk.Frame(canvas, bg='white')
+        self.canvas_resultados = canvas
         
         scrollable_frame.bind(
             "<Configure>",
@@ -1022,87 +1014,42 @@ class QuizApp:
                          font=('Arial', 20, 'bold'), bg='white', fg='navy')
         titulo.pack(pady=20)
         
-        # Puntaje principal
-        porcentaje = (puntaje / total) * 100 if total > 0 else 0
-        color = 'green' if porcentaje >= 70 else 'orange' if porcentaje >= 50 else 'red'
+        self.lbl_puntaje = tk.Label(scrollable_frame, font=('Arial', 18, 'bold'), bg='white')
+        self.lbl_puntaje.pack(pady=10)
         
-        puntaje_text = f"Puntaje Final: {puntaje}/{total} ({porcentaje:.1f}%)"
-        lbl_puntaje = tk.Label(scrollable_frame, text=puntaje_text, 
-                              font=('Arial', 18, 'bold'), bg='white', fg=color)
-        lbl_puntaje.pack(pady=10)
-        
-        # Mensaje según desempeño
-        if porcentaje >= 80:
-            mensaje = "¡Excelente! Dominas los conceptos económicos y financieros."
-        elif porcentaje >= 60:
-            mensaje = "¡Buen trabajo! Tienes un buen conocimiento de los temas."
-        elif porcentaje >= 40:
-            mensaje = "¡No está mal! Sigue practicando para mejorar."
-        else:
-            mensaje = "¡Sigue estudiando! Revisa los conceptos básicos."
-        
-        lbl_mensaje = tk.Label(scrollable_frame, text=mensaje, 
-                              font=('Arial', 12), bg='white', fg='gray')
-        lbl_mensaje.pack(pady=5)
+        self.lbl_mensaje = tk.Label(scrollable_frame, font=('Arial', 12), bg='white', fg='gray')
+        self.lbl_mensaje.pack(pady=5)
         
         # GRÁFICAS MEJORADAS
         charts_frame = tk.Frame(scrollable_frame, bg='white')
         charts_frame.pack(fill='x', pady=20, padx=10)
         
         # Gráfico comparativo (nuevo)
-        fig1 = grafico_desempeno_comparativo(df_detalle)
-        canvas1 = FigureCanvasTkAgg(fig1, charts_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill='x', pady=10)
+        self.marcadores = {}
+        self.marcadores['comparativo'] = self._crear_marcador(charts_frame, (10, 4), fill='x', pady=10)
         
         # Más gráficos
         charts_subframe = tk.Frame(charts_frame, bg='white')
         charts_subframe.pack(fill='x', pady=10)
         
-        fig2 = grafico_dificultad(df_detalle)
-        canvas2 = FigureCanvasTkAgg(fig2, charts_subframe)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(side='left', fill='both', expand=True, padx=5)
-        
-        fig3 = grafico_linea_evolucion(df_detalle)
-        canvas3 = FigureCanvasTkAgg(fig3, charts_subframe)
-        canvas3.draw()
-        canvas3.get_tk_widget().pack(side='left', fill='both', expand=True, padx=5)
+        self.marcadores['dificultad'] = self._crear_marcador(
+            charts_subframe, side='left', fill='both', expand=True, padx=5)
+        self.marcadores['evolucion'] = self._crear_marcador(
+            charts_subframe, side='left', fill='both', expand=True, padx=5)
         
         # Detalle de respuestas
         detalle_frame = tk.LabelFrame(scrollable_frame, text="📋 Detalle de Respuestas", 
                                      font=('Arial', 14, 'bold'), bg='white', padx=15, pady=10)
         detalle_frame.pack(fill='x', pady=20, padx=10)
         
-        texto_detalle = tk.Text(detalle_frame, font=('Arial', 10), width=85, height=12,
-                               wrap=tk.WORD, bg='#F9F9F9')
-        scrolltext = tk.Scrollbar(detalle_frame, command=texto_detalle.yview)
-        texto_detalle.configure(yscrollcommand=scrolltext.set)
+        self.texto_detalle = tk.Text(detalle_frame, font=('Arial', 10), width=85, height=12,
+                                     wrap=tk.WORD, bg='#F9F9F9')
+        scrolltext = tk.Scrollbar(detalle_frame, command=self.texto_detalle.yview)
+        self.texto_detalle.configure(yscrollcommand=scrolltext.set)
         
-        texto_detalle.pack(side='left', fill='both', expand=True)
+        self.texto_detalle.pack(side='left', fill='both', expand=True)
         scrolltext.pack(side='right', fill='y')
         
-        # Agregar datos al texto
-        texto_detalle.insert('end', "RESUMEN DE RESPUESTAS:\n\n")
-        
-        for i, row in df_detalle.iterrows():
-            estado = "✅ CORRECTO" if row['correcta_bool'] else "❌ INCORRECTO"
-            nivel = ["🎯 Fácil", "🎯 Medio", "🎯 Difícil"][row['dificultad'] - 1]
-            categoria = row['categoria'].capitalize()
-            
-            texto_detalle.insert('end', f"Pregunta {i+1} | {categoria} | {nivel}\n")
-            texto_detalle.insert('end', f"   Estado: {estado}\n")
-            texto_detalle.insert('end', f"   Tu respuesta: {row['opcion_elegida'].upper() if row['opcion_elegida'] else 'No respondida'}\n")
-            texto_detalle.insert('end', f"   Correcta: {row['correcta'].upper()}\n")
-            
-            # Resaltar preguntas incorrectas
-            if not row['correcta_bool']:
-                texto_detalle.insert('end', f"   ⚠️  Necesitas repasar este tema\n")
-            
-            texto_detalle.insert('end', "-" * 60 + "\n\n")
-        
-        texto_detalle.config(state='disabled')
-        
         # Botones finales
         btn_frame = tk.Frame(scrollable_frame, bg='white', pady=20)
         btn_frame.pack(fill='x')
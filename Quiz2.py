@@ -3,19 +3,18 @@ Quiz de Economía/Finanzas
 """
 import sys   # Proporciona funciones y variables para manipular el entorno de ejecución de Py
 import os    # Permite interactuar con el sistema operativo
-import sqlite3 # Proporciona una interfaz para trabajar con bases de datos SQLite
-import random  # Ofrece funciones para generar números aleatorios y realizar selecciones aleatorias
+import base64  # Codifica las imágenes PNG de las gráficas para Tk
+import getpass   # Nombre del usuario del sistema para registrar los intentos
 
 # Verificar e instalar dependencias automáticamente si es necesario
 try:
     import tkinter as tk
-    from tkinter import ttk, messagebox
-    import pandas as pd
-    import numpy as np
-    import matplotlib
-    matplotlib.use('TkAgg')
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    import matplotlib.pyplot as plt
+    from tkinter import messagebox
+    from importlib.util import find_spec
+    # pandas, numpy y matplotlib sólo se verifican aquí; se importan al usarlos
+    for _modulo in ("pandas", "numpy", "matplotlib"):
+        if find_spec(_modulo) is None:
+            raise ImportError(f"No module named '{_modulo}'")
 except ImportError as e:
     print(f"Error: {e}")
     print("Instalando dependencias necesarias...")
@@ -27,49 +26,27 @@ except ImportError as e:
         print(f"Error instalando dependencias: {install_error}")
     sys.exit(1)
 
+from diferido import ModuloDiferido
+from esquema import insertar_preguntas
+from banco import RUTA_INSTANTANEA, BancoPreguntas as BancoComun, DatabaseManager as GestorComun
+from motor_quiz import MAX_PREGUNTAS, SEGUNDOS_POR_PREGUNTA, QuizEngine
+from cronometro import CuentaRegresiva, formato_reloj
+from registro_intentos import EscritorIntentos
+from render_graficos import RenderizadorGraficos
+from tareas import EjecutorTareas
+from controles import NavegadorPreguntas, ListaTemasVirtual
+from pantallas import GestorPantallas
+from agregados import ResumenResultados
+
+pd = ModuloDiferido("pandas")
+
 print("Iniciando aplicación Quiz...")
 
 # =============== BASE DE DATOS INTEGRADA ===============
 
-class DatabaseManager:
+class DatabaseManager(GestorComun):
     """Gestor de base de datos SQLite integrada"""
     
-    def __init__(self):
-        self.db_path = "quiz_economia.db"
-        self.init_database()
-    
-    def init_database(self):
-        """Inicializa la base de datos con preguntas de 3 dificultades"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Crear tabla de preguntas
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS preguntas (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                categoria TEXT NOT NULL,
-                tema TEXT NOT NULL,
-                dificultad INTEGER NOT NULL CHECK (dificultad IN (1, 2, 3)),
-                pregunta TEXT NOT NULL,
-                opcion_a TEXT NOT NULL,
-                opcion_b TEXT NOT NULL,
-                opcion_c TEXT NOT NULL,
-                opcion_d TEXT NOT NULL,
-                correcta TEXT NOT NULL CHECK (correcta IN ('a', 'b', 'c', 'd'))
-            )
-        ''')
-        
-        # Verificar si ya hay datos
-        cursor.execute("SELECT COUNT(*) FROM preguntas")
-        count = cursor.fetchone()[0]
-        
-        if count == 0:
-            self._insertar_datos_ejemplo(cursor)
-        
-        conn.commit()
-        conn.close()
-        print(f"Base de datos inicializada con {count} preguntas existentes")
-    
     def _insertar_datos_ejemplo(self, cursor):
         """Inserta preguntas de ejemplo con 3 niveles de dificultad"""
         preguntas = [
@@ -251,184 +228,55 @@ class DatabaseManager:
              'Los mercados son siempre eficientes', 'a')
         ]
         
-        cursor.executemany('''
-            INSERT INTO preguntas (categoria, tema, dificultad, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', preguntas)
+        insertar_preguntas(cursor, preguntas)
         
         print(f"Insertadas {len(preguntas)} preguntas en la base de datos")
 
-    def obtener_preguntas(self, categorias, temas, dificultad=None):
-        """Obtiene preguntas filtradas de la base de datos"""
-        conn = sqlite3.connect(self.db_path)
-        
+    def obtener_estadisticas_categorias(self):
+        """Temas y preguntas por categoría, desde la tabla de conteos"""
+        conn = self.conexiones.conexion()
         query = '''
-            SELECT * FROM preguntas 
-            WHERE categoria IN ({}) AND tema IN ({})
-        '''.format(','.join('?' * len(categorias)), ','.join('?' * len(temas)))
-        
-        params = categorias + temas
-        
-        if dificultad:
-            query += ' AND dificultad = ?'
-            params.append(dificultad)
-        
-        query += ' ORDER BY RANDOM()'
-        
-        df = pd.read_sql_query(query, conn, params=params)
-        conn.close()
-        
-        return df
-
-    def obtener_temas_disponibles(self, categorias):
-        """Obtiene temas disponibles para las categorías dadas"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-            SELECT DISTINCT tema FROM preguntas 
-            WHERE categoria IN ({})
-            ORDER BY tema
-        '''.format(','.join('?' * len(categorias)))
-        
-        cursor = conn.cursor()
-        cursor.execute(query, categorias)
-        temas = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        
-        return temas
-
-    def obtener_estadisticas_dificultad(self):
-        """Obtiene estadísticas por dificultad"""
-        conn = sqlite3.connect(self.db_path)
-        query = '''
-            SELECT dificultad, COUNT(*) as cantidad 
-            FROM preguntas 
-            GROUP BY dificultad 
-            ORDER BY dificultad
+            SELECT categoria, COUNT(DISTINCT tema) as temas, SUM(cantidad) as cantidad
+            FROM estadisticas_banco
+            GROUP BY categoria
+            ORDER BY categoria
         '''
         df = pd.read_sql_query(query, conn)
-        conn.close()
         return df
 
 # =============== MÓDULOS DEL QUIZ ===============
 
-class BancoPreguntas:
+class BancoPreguntas(BancoComun):
     """Gestión de preguntas desde base de datos"""
     
-    def __init__(self):
-        self.db = DatabaseManager()
-    
-    def temas_disponibles(self, categorias):
-        return self.db.obtener_temas_disponibles(categorias)
-    
-    def filtrar(self, categorias, temas, dificultad=None):
-        return self.db.obtener_preguntas(categorias, temas, dificultad)
-    
-    def samplear(self, df, n=8):
-        if len(df) <= n:
-            return df.copy()
-        return df.sample(n=n, random_state=42).copy()
-    
-    def mostrar_estadisticas(self):
-        """Muestra estadísticas de la base de datos"""
-        return self.db.obtener_estadisticas_dificultad()
-
-class QuizEngine:
-    """Lógica del quiz integrada"""
-    
-    def __init__(self, df_preguntas):
-        self.df_preguntas = df_preguntas.reset_index(drop=True)
-        self.total = len(df_preguntas)
-        self.idx = 0
-        self.elegidas = [''] * self.total
-        self.tiempos = [0] * self.total
-        self.inicio_pregunta = None
-    
-    def pregunta_actual(self):
-        if self.idx < self.total:
-            return self.df_preguntas.iloc[self.idx]
-        return None
-    
-    def iniciar_pregunta(self):
-        self.inicio_pregunta = pd.Timestamp.now()
-    
-    def marcar_respuesta(self, letra):
-        self.elegidas[self.idx] = letra
-    
-    def ir_siguiente(self):
-        if self.idx < self.total - 1:
-            if self.inicio_pregunta is not None:
-                fin = pd.Timestamp.now()
-                self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-            self.idx += 1
-            return True
-        return False
-    
-    def ir_anterior(self):
-        if self.idx > 0:
-            if self.inicio_pregunta is not None:
-                fin = pd.Timestamp.now()
-                self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-            self.idx -= 1
-            return True
-        return False
+    gestor = DatabaseManager
     
-    def finalizar(self):
-        if self.inicio_pregunta is not None and self.tiempos[self.idx] == 0:
-            fin = pd.Timestamp.now()
-            self.tiempos[self.idx] = (fin - self.inicio_pregunta).total_seconds()
-        
-        correctas = 0
-        resultados = []
-        
-        for i in range(self.total):
-            pregunta = self.df_preguntas.iloc[i]
-            elegida = self.elegidas[i]
-            correcta = str(pregunta['correcta']).lower().strip()
-            es_correcta = (elegida != '' and elegida.lower() == correcta)
-            
-            if es_correcta:
-                correctas += 1
-            
-            resultados.append({
-                'id': pregunta['id'],
-                'categoria': pregunta['categoria'],
-                'tema': pregunta['tema'],
-                'dificultad': pregunta['dificultad'],
-                'pregunta': pregunta['pregunta'],
-                'opcion_elegida': elegida,
-                'correcta': correcta,
-                'correcta_bool': es_correcta,
-                'tiempo_seg': self.tiempos[i]
-            })
-        
-        df_resultados = pd.DataFrame(resultados)
-        return correctas, self.total, df_resultados
+    def estadisticas_categorias(self):
+        return self._consultar(('categorias',), self.db.obtener_estadisticas_categorias)
 
 # Funciones de gráficos (se mantienen igual)
-def grafico_barras_por_tema(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
+def grafico_barras_por_tema(fig, resumen):
+    ax = fig.subplots()
     try:
-        if 'tema' in df.columns and 'correcta_bool' in df.columns:
-            resultado_por_tema = df.groupby('tema')['correcta_bool'].mean() * 100
-            bars = ax.bar(resultado_por_tema.index, resultado_por_tema.values, color='skyblue')
+        if resumen.n:
+            por_tema = resumen.por_tema
+            bars = ax.bar(por_tema.etiquetas, por_tema.porcentajes, color='skyblue')
             ax.set_title('Aciertos por Tema')
             ax.set_ylabel('Porcentaje Correcto (%)')
-            plt.xticks(rotation=45, ha='right')
+            ax.tick_params(axis='x', labelrotation=45)
+            for etiqueta in ax.get_xticklabels():
+                etiqueta.set_horizontalalignment('right')
     except Exception:
         ax.text(0.5, 0.5, 'Datos insuficientes', ha='center', va='center', transform=ax.transAxes)
     fig.tight_layout()
     return fig
 
-def grafico_linea_evolucion(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
+def grafico_linea_evolucion(fig, resumen):
+    ax = fig.subplots()
     try:
-        if 'correcta_bool' in df.columns:
-            df_sorted = df.reset_index(drop=True)
-            acumulado_correcto = df_sorted['correcta_bool'].cumsum()
-            preguntas = range(1, len(df_sorted) + 1)
-            porcentaje_acumulado = (acumulado_correcto / preguntas) * 100
-            ax.plot(preguntas, porcentaje_acumulado, marker='o', linewidth=2)
+        if resumen.n:
+            preguntas = range(1, resumen.n + 1)
+            ax.plot(preguntas, resumen.acumulado, marker='o', linewidth=2)
             ax.set_title('Evolución del Desempeño')
             ax.set_xlabel('Número de Pregunta')
             ax.set_ylabel('Porcentaje Acumulado (%)')
@@ -438,14 +286,13 @@ def grafico_linea_evolucion(df):
     fig.tight_layout()
     return fig
 
-def grafico_dificultad(df):
+def grafico_dificultad(fig, resumen):
     """Nuevo gráfico para mostrar desempeño por dificultad"""
-    fig, ax = plt.subplots(figsize=(6, 4))
+    ax = fig.subplots()
     try:
-        if 'dificultad' in df.columns and 'correcta_bool' in df.columns:
-            resultado_por_dificultad = df.groupby('dificultad')['correcta_bool'].mean() * 100
+        if resumen.n:
             dificultades = ['Fácil', 'Medio', 'Difícil']
-            valores = [resultado_por_dificultad.get(i, 0) for i in range(1, 4)]
+            valores = [resumen.por_dificultad.porcentaje(i) for i in range(1, 4)]
             bars = ax.bar(dificultades, valores, color=['green', 'orange', 'red'])
             ax.set_title('Desempeño por Dificultad')
             ax.set_ylabel('Porcentaje Correcto (%)')
@@ -474,66 +321,118 @@ class QuizApp:
         self.sel_macro = tk.BooleanVar(value=True)
         self.sel_fin = tk.BooleanVar(value=True)
         self.dificultad = tk.StringVar(value="todas")
-        self.temas_vars = {}
-        
-        # Cargar datos desde base de datos
-        self.banco = BancoPreguntas()
+        self.n_preguntas = tk.StringVar(value="8")
+        # 'azar' (clave precalculada) o 'reservorio' (una pasada por el cursor)
+        self.metodo_muestreo = tk.StringVar(value='azar')
+        
+        # Cargar datos desde base de datos en segundo plano, para que la
+        # pantalla de inicio aparezca sin esperar a SQLite ni a pandas
+        self.banco = None
+        self.registro = None
+        self.renderizador = RenderizadorGraficos()
+        # Las consultas al banco corren fuera del hilo de Tk
+        self.tareas = EjecutorTareas(self.root)
+        
+        # Cada pantalla se construye una sola vez; navegar sólo las alterna
+        self.pantallas = GestorPantallas(self.root)
+        self.pantallas.registrar('inicio', self._construir_inicio)
+        self.pantallas.registrar('configuracion', self._construir_configuracion)
+        self.pantallas.registrar('quiz', self._construir_quiz)
+        self.pantallas.registrar('resultados', self._construir_resultados)
         
         self.mostrar_inicio()
+        self.tareas.lanzar('banco', self._cargar_banco, al_terminar=self._banco_cargado,
+                           al_fallar=self._error_banco)
+    
+    @staticmethod
+    def _cargar_banco():
+        """Hilo de fondo: inicializa la base de datos y lee las estadísticas"""
+        # Con una instantánea exportada (python instantanea.py) no hace falta cargar el índice
+        ruta = RUTA_INSTANTANEA if os.path.exists(RUTA_INSTANTANEA) else None
+        banco = BancoPreguntas(indice_memoria=True, instantanea=ruta)
+        return banco, banco.mostrar_estadisticas()
     
-    def limpiar_pantalla(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def _error_banco(self, error):
+        messagebox.showerror("Error", f"No se pudo cargar la base de datos:\n{error}")
+    
+    def _error_consulta(self, error):
+        messagebox.showerror("Error", f"No se pudo consultar la base de datos:\n{error}")
+    
+    def _banco_cargado(self, resultado):
+        """Hilo de Tk: guarda el banco ya cargado y completa la pantalla de inicio"""
+        banco, stats = resultado
+        self.banco = banco
+        self.registro = EscritorIntentos(banco.db.conexiones)
+        self._mostrar_estadisticas_inicio(stats)
     
     def mostrar_inicio(self):
-        self.limpiar_pantalla()
+        self.pantallas.mostrar('inicio')
         
+        if self.banco is not None:
+            self.tareas.lanzar('estadisticas', self.banco.mostrar_estadisticas,
+                               al_terminar=self._mostrar_estadisticas_inicio,
+                               al_fallar=self._error_consulta)
+    
+    def _construir_inicio(self, marco):
         # Título principal
-        titulo = tk.Label(self.root, text=" Quiz de Economía y Finanzas", 
+        titulo = tk.Label(marco, text=" Quiz de Economía y Finanzas", 
                          font=('Arial', 20, 'bold'), bg='white', fg='navy')
         titulo.pack(pady=30)
         
-        subtitulo = tk.Label(self.root, text="Base de Datos con 3 Niveles de Dificultad", 
+        subtitulo = tk.Label(marco, text="Base de Datos con 3 Niveles de Dificultad", 
                            font=('Arial', 12), bg='white', fg='gray')
         subtitulo.pack(pady=5)
         
-        # Estadísticas rápidas
-        stats = self.banco.mostrar_estadisticas()
-        stats_text = "Preguntas disponibles:\n"
-        for _, row in stats.iterrows():
-            nivel = ["Fácil", "Medio", "Difícil"][row['dificultad'] - 1]
-            stats_text += f"• {nivel}: {row['cantidad']} preguntas\n"
-        
-        lbl_stats = tk.Label(self.root, text=stats_text, 
-                           font=('Arial', 10), bg='white', justify='left')
-        lbl_stats.pack(pady=10)
+        # Estadísticas rápidas (se completan cuando termina la carga del banco)
+        self.lbl_stats = tk.Label(marco, text="Cargando preguntas...", 
+                                 font=('Arial', 10), bg='white', justify='left')
+        self.lbl_stats.pack(pady=10)
         
         # Botón para comenzar (más grande y visible)
-        btn_comenzar = tk.Button(self.root, text=" COMENZAR QUIZ", 
-                               font=('Arial', 16, 'bold'), bg='#4CAF50', fg='white',
-                               command=self.mostrar_configuracion,
-                               width=20, height=2, relief='raised', bd=3)
-        btn_comenzar.pack(pady=30)
+        self.btn_comenzar = tk.Button(marco, text=" COMENZAR QUIZ", 
+                                     font=('Arial', 16, 'bold'), bg='#4CAF50', fg='white',
+                                     command=self.mostrar_configuracion,
+                                     width=20, height=2, relief='raised', bd=3,
+                                     state='disabled')
+        self.btn_comenzar.pack(pady=30)
         
         # Información adicional
-        info_frame = tk.Frame(self.root, bg='white')
+        info_frame = tk.Frame(marco, bg='white')
         info_frame.pack(pady=20)
         
         info_text = """
 • Selecciona entre 3 categorías: Micro, Macro y Finanzas
 • Elige el nivel de dificultad: Fácil, Medio o Difícil  
-• 8 preguntas por quiz con timer de 10 minutos
+• 8 preguntas por quiz (hasta 2000), 75 segundos por pregunta
 • Resultados con gráficos detallados
         """
         lbl_info = tk.Label(info_frame, text=info_text, font=('Arial', 10), 
                           bg='white', justify='left')
         lbl_info.pack()
     
-    def mostrar_configuracion(self):
-        self.limpiar_pantalla()
+    def _mostrar_estadisticas_inicio(self, stats):
+        """Completa la pantalla de inicio con las estadísticas del banco"""
+        if not self.lbl_stats.winfo_exists():
+            return
         
+        stats_text = "Preguntas disponibles:\n"
+        for _, row in stats.iterrows():
+            nivel = ["Fácil", "Medio", "Difícil"][row['dificultad'] - 1]
+            stats_text += f"• {nivel}: {row['cantidad']} preguntas\n"
+        
+        self.lbl_stats.config(text=stats_text)
+        self.btn_comenzar.config(state='normal')
+    
+    def mostrar_configuracion(self):
+        self.pantallas.mostrar('configuracion')
+        # Un muestreo lanzado desde una configuración anterior ya no corresponde
+        self.tareas.cancelar('quiz')
+        self.btn_iniciar.config(state='normal', text=" COMENZAR QUIZ")
+        self.actualizar_temas()
+    
+    def _construir_configuracion(self, marco):
         # Frame principal con scroll para mejor visibilidad
-        main_container = tk.Frame(self.root, bg='white')
+        main_container = tk.Frame(marco, bg='white')
         main_container.pack(fill='both', expand=True, padx=10, pady=5)
         
         # Título
@@ -572,25 +471,9 @@ class QuizApp:
                                    padx=15, pady=15, relief='groove', bd=2)
         temas_frame.pack(side='left', fill='both', expand=True, padx=5)
         
-        # Canvas con scroll para temas
-        canvas_container = tk.Frame(temas_frame, bg='white')
-        canvas_container.pack(fill='both', expand=True)
-        
-        # Canvas y scrollbar
-        self.canvas = tk.Canvas(canvas_container, bg='white', height=200)
-        scrollbar = tk.Scrollbar(canvas_container, orient='vertical', command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg='white')
-        
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-        
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
-        
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Lista de temas virtual: sólo crea casillas para las filas visibles
+        self.lista_temas = ListaTemasVirtual(temas_frame, fuente=('Arial', 10), height=200)
+        self.lista_temas.pack(fill='both', expand=True)
         
         # ========== COLUMNA DERECHA - DIFICULTAD ==========
         dificultad_frame = tk.LabelFrame(opciones_frame, text=" NIVEL DE DIFICULTAD",
@@ -613,6 +496,20 @@ class QuizApp:
                                width=20, anchor='w')
             btn.pack(fill='x', pady=8, padx=10)
         
+        # Número de preguntas (exámenes de práctica de hasta MAX_PREGUNTAS)
+        tk.Label(dificultad_frame, text="Número de preguntas:", font=('Arial', 11, 'bold'),
+                bg='white').pack(anchor='w', padx=10, pady=(10, 2))
+        tk.Spinbox(dificultad_frame, from_=1, to=MAX_PREGUNTAS, textvariable=self.n_preguntas,
+                   font=('Arial', 11), width=8).pack(anchor='w', padx=10)
+        
+        # Cómo se eligen las preguntas (ver BancoPreguntas.muestrear)
+        tk.Label(dificultad_frame, text="Selección de preguntas:", font=('Arial', 11, 'bold'),
+                bg='white').pack(anchor='w', padx=10, pady=(10, 2))
+        tk.Radiobutton(dificultad_frame, text="Rápida (clave aleatoria)", variable=self.metodo_muestreo,
+                      value='azar', font=('Arial', 11), bg='white').pack(anchor='w', padx=10)
+        tk.Radiobutton(dificultad_frame, text="Uniforme (recorre la selección)", variable=self.metodo_muestreo,
+                      value='reservorio', font=('Arial', 11), bg='white').pack(anchor='w', padx=10)
+        
         # ========== BOTONES DE CONTROL ==========
         control_frame = tk.Frame(main_container, bg='white', pady=20)
         control_frame.pack(fill='x')
@@ -625,11 +522,11 @@ class QuizApp:
         btn_volver.pack(side='left', padx=20)
         
         # Botón Comenzar (muy visible)
-        btn_comenzar = tk.Button(control_frame, text=" COMENZAR QUIZ", 
-                               font=('Arial', 14, 'bold'), bg='#2196F3', fg='white',
-                               command=self.iniciar_quiz,
-                               width=20, height=2, relief='raised', bd=3)
-        btn_comenzar.pack(side='right', padx=20)
+        self.btn_iniciar = tk.Button(control_frame, text=" COMENZAR QUIZ", 
+                                     font=('Arial', 14, 'bold'), bg='#2196F3', fg='white',
+                                     command=self.iniciar_quiz,
+                                     width=20, height=2, relief='raised', bd=3)
+        self.btn_iniciar.pack(side='right', padx=20)
         
         # Botón Estadísticas
         btn_stats = tk.Button(control_frame, text=" VER ESTADÍSTICAS", 
@@ -637,8 +534,6 @@ class QuizApp:
                             command=self.mostrar_estadisticas_completas,
                             width=15, height=1, relief='raised', bd=2)
         btn_stats.pack(side='left', padx=10)
-        
-        self.actualizar_temas()
     
     def mostrar_estadisticas_completas(self):
         """Muestra ventana con estadísticas completas de la base de datos"""
@@ -661,15 +556,12 @@ class QuizApp:
                           bg='white', fg=color)
             lbl.pack(pady=5)
         
-        # Estadísticas por categoría
-        categorias = ['micro', 'macro', 'finanzas']
+        # Estadísticas por categoría (una sola consulta para todas)
         tk.Label(stats_window, text="\nPor categoría:", 
                 font=('Arial', 12, 'bold'), bg='white').pack(pady=10)
         
-        for cat in categorias:
-            temas = self.banco.temas_disponibles([cat])
-            total_preguntas = sum(1 for _ in temas)  # Simplificado para demo
-            texto = f"• {cat.title()}: {len(temas)} temas"
+        for _, row in self.banco.estadisticas_categorias().iterrows():
+            texto = f"• {row['categoria'].title()}: {row['temas']} temas, {row['cantidad']} preguntas"
             lbl = tk.Label(stats_window, text=texto, font=('Arial', 10), 
                           bg='white')
             lbl.pack(pady=2)
@@ -678,65 +570,30 @@ class QuizApp:
                  command=stats_window.destroy).pack(pady=20)
     
     def actualizar_temas(self):
-        """Actualiza la lista de temas con mejor visualización"""
-        # Limpiar frame de temas
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-        
+        """Pide en segundo plano los temas de las categorías marcadas"""
         categorias = []
         if self.sel_micro.get(): categorias.append('micro')
         if self.sel_macro.get(): categorias.append('macro')
         if self.sel_fin.get(): categorias.append('finanzas')
         
         if not categorias:
-            label = tk.Label(self.scrollable_frame, 
-                            text=" Selecciona al menos una categoría\npara ver los temas disponibles", 
-                            font=('Arial', 10, 'bold'), bg='white', fg='gray',
-                            justify='center')
-            label.pack(pady=20)
+            # Una consulta anterior que llegue tarde no debe pisar este aviso
+            self.tareas.cancelar('temas')
+            self.lista_temas.aviso(" Selecciona al menos una categoría\npara ver los temas disponibles")
             return
         
-        temas = self.banco.temas_disponibles(categorias)
-        self.temas_vars = {}
-        
+        # Cada clic reemplaza la consulta anterior; sólo se dibuja la última
+        self.lista_temas.aviso("⏳ Cargando temas...")
+        self.tareas.lanzar('temas', self.banco.temas_disponibles, categorias,
+                           al_terminar=self._mostrar_temas, al_fallar=self._error_consulta)
+    
+    def _mostrar_temas(self, temas):
+        if not self.lista_temas.winfo_exists():
+            return
         if not temas:
-            label = tk.Label(self.scrollable_frame, 
-                            text="No hay temas disponibles\npara las categorías seleccionadas", 
-                            font=('Arial', 10), bg='white', fg='red')
-            label.pack(pady=10)
+            self.lista_temas.aviso("No hay temas disponibles\npara las categorías seleccionadas")
             return
-        
-        # Título con cantidad de temas
-        titulo_temas = tk.Label(self.scrollable_frame, 
-                               text=f"📚 {len(temas)} temas encontrados:", 
-                               font=('Arial', 11, 'bold'), bg='white')
-        titulo_temas.pack(pady=5)
-        
-        # Crear checkboxes para cada tema con mejor formato
-        for tema in temas:
-            frame_tema = tk.Frame(self.scrollable_frame, bg='white')
-            frame_tema.pack(fill='x', pady=3, padx=10)
-            
-            var = tk.BooleanVar(value=True)
-            self.temas_vars[tema] = var
-            
-            chk = tk.Checkbutton(frame_tema, text=tema, variable=var,
-                               font=('Arial', 10), bg='white',
-                               selectcolor='lightblue', width=25, anchor='w')
-            chk.pack(side='left')
-            
-            # Indicador de categoría
-            cat_color = {'micro': '🟢', 'macro': '🔵', 'finanzas': '🟣'}
-            for cat in categorias:
-                if cat in tema.lower() or any(cat in t for t in [tema]):
-                    lbl_cat = tk.Label(frame_tema, text=cat_color.get(cat, '⚫'), 
-                                     font=('Arial', 8), bg='white')
-                    lbl_cat.pack(side='right')
-                    break
-        
-        # Actualizar canvas
-        self.canvas.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self.lista_temas.cargar(temas)
     
     def iniciar_quiz(self):
         categorias = []
@@ -749,7 +606,11 @@ class QuizApp:
                                  "❌ Debes seleccionar al menos una categoría")
             return
         
-        temas_sel = [tema for tema, var in self.temas_vars.items() if var.get()]
+        if self.tareas.ocupada('temas'):
+            messagebox.showinfo("Un momento", "⏳ Todavía se están cargando los temas")
+            return
+        
+        temas_sel = self.lista_temas.seleccionados()
         if not temas_sel:
             messagebox.showwarning("Configuración Incompleta", 
                                  "❌ Debes seleccionar al menos un tema")
@@ -758,15 +619,39 @@ class QuizApp:
         # Procesar dificultad seleccionada
         dificultad_seleccionada = None if self.dificultad.get() == "todas" else int(self.dificultad.get())
         
-        df_filtrado = self.banco.filtrar(categorias, temas_sel, dificultad_seleccionada)
-        if len(df_filtrado) == 0:
+        try:
+            n_preguntas = int(self.n_preguntas.get())
+        except ValueError:
+            n_preguntas = 0
+        if not 1 <= n_preguntas <= MAX_PREGUNTAS:
+            messagebox.showwarning("Error", f"El número de preguntas debe estar entre 1 y {MAX_PREGUNTAS}")
+            return
+        
+        # El muestreo corre en segundo plano; el botón queda deshabilitado mientras tanto
+        self.btn_iniciar.config(state='disabled', text="⏳ PREPARANDO...")
+        self.tareas.lanzar('quiz', self.banco.muestrear, categorias, temas_sel,
+                           dificultad_seleccionada, n_preguntas, self.metodo_muestreo.get(),
+                           al_terminar=self._quiz_listo, al_fallar=self._error_quiz)
+    
+    def _error_quiz(self, error):
+        if self.pantallas.actual == 'configuracion':
+            self.btn_iniciar.config(state='normal', text=" COMENZAR QUIZ")
+        self._error_consulta(error)
+    
+    def _quiz_listo(self, df_quiz):
+        """Hilo de Tk: arranca el quiz con las preguntas muestreadas"""
+        if self.pantallas.actual != 'configuracion':
+            # El usuario salió de la configuración mientras se muestreaba
+            return
+        self.btn_iniciar.config(state='normal', text=" COMENZAR QUIZ")
+        
+        if len(df_quiz) == 0:
             messagebox.showwarning("Sin Preguntas", 
                                  "📭 No hay preguntas que coincidan con los filtros seleccionados.\n\n"
                                  "💡 Intenta con:\n• Menos filtros\n• Otra dificultad\n• Más categorías")
             return
         
-        n_preguntas = min(8, len(df_filtrado))
-        df_quiz = self.banco.samplear(df_filtrado, n=n_preguntas)
+        n_preguntas = len(df_quiz)
         
         # Mostrar info sobre las preguntas seleccionadas
         niveles = df_quiz['dificultad'].value_counts().sort_index()
@@ -779,7 +664,7 @@ class QuizApp:
         info_dificultad += f"\n📊 Total: {n_preguntas} preguntas"
         
         self.quiz = QuizEngine(df_quiz)
-        self.tiempo_restante = 600
+        self.cuenta = None
         self.timer_id = None
         
         messagebox.showinfo("✅ Configuración Lista", info_dificultad)
@@ -787,10 +672,17 @@ class QuizApp:
 
     # Los métodos restantes (mostrar_quiz, cargar_pregunta_actual, etc.) se mantienen igual
     def mostrar_quiz(self):
-        self.limpiar_pantalla()
+        self.pantallas.mostrar('quiz')
+        self.navegador.configurar(self.quiz.total, self.quiz.respondidas_en)
         
+        self.cargar_pregunta_actual()
+        # El tiempo disponible crece con el largo del quiz (10 minutos para 8 preguntas)
+        self.cuenta = CuentaRegresiva(SEGUNDOS_POR_PREGUNTA * self.quiz.total)
+        self.iniciar_timer()
+    
+    def _construir_quiz(self, marco):
         # Header con información de dificultad
-        header_frame = tk.Frame(self.root, bg='lightgray', height=50)
+        header_frame = tk.Frame(marco, bg='lightgray', height=50)
         header_frame.pack(fill='x', padx=10, pady=5)
         header_frame.pack_propagate(False)
         
@@ -806,8 +698,12 @@ class QuizApp:
                                  font=('Arial', 12, 'bold'), bg='lightgray', fg='red')
         self.lbl_timer.pack(side='right', padx=10)
         
+        # Navegador por páginas: salta directamente a cualquier pregunta
+        self.navegador = NavegadorPreguntas(marco, al_elegir=self.ir_a_pregunta)
+        self.navegador.pack(fill='x', padx=10)
+        
         # Pregunta
-        pregunta_frame = tk.Frame(self.root, bg='white', padx=20, pady=20)
+        pregunta_frame = tk.Frame(marco, bg='white', padx=20, pady=20)
         pregunta_frame.pack(fill='x', padx=10, pady=10)
         
         self.lbl_pregunta = tk.Label(pregunta_frame, text="", wraplength=700,
@@ -815,7 +711,7 @@ class QuizApp:
         self.lbl_pregunta.pack(anchor='w')
         
         # Opciones
-        opciones_frame = tk.Frame(self.root, bg='white', padx=20, pady=10)
+        opciones_frame = tk.Frame(marco, bg='white', padx=20, pady=10)
         opciones_frame.pack(fill='both', expand=True, padx=10, pady=10)
         
         self.botones_opciones = []
@@ -827,11 +723,11 @@ class QuizApp:
             self.botones_opciones.append(btn)
         
         # Feedback
-        self.lbl_feedback = tk.Label(self.root, text="", font=('Arial', 11), bg='white')
+        self.lbl_feedback = tk.Label(marco, text="", font=('Arial', 11), bg='white')
         self.lbl_feedback.pack(pady=10)
         
         # Navegación
-        nav_frame = tk.Frame(self.root, bg='white', pady=20)
+        nav_frame = tk.Frame(marco, bg='white', pady=20)
         nav_frame.pack(fill='x', padx=20, pady=10)
         
         tk.Button(nav_frame, text="← Anterior", font=('Arial', 10),
@@ -842,9 +738,6 @@ class QuizApp:
         
         tk.Button(nav_frame, text="Finalizar Quiz", font=('Arial', 10, 'bold'), bg='red', fg='white',
                  command=self.finalizar_quiz).pack(side='right')
-        
-        self.cargar_pregunta_actual()
-        self.iniciar_timer()
     
     def cargar_pregunta_actual(self):
         pregunta = self.quiz.pregunta_actual()
@@ -855,6 +748,7 @@ class QuizApp:
         self.quiz.iniciar_pregunta()
         
         self.lbl_info.config(text=f"Pregunta {self.quiz.idx + 1}/{self.quiz.total}")
+        self.navegador.actualizar(self.quiz.idx)
         
         # Mostrar nivel de dificultad con color
         nivel = pregunta['dificultad']
@@ -896,6 +790,11 @@ class QuizApp:
                 btn.config(bg='white')
         
         self.lbl_feedback.config(text=f"Seleccionado: {letra.upper()}", fg='blue')
+        self.navegador.marcar(self.quiz.idx)
+    
+    def ir_a_pregunta(self, i):
+        if self.quiz.ir_a(i):
+            self.cargar_pregunta_actual()
     
     def anterior_pregunta(self):
         if self.quiz.ir_anterior():
@@ -911,74 +810,118 @@ class QuizApp:
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
         
-        if self.tiempo_restante <= 0:
+        # Se mide contra un plazo fijo: un tick que llega tarde no se acumula
+        if self.cuenta.vencida():
             messagebox.showinfo("Tiempo agotado", "Se acabó el tiempo del quiz.")
             self.finalizar_quiz()
             return
         
-        minutos = self.tiempo_restante // 60
-        segundos = self.tiempo_restante % 60
-        self.lbl_timer.config(text=f"{minutos:02d}:{segundos:02d}")
+        restante = self.cuenta.segundos_mostrados()
+        self.lbl_timer.config(text=formato_reloj(restante))
         
-        self.tiempo_restante -= 1
-        self.timer_id = self.root.after(1000, self.iniciar_timer)
+        self.timer_id = self.root.after(self.cuenta.ms_hasta_tick(), self.iniciar_timer)
     
     def finalizar_quiz(self):
         if self.timer_id:
             self.root.after_cancel(self.timer_id)
         
-        puntaje, total, df_detalle = self.quiz.finalizar()
-        self.mostrar_resultados(puntaje, total, df_detalle)
-    
-    def mostrar_resultados(self, puntaje, total, df_detalle):
-        self.limpiar_pantalla()
+        puntaje, total, aciertos = self.quiz.finalizar_compacto()
+        resumen = ResumenResultados.desde_motor(self.quiz, aciertos)
         
-        titulo = tk.Label(self.root, text="Resultados del Quiz", 
-                         font=('Arial', 18, 'bold'), bg='white')
-        titulo.pack(pady=20)
+        # Guardar el intento en segundo plano (no bloquea la interfaz)
+        self.registro.registrar(getpass.getuser(), puntaje, total,
+                                self.quiz.filas_respuestas(aciertos),
+                                duracion_seg=self.cuenta.transcurrido())
+        self.mostrar_resultados(puntaje, total, resumen)
+    
+    def _crear_marcador(self, parent, tamano=(6, 4), **pack):
+        """Label del tamaño de la gráfica donde se colocará su imagen"""
+        vacia = tk.PhotoImage(width=int(tamano[0] * 100), height=int(tamano[1] * 100))
+        marcador = tk.Label(parent, image=vacia, compound='center',
+                            font=('Arial', 11), bg='#F5F5F5', fg='gray')
+        marcador.vacia = vacia
+        marcador.tamano = tamano
+        marcador.futuro = None
+        marcador.pack(**pack)
+        return marcador
+    
+    def _mostrar_grafico(self, marcador, nombre, funcion, resumen):
+        """Vuelve el marcador a su estado vacío y lo reemplaza al llegar la imagen"""
+        marcador.config(image=marcador.vacia, text="Generando gráfica...")
+        marcador.image = marcador.vacia
+        futuro = self.renderizador.solicitar(nombre, funcion, resumen, resumen.clave(), marcador.tamano)
+        marcador.futuro = futuro
+        self._colocar_imagen(marcador, futuro)
+    
+    def _colocar_imagen(self, marcador, futuro):
+        # El marcador puede haberse destruido o estar esperando ya otra gráfica
+        if not marcador.winfo_exists() or marcador.futuro is not futuro:
+            return
+        if not futuro.done():
+            self.root.after(30, self._colocar_imagen, marcador, futuro)
+            return
+        try:
+            imagen = tk.PhotoImage(data=base64.b64encode(futuro.result()), format='png')
+        except Exception as e:
+            marcador.config(text=f"No se pudo generar la gráfica: {e}")
+            return
+        marcador.config(image=imagen, text='')
+        marcador.image = imagen
+    
+    def mostrar_resultados(self, puntaje, total, resumen):
+        self.pantallas.mostrar('resultados')
         
         porcentaje = (puntaje / total) * 100 if total > 0 else 0
         color = 'green' if porcentaje >= 70 else 'orange' if porcentaje >= 50 else 'red'
         
         puntaje_text = f"Puntaje: {puntaje}/{total} ({porcentaje:.1f}%)"
-        lbl_puntaje = tk.Label(self.root, text=puntaje_text, 
-                              font=('Arial', 16, 'bold'), bg='white', fg=color)
-        lbl_puntaje.pack(pady=10)
+        self.lbl_puntaje.config(text=puntaje_text, fg=color)
+        
+        # Se dibujan en segundo plano; mientras tanto se ven marcadores
+        self._mostrar_grafico(self.marcadores['barras_tema'], 'barras_tema',
+                              grafico_barras_por_tema, resumen)
+        self._mostrar_grafico(self.marcadores['dificultad'], 'dificultad', grafico_dificultad, resumen)
+        
+        texto_detalle = self.texto_detalle
+        texto_detalle.config(state='normal')
+        texto_detalle.delete('1.0', 'end')
+        texto_detalle.insert('end', "Detalle de respuestas:\n\n")
+        for i, (_, dificultad, elegida, correcta, acierto) in enumerate(resumen.detalle):
+            estado = "✓ CORRECTO" if acierto else "✗ INCORRECTO"
+            nivel = ["Fácil", "Medio", "Difícil"][dificultad - 1]
+            texto_detalle.insert('end', f"Pregunta {i+1} ({nivel}): {estado}\n")
+            texto_detalle.insert('end', f"  Tu respuesta: {elegida.upper() if elegida else 'No respondida'}\n")
+            texto_detalle.insert('end', f"  Correcta: {correcta.upper()}\n")
+            texto_detalle.insert('end', "-" * 50 + "\n")
+        
+        texto_detalle.config(state='disabled')
+    
+    def _construir_resultados(self, marco):
+        titulo = tk.Label(marco, text="Resultados del Quiz", 
+                         font=('Arial', 18, 'bold'), bg='white')
+        titulo.pack(pady=20)
+        
+        self.lbl_puntaje = tk.Label(marco, font=('Arial', 16, 'bold'), bg='white')
+        self.lbl_puntaje.pack(pady=10)
         
         # Gráficos
-        charts_frame = tk.Frame(self.root, bg='white')
+        charts_frame = tk.Frame(marco, bg='white')
         charts_frame.pack(fill='both', expand=True, padx=20, pady=20)
         
-        fig1 = grafico_barras_por_tema(df_detalle)
-        canvas1 = FigureCanvasTkAgg(fig1, charts_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(side='left', fill='both', expand=True, padx=5)
-        
-        fig2 = grafico_dificultad(df_detalle)
-        canvas2 = FigureCanvasTkAgg(fig2, charts_frame)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(side='left', fill='both', expand=True, padx=5)
+        self.marcadores = {}
+        for nombre in ('barras_tema', 'dificultad'):
+            self.marcadores[nombre] = self._crear_marcador(
+                charts_frame, side='left', fill='both', expand=True, padx=5)
         
         # Detalle con información de dificultad
-        detalle_frame = tk.Frame(self.root, bg='white')
+        detalle_frame = tk.Frame(marco, bg='white')
         detalle_frame.pack(fill='both', expand=True, padx=20, pady=10)
         
-        texto_detalle = tk.Text(detalle_frame, font=('Arial', 9), width=80, height=10)
-        texto_detalle.pack(fill='both', expand=True)
-        
-        texto_detalle.insert('end', "Detalle de respuestas:\n\n")
-        for i, row in df_detalle.iterrows():
-            estado = "✓ CORRECTO" if row['correcta_bool'] else "✗ INCORRECTO"
-            nivel = ["Fácil", "Medio", "Difícil"][row['dificultad'] - 1]
-            texto_detalle.insert('end', f"Pregunta {i+1} ({nivel}): {estado}\n")
-            texto_detalle.insert('end', f"  Tu respuesta: {row['opcion_elegida'].upper() if row['opcion_elegida'] else 'No respondida'}\n")
-            texto_detalle.insert('end', f"  Correcta: {row['correcta'].upper()}\n")
-            texto_detalle.insert('end', "-" * 50 + "\n")
-        
-        texto_detalle.config(state='disabled')
+        self.texto_detalle = tk.Text(detalle_frame, font=('Arial', 9), width=80, height=10)
+        self.texto_detalle.pack(fill='both', expand=True)
         
         # Botones finales
-        btn_frame = tk.Frame(self.root, bg='white', pady=20)
+        btn_frame = tk.Frame(marco, bg='white', pady=20)
         btn_frame.pack(fill='x')
         
         tk.Button(btn_frame, text="Nuevo Quiz", font=('Arial', 12, 'bold'), bg='green', fg='white',
@@ -0,0 +1,83 @@
+"""
+Agregados de resultados de un quiz, calculados una sola vez para todas las gráficas
+"""
+import hashlib
+
+from diferido import ModuloDiferido
+
+np = ModuloDiferido("numpy")
+
+
+class Grupo:
+    """Totales y aciertos por cada valor de una columna (tema, categoría o dificultad)"""
+    __slots__ = ('etiquetas', 'totales', 'aciertos', '_pos')
+
+    def __init__(self, valores, aciertos):
+        etiquetas, inversa = np.unique(np.asarray(valores), return_inverse=True)
+        self.etiquetas = etiquetas.tolist()
+        self.totales = np.bincount(inversa, minlength=len(self.etiquetas))
+        self.aciertos = np.bincount(inversa, weights=aciertos,
+                                    minlength=len(self.etiquetas)).astype(np.int64)
+        self._pos = {etiqueta: i for i, etiqueta in enumerate(self.etiquetas)}
+
+    @property
+    def porcentajes(self):
+        return self.aciertos * 100.0 / np.maximum(self.totales, 1)
+
+    def porcentaje(self, etiqueta, defecto=0.0):
+        i = self._pos.get(etiqueta)
+        return defecto if i is None else float(self.aciertos[i] * 100.0 / self.totales[i])
+
+    def total(self, etiqueta):
+        i = self._pos.get(etiqueta)
+        return 0 if i is None else int(self.totales[i])
+
+
+class ResumenResultados:
+    """Todo lo que muestran las gráficas y el detalle de resultados.
+
+    Se calcula una vez al terminar el quiz: aciertos por tema, categoría y
+    dificultad, el porcentaje acumulado pregunta a pregunta y las filas del
+    detalle. Sirve igual para un quiz que para las respuestas de un curso
+    completo concatenadas.
+    """
+    __slots__ = ('n', 'correctas', 'aciertos', 'acumulado', 'por_tema', 'por_categoria',
+                 'por_dificultad', 'detalle', '_clave')
+
+    def __init__(self, categorias, temas, dificultades, aciertos, elegidas=None, correctas=None):
+        aciertos = np.asarray(aciertos, dtype=bool)
+        self.n = len(aciertos)
+        self.aciertos = aciertos
+        self.correctas = int(np.count_nonzero(aciertos))
+        self.acumulado = np.cumsum(aciertos) * 100.0 / np.arange(1, self.n + 1)
+        self.por_tema = Grupo(temas, aciertos)
+        self.por_categoria = Grupo(categorias, aciertos)
+        self.por_dificultad = Grupo(dificultades, aciertos)
+
+        vacias = [''] * self.n
+        self.detalle = list(zip(categorias, dificultades, elegidas or vacias,
+                                correctas or vacias, aciertos.tolist()))
+
+        huella = hashlib.blake2b(digest_size=16)
+        huella.update(repr((list(categorias), list(temas), list(dificultades))).encode('utf-8'))
+        huella.update(aciertos.tobytes())
+        self._clave = huella.hexdigest()
+
+    @classmethod
+    def desde_motor(cls, motor, aciertos):
+        """Resumen de un QuizEngine ya calificado (aciertos de finalizar_compacto)"""
+        preguntas = motor.preguntas
+        return cls([p.categoria for p in preguntas], [p.tema for p in preguntas],
+                   [p.dificultad for p in preguntas], aciertos,
+                   list(motor.elegidas), [p.correcta for p in preguntas])
+
+    @classmethod
+    def desde_detalle(cls, df):
+        """Resumen del DataFrame que devuelve QuizEngine.finalizar()"""
+        return cls(df['categoria'].tolist(), df['tema'].tolist(), df['dificultad'].tolist(),
+                   df['correcta_bool'].to_numpy(), df['opcion_elegida'].tolist(),
+                   df['correcta'].tolist())
+
+    def clave(self):
+        """Huella de los datos agregados (para la caché de gráficas)"""
+        return self._clave
@@ -0,0 +1,213 @@
+"""
+Banco de preguntas compartido por Quiz1 y Quiz2: acceso a SQLite
+(DatabaseManager) y elección de preguntas con caché, índice en memoria,
+instantánea o muestreo estratificado (BancoPreguntas)
+"""
+import random
+
+from diferido import ModuloDiferido
+from conexiones import obtener_gestor
+from esquema import crear_esquema
+from muestreo import METODOS, muestrear_filas, muestrear_ids
+from listas_sql import EN_LISTA, filtro_preguntas, lista_json, seleccion_por_ids
+from indice_memoria import IndiceColumnar
+from instantanea import Instantanea
+from muestreo_estratificado import MuestreadorEstratificado
+from cache_consultas import CacheLRU, VersionBanco, clave_filtro
+from motor_quiz import CAMPOS_PREGUNTA
+
+pd = ModuloDiferido("pandas")
+
+RUTA_INSTANTANEA = "quiz_economia.snap"
+
+
+class DatabaseManager:
+    """Gestor de la base de datos SQLite del quiz, compartido por Quiz1 y Quiz2"""
+    
+    def __init__(self, db_path="quiz_economia.db"):
+        self.db_path = db_path
+        self.conexiones = obtener_gestor(self.db_path)
+        self.init_database()
+    
+    def init_database(self):
+        """Inicializa la base de datos con preguntas de 3 dificultades"""
+        conn = self.conexiones.conexion()
+        cursor = conn.cursor()
+        
+        # Crear tabla de preguntas e índices
+        crear_esquema(cursor)
+        
+        # Verificar si ya hay datos
+        cursor.execute("SELECT COUNT(*) FROM preguntas")
+        count = cursor.fetchone()[0]
+        
+        if count == 0:
+            self._insertar_datos_ejemplo(cursor)
+        
+        conn.commit()
+        print(f"Base de datos inicializada con {count} preguntas existentes")
+    
+    def _insertar_datos_ejemplo(self, cursor):
+        """Carga las preguntas de ejemplo en una base vacía; cada app define las suyas"""
+
+    def obtener_preguntas(self, categorias, temas, dificultad=None):
+        """Obtiene preguntas filtradas de la base de datos"""
+        conn = self.conexiones.conexion()
+        
+        where, params = filtro_preguntas(categorias, temas, dificultad)
+        query = f'SELECT * FROM preguntas WHERE {where} ORDER BY RANDOM()'
+        
+        df = pd.read_sql_query(query, conn, params=params)
+        
+        return df
+
+    def obtener_muestra(self, categorias, temas, dificultad=None, n=8):
+        """Obtiene n preguntas aleatorias muestreadas directamente en SQL"""
+        conn = self.conexiones.conexion()
+        ids = muestrear_ids(conn, categorias, temas, dificultad, n)
+        return self.obtener_por_ids(ids)
+
+    def obtener_muestras_reservorio(self, categorias, temas, dificultad=None, n=8, rngs=(random,)):
+        """Una muestra de n preguntas por rng, en una sola pasada por las filas del filtro.
+
+        Devuelve un solo DataFrame; la columna muestra indica de qué rng es cada fila.
+        """
+        conn = self.conexiones.conexion()
+        columnas = [fila[1] for fila in conn.execute("PRAGMA table_info(preguntas)")]
+        muestras = muestrear_filas(conn, columnas, categorias, temas, dificultad, n, rngs)
+        filas = [(i,) + fila for i, muestra in enumerate(muestras) for fila in muestra]
+        return pd.DataFrame(filas, columns=['muestra'] + columnas)
+
+    def obtener_por_ids(self, ids):
+        """Obtiene las preguntas indicadas, en el mismo orden que los ids"""
+        conn = self.conexiones.conexion()
+        
+        return pd.read_sql_query(seleccion_por_ids(), conn, params=[lista_json(ids)])
+
+    def obtener_temas_disponibles(self, categorias):
+        """Obtiene temas disponibles para las categorías dadas"""
+        conn = self.conexiones.conexion()
+        
+        # La tabla de conteos tiene una fila por categoria/tema/dificultad
+        query = '''
+            SELECT DISTINCT tema FROM estadisticas_banco 
+            WHERE categoria {}
+            ORDER BY tema
+        '''.format(EN_LISTA)
+        
+        cursor = conn.cursor()
+        cursor.execute(query, [lista_json(categorias)])
+        temas = [row[0] for row in cursor.fetchall()]
+        
+        return temas
+
+    def obtener_estadisticas_dificultad(self):
+        """Obtiene estadísticas por dificultad (de la tabla que mantienen los triggers)"""
+        conn = self.conexiones.conexion()
+        query = '''
+            SELECT dificultad, SUM(cantidad) as cantidad 
+            FROM estadisticas_banco 
+            GROUP BY dificultad 
+            ORDER BY dificultad
+        '''
+        df = pd.read_sql_query(query, conn)
+        return df
+
+
+class BancoPreguntas:
+    """Gestión de preguntas desde base de datos
+
+    Las apps definen una subclase con su gestor (el atributo gestor) para
+    cargar sus preguntas de ejemplo y agregar consultas propias.
+    """
+
+    gestor = DatabaseManager
+    
+    def __init__(self, indice_memoria=False, cache=True, instantanea=None):
+        self.db = self.gestor()
+        self.version = VersionBanco(self.db.conexiones)
+        # Instantánea mapeada opcional (ver instantanea.py): filtros y muestreo
+        # sin leer el banco al iniciar; se deja de usar si el banco cambia
+        self.instantanea = Instantanea(instantanea) if instantanea else None
+        # Índice columnar opcional: filtros y conteos sin ir a SQLite
+        usar_indice = indice_memoria and self._instantanea() is None
+        self.indice = IndiceColumnar(self.db.conexiones) if usar_indice else None
+        # Resultados de consultas repetidas, válidos mientras el banco no cambie
+        self.cache = CacheLRU(self.version) if cache else None
+        self._estratificado = None
+    
+    def _consultar(self, clave, calcular):
+        if self.cache is None:
+            return calcular()
+        return self.cache.obtener(clave, calcular)
+    
+    def _instantanea(self):
+        """La instantánea, si corresponde a la versión actual del banco"""
+        if self.instantanea is not None and self.instantanea.version_banco == self.version.actual():
+            return self.instantanea
+        return None
+    
+    def temas_disponibles(self, categorias):
+        instantanea = self._instantanea()
+        if instantanea is not None:
+            return instantanea.temas_disponibles(categorias)
+        return self._consultar(clave_filtro('temas', categorias),
+                               lambda: self.db.obtener_temas_disponibles(list(categorias)))
+    
+    def filtrar(self, categorias, temas, dificultad=None):
+        """Preguntas de la selección; con caché, el orden aleatorio es el de la primera consulta"""
+        instantanea = self._instantanea()
+        if instantanea is not None:
+            filas = instantanea.filtrar_filas(categorias, temas, dificultad)
+            random.shuffle(filas)
+            return pd.DataFrame(filas, columns=list(CAMPOS_PREGUNTA))
+        return self._consultar(clave_filtro('filtrar', categorias, temas, dificultad),
+                               lambda: self.db.obtener_preguntas(list(categorias), list(temas), dificultad))
+    
+    def muestrear(self, categorias, temas, dificultad=None, n=8, metodo='azar'):
+        """Devuelve n preguntas aleatorias sin cargar toda la selección.
+
+        metodo='azar' usa la clave aleatoria precalculada (o el índice en
+        memoria); 'reservorio' recorre una vez las filas del filtro y sólo
+        guarda n.
+        """
+        if metodo not in METODOS:
+            raise ValueError(f"metodo debe ser uno de {', '.join(METODOS)}")
+        if metodo == 'reservorio':
+            return self.db.obtener_muestras_reservorio(categorias, temas, dificultad, n).drop(columns='muestra')
+        instantanea = self._instantanea()
+        if instantanea is not None:
+            filas = instantanea.por_ids(instantanea.muestrear_ids(categorias, temas, dificultad, n))
+            return pd.DataFrame(filas, columns=list(CAMPOS_PREGUNTA))
+        if self.indice is not None:
+            return self.db.obtener_por_ids(self.indice.muestrear_ids(categorias, temas, dificultad, n))
+        return self.db.obtener_muestra(categorias, temas, dificultad, n)
+    
+    def muestrear_estratificado(self, categorias, temas, dificultad=None, n=8, por='dificultad',
+                                cuotas=None, semilla=None):
+        """Examen balanceado entre dificultades, temas o categorías (ver MuestreadorEstratificado)"""
+        if self._estratificado is None:
+            indice = self.indice if self.indice is not None else IndiceColumnar(self.db.conexiones)
+            self._estratificado = MuestreadorEstratificado(indice)
+        ids = self._estratificado.muestrear_ids(categorias, temas, dificultad, n, por, cuotas, semilla)
+        return self.db.obtener_por_ids(ids)
+    
+    def generar_examenes(self, semillas, categorias, temas, dificultad=None, n=8):
+        """Un examen de n preguntas por semilla, todos en una sola pasada por la selección.
+
+        Devuelve un DataFrame con la columna examen (posición de la semilla);
+        groupby('examen') separa los exámenes.
+        """
+        rngs = [random.Random(semilla) for semilla in semillas]
+        df = self.db.obtener_muestras_reservorio(categorias, temas, dificultad, n, rngs)
+        return df.rename(columns={'muestra': 'examen'})
+    
+    def samplear(self, df, n=8, semilla=None):
+        """n filas de df al azar; con la misma semilla, las mismas filas"""
+        if len(df) <= n:
+            return df.copy()
+        return df.sample(n=n, random_state=semilla).copy()
+    
+    def mostrar_estadisticas(self):
+        """Muestra estadísticas de la base de datos"""
+        return self._consultar(('estadisticas',), self.db.obtener_estadisticas_dificultad)
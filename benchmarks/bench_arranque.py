@@ -0,0 +1,88 @@
+"""
+Benchmark de arranque en frío de la aplicación.
+
+Mide, en procesos nuevos:
+  - el tiempo de importar Quiz1/Quiz2 y qué módulos pesados quedan cargados,
+  - el tiempo hasta el primer pintado de la ventana (requiere display),
+  - el tiempo hasta que el banco de preguntas termina de cargar.
+
+Uso:
+    python benchmarks/bench_arranque.py
+    python benchmarks/bench_arranque.py --app Quiz2 --repeticiones 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPT_IMPORTACION = '''
+import json, sys, time
+inicio = time.perf_counter()
+import {app}
+fin = time.perf_counter()
+pesados = [m for m in ("pandas", "numpy", "matplotlib") if m in sys.modules]
+print(json.dumps({{"importacion": fin - inicio, "pesados": pesados}}))
+'''
+
+SCRIPT_PINTADO = '''
+import json, time
+inicio = time.perf_counter()
+import {app}
+root = {app}.tk.Tk()
+app = {app}.QuizApp(root)
+root.update()
+primer_pintado = time.perf_counter() - inicio
+while app.banco is None:
+    root.update()
+    time.sleep(0.005)
+banco_listo = time.perf_counter() - inicio
+root.destroy()
+print(json.dumps({{"primer_pintado": primer_pintado, "banco_listo": banco_listo}}))
+'''
+
+
+def ejecutar(script, cwd):
+    env = dict(os.environ, PYTHONPATH=RAIZ + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    salida = subprocess.run([sys.executable, '-c', script], cwd=cwd, env=env,
+                            capture_output=True, text=True)
+    if salida.returncode != 0:
+        raise RuntimeError(salida.stderr.strip().splitlines()[-1] if salida.stderr else 'error')
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def resumen(nombre, valores):
+    print(f"{nombre:18s} mediana {statistics.median(valores) * 1000:8.1f} ms   "
+          f"mín {min(valores) * 1000:8.1f} ms   máx {max(valores) * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío")
+    parser.add_argument('--app', default='Quiz1', choices=['Quiz1', 'Quiz2'])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        importaciones = []
+        for _ in range(args.repeticiones):
+            datos = ejecutar(SCRIPT_IMPORTACION.format(app=args.app), tmp)
+            importaciones.append(datos['importacion'])
+        resumen('importación', importaciones)
+        print(f"{'módulos pesados':18s} {', '.join(datos['pesados']) or 'ninguno'} cargados al importar")
+
+        try:
+            resultados = [ejecutar(SCRIPT_PINTADO.format(app=args.app), tmp)
+                          for _ in range(args.repeticiones)]
+        except RuntimeError as e:
+            print(f"Primer pintado no medido (¿hay display disponible?): {e}")
+            return
+        resumen('primer pintado', [r['primer_pintado'] for r in resultados])
+        resumen('banco listo', [r['banco_listo'] for r in resultados])
+
+
+if __name__ == "__main__":
+    main()
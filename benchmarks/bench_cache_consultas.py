@@ -0,0 +1,112 @@
+"""
+Benchmark de la caché de consultas de BancoPreguntas.
+
+Crea un banco sintético en un directorio temporal y simula a un estudiante
+que alterna categorías en la pantalla de configuración y pulsa "Comenzar":
+cada paso pide temas_disponibles, filtrar y mostrar_estadisticas con una de
+unas pocas selecciones posibles. Compara el tiempo por llamada sin caché,
+el de la primera llamada con caché (fallo) y el de las siguientes
+(aciertos), y luego muestra que registrar un intento no invalida la caché
+pero agregar una pregunta sí.
+
+Uso:
+    python benchmarks/bench_cache_consultas.py
+    python benchmarks/bench_cache_consultas.py --filas 100000 --pasos 500
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import insertar_preguntas
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+
+
+def _filas_sinteticas(n, rng):
+    for i in range(n):
+        categoria = rng.choice(CATEGORIAS)
+        yield (categoria, f"{categoria}-tema-{rng.randrange(40):03d}", rng.randint(1, 3),
+               f'Pregunta sintética {i}', 'Opción A', 'Opción B', 'Opción C', 'Opción D', rng.choice('abcd'))
+
+
+def selecciones(banco, rng):
+    """Unas pocas configuraciones distintas, con categorías en cualquier orden"""
+    resultado = []
+    for categorias in (['micro'], ['macro', 'micro'], CATEGORIAS, ['finanzas']):
+        temas = banco.db.obtener_temas_disponibles(categorias)
+        for dificultad in (None, 2):
+            resultado.append((categorias, temas[:len(temas) // 2 + 1], dificultad))
+    return resultado
+
+
+def recorrer(banco, pasos, configuraciones, rng):
+    """Tiempo medio por llamada (µs) de cada consulta"""
+    tiempos = {'temas_disponibles': 0.0, 'filtrar': 0.0, 'mostrar_estadisticas': 0.0}
+    for _ in range(pasos):
+        categorias, temas, dificultad = rng.choice(configuraciones)
+        categorias = rng.sample(categorias, len(categorias))
+
+        inicio = time.perf_counter()
+        banco.temas_disponibles(categorias)
+        tiempos['temas_disponibles'] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        banco.filtrar(categorias, temas, dificultad)
+        tiempos['filtrar'] += time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        banco.mostrar_estadisticas()
+        tiempos['mostrar_estadisticas'] += time.perf_counter() - inicio
+    return {nombre: total / pasos * 1e6 for nombre, total in tiempos.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la caché de consultas")
+    parser.add_argument('--filas', type=int, default=20000)
+    parser.add_argument('--pasos', type=int, default=300)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench_cache_'))
+    from Quiz1 import BancoPreguntas
+
+    banco = BancoPreguntas(cache=False)
+    conn = sqlite3.connect(banco.db.db_path)
+    with conn:
+        insertar_preguntas(conn.cursor(), _filas_sinteticas(args.filas, random.Random(42)))
+    configuraciones = selecciones(banco, random.Random(0))
+
+    sin_cache = recorrer(banco, args.pasos, configuraciones, random.Random(1))
+    banco = BancoPreguntas()
+    fallos = recorrer(banco, 1, configuraciones, random.Random(1))
+    for categorias, temas, dificultad in configuraciones:
+        banco.temas_disponibles(categorias)
+        banco.filtrar(categorias, temas, dificultad)
+    con_cache = recorrer(banco, args.pasos, configuraciones, random.Random(1))
+
+    print(f"{args.filas:,d} preguntas extra, {args.pasos} pasos, {len(configuraciones)} configuraciones\n")
+    print(f"{'consulta':22s} {'sin caché µs':>13} {'primer fallo µs':>16} {'acierto µs':>11}")
+    for nombre in sin_cache:
+        print(f"{nombre:22s} {sin_cache[nombre]:13.1f} {fallos[nombre]:16.1f} {con_cache[nombre]:11.1f}")
+    print(f"\n{banco.cache.estadisticas()}")
+
+    # Registrar intentos cambia data_version pero no las preguntas
+    with conn:
+        conn.execute("INSERT INTO intentos (usuario, fecha, puntaje, total) VALUES ('bench', 'hoy', 5, 8)")
+    banco.mostrar_estadisticas()
+    print(f"tras registrar un intento:  {banco.cache.estadisticas()}")
+
+    with conn:
+        insertar_preguntas(conn.cursor(), [('micro', 'Nuevo', 1, 'Pregunta nueva', 'a', 'b', 'c', 'd', 'a')])
+    banco.mostrar_estadisticas()
+    print(f"tras agregar una pregunta: {banco.cache.estadisticas()}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark de calificación: bucle Python vs. comparación vectorizada.
+
+Mide calificar un quiz individual (el caso de la interfaz) y calificar un
+lote grande de hojas de respuesta sintéticas (el caso de un curso completo).
+
+Uso:
+    python benchmarks/bench_calificacion.py
+    python benchmarks/bench_calificacion.py --hojas 1000000 --preguntas 20
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calificacion import LETRAS, calificar, calificar_lote, codificar_letras
+
+
+def calificar_bucle(elegidas, correctas):
+    """Forma anterior: comparar letra por letra"""
+    aciertos = [e != '' and e.lower() == c for e, c in zip(elegidas, correctas)]
+    return sum(aciertos), aciertos
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de calificación")
+    parser.add_argument('--hojas', type=int, default=1_000_000)
+    parser.add_argument('--preguntas', type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    correctas = [rng.choice(LETRAS) for _ in range(args.preguntas)]
+    elegidas = [rng.choice(LETRAS + ('',)) for _ in range(args.preguntas)]
+    cod_correctas = codificar_letras(correctas)
+    cod_elegidas = codificar_letras(elegidas)
+
+    assert calificar_bucle(elegidas, correctas)[0] == calificar(cod_elegidas, cod_correctas)[1]
+    t_bucle = medir(lambda: calificar_bucle(elegidas, correctas), 100_000)
+    t_vector = medir(lambda: calificar(cod_elegidas, cod_correctas), 100_000)
+    print(f"Un quiz ({args.preguntas} preguntas)")
+    print(f"  bucle Python      {t_bucle * 1e6:8.2f} µs")
+    print(f"  vectorizado       {t_vector * 1e6:8.2f} µs")
+
+    generador = np.random.default_rng(0)
+    matriz = generador.integers(-1, 4, size=(args.hojas, args.preguntas), dtype=np.int8)
+    print(f"\nLote de {args.hojas:,} hojas x {args.preguntas} preguntas "
+          f"({matriz.nbytes / 1e6:.1f} MB en int8)")
+
+    muestra = min(args.hojas, 100_000)
+    hojas_letras = [[LETRAS[c] if c >= 0 else '' for c in fila] for fila in matriz[:muestra].tolist()]
+    inicio = time.perf_counter()
+    for hoja in hojas_letras:
+        calificar_bucle(hoja, correctas)
+    t_bucle = (time.perf_counter() - inicio) * args.hojas / muestra
+    print(f"  bucle Python      {t_bucle:8.3f} s   (extrapolado de {muestra:,} hojas)")
+
+    inicio = time.perf_counter()
+    _, puntajes, tasa = calificar_lote(matriz, cod_correctas)
+    t_vector = time.perf_counter() - inicio
+    print(f"  vectorizado       {t_vector:8.3f} s   ({args.hojas / t_vector:,.0f} hojas/s)")
+    print(f"  puntaje medio {puntajes.mean():.2f}; acierto por pregunta "
+          + ' '.join(f"{t:.2f}" for t in tasa))
+
+
+if __name__ == "__main__":
+    main()
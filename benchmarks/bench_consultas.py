@@ -0,0 +1,136 @@
+"""
+Benchmark de las consultas del banco de preguntas.
+
+Genera bases sintéticas de distintos tamaños, muestra el EXPLAIN QUERY PLAN
+de cada consulta de DatabaseManager y mide su tiempo con y sin índices.
+
+Uso:
+    python benchmarks/bench_consultas.py
+    python benchmarks/bench_consultas.py --filas 1000,100000 --repeticiones 20
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import (SQL_TABLA_ESTADISTICAS, SQL_TABLA_PREGUNTAS, SQL_TABLAS_INTENTOS, crear_indices,
+                     reconstruir_estadisticas)
+from listas_sql import EN_LISTA, filtro_preguntas, lista_json
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+TEMAS_POR_CATEGORIA = 40
+
+
+def _temas(categoria):
+    return [f"{categoria}-tema-{i:03d}" for i in range(TEMAS_POR_CATEGORIA)]
+
+
+def _filas_sinteticas(n, rng):
+    for _ in range(n):
+        categoria = rng.choice(CATEGORIAS)
+        tema = f"{categoria}-tema-{rng.randrange(TEMAS_POR_CATEGORIA):03d}"
+        yield (categoria, tema, rng.randint(1, 3), 'Pregunta sintética',
+               'Opción A', 'Opción B', 'Opción C', 'Opción D', rng.choice('abcd'))
+
+
+def crear_base(ruta, n, con_indices):
+    conn = sqlite3.connect(ruta)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute(SQL_TABLA_PREGUNTAS)
+    for sql in SQL_TABLAS_INTENTOS:
+        conn.execute(sql)
+    with conn:
+        conn.executemany('''
+            INSERT INTO preguntas (categoria, tema, dificultad, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', _filas_sinteticas(n, random.Random(42)))
+    conn.execute(SQL_TABLA_ESTADISTICAS)
+    reconstruir_estadisticas(conn.cursor())
+    if con_indices:
+        crear_indices(conn.cursor())
+    conn.execute("ANALYZE")
+    conn.commit()
+    return conn
+
+
+def consultas():
+    """Mismas consultas que ejecuta DatabaseManager (y las que reemplazó la tabla de conteos)"""
+    categorias = ['micro', 'macro']
+    temas = _temas('micro')[:5] + _temas('macro')[:5]
+    where, params = filtro_preguntas(categorias, temas, 2)
+    return [
+        ('obtener_preguntas', f'SELECT * FROM preguntas WHERE {where} ORDER BY RANDOM()', params),
+        ('obtener_temas_disponibles', f'''
+            SELECT DISTINCT tema FROM estadisticas_banco
+            WHERE categoria {EN_LISTA}
+            ORDER BY tema
+        ''', [lista_json(categorias)]),
+        ('obtener_estadisticas_dificultad', '''
+            SELECT dificultad, SUM(cantidad) as cantidad
+            FROM estadisticas_banco
+            GROUP BY dificultad
+            ORDER BY dificultad
+        ''', []),
+        ('obtener_estadisticas_categorias', '''
+            SELECT categoria, COUNT(DISTINCT tema) as temas, SUM(cantidad) as cantidad
+            FROM estadisticas_banco
+            GROUP BY categoria
+            ORDER BY categoria
+        ''', []),
+        ('temas (agrupando preguntas)', '''
+            SELECT DISTINCT tema FROM preguntas
+            WHERE categoria IN (?, ?)
+            ORDER BY tema
+        ''', categorias),
+        ('dificultad (agrupando preguntas)', '''
+            SELECT dificultad, COUNT(*) as cantidad
+            FROM preguntas
+            GROUP BY dificultad
+            ORDER BY dificultad
+        ''', []),
+    ]
+
+
+def medir(conn, sql, params, repeticiones):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--filas', default='1000,100000,1000000',
+                        help='tamaños de banco separados por coma')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    tamanos = [int(x) for x in args.filas.split(',')]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in tamanos:
+            for con_indices in (False, True):
+                ruta = os.path.join(tmp, f"bench_{n}_{int(con_indices)}.db")
+                inicio = time.perf_counter()
+                conn = crear_base(ruta, n, con_indices)
+                carga = time.perf_counter() - inicio
+                etiqueta = 'con índices' if con_indices else 'sin índices'
+                print(f"\n=== {n:,} filas, {etiqueta} (carga {carga:.1f}s) ===")
+                for nombre, sql, params in consultas():
+                    plan = conn.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+                    tiempo = medir(conn, sql, params, args.repeticiones)
+                    print(f"{nombre:34s} {tiempo * 1000:10.3f} ms")
+                    for fila in plan:
+                        print(f"    {fila[-1]}")
+                conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark de generación de exámenes para un curso completo.
+
+Arma una forma de examen por estudiante (semilla = nombre del estudiante)
+con MuestreadorEstratificado, balanceada por dificultad, y la compara con
+barajar toda la selección para cada forma (lo que cuesta df.sample sobre el
+DataFrame filtrado). Informa formas por segundo, cuántas formas distintas
+salieron y si todas respetan las cuotas.
+
+Uso:
+    python benchmarks/bench_formas_examen.py
+    python benchmarks/bench_formas_examen.py --filas 500000 --estudiantes 20000 --n 30
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import obtener_gestor
+from esquema import crear_esquema, insertar_preguntas
+from indice_memoria import IndiceColumnar
+from muestreo_estratificado import MuestreadorEstratificado
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+
+
+def crear_base(ruta, filas, rng):
+    conn = sqlite3.connect(ruta)
+    crear_esquema(conn.cursor())
+    with conn:
+        insertar_preguntas(conn.cursor(), (
+            (categoria, f"{categoria}-{rng.randrange(50):02d}", rng.choices((1, 2, 3), (5, 3, 1))[0],
+             f'Pregunta sintética {i}', 'A', 'B', 'C', 'D', rng.choice('abcd'))
+            for i in range(filas) for categoria in [rng.choice(CATEGORIAS)]))
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de formas de examen por curso")
+    parser.add_argument('--filas', type=int, default=100000)
+    parser.add_argument('--estudiantes', type=int, default=5000)
+    parser.add_argument('--n', type=int, default=9)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, 'bench.db')
+        crear_base(ruta, args.filas, random.Random(42))
+        conexiones = obtener_gestor(ruta)
+        indice = IndiceColumnar(conexiones)
+        muestreador = MuestreadorEstratificado(indice)
+        categorias = ['micro', 'macro']
+        semillas = [f'estudiante-{i}' for i in range(args.estudiantes)]
+
+        inicio = time.perf_counter()
+        estratos = muestreador.estratos(categorias, None)
+        preparar = time.perf_counter() - inicio
+        tamanos = {clave: len(ids) for clave, ids in estratos.items()}
+
+        inicio = time.perf_counter()
+        formas = muestreador.formas(semillas, categorias, None, n=args.n)
+        estratificado = time.perf_counter() - inicio
+
+        dificultad_de = dict(zip(indice.ids.tolist(), indice.dificultad.tolist()))
+        balanceadas = sum(max(Counter(dificultad_de[i] for i in forma).values()) -
+                          min(Counter(dificultad_de[i] for i in forma).values()) <= 1
+                          for forma in formas)
+        repetida = muestreador.formas(semillas[:1], categorias, None, n=args.n)[0] == formas[0]
+
+        # Referencia: barajar la selección completa para cada forma
+        pool = indice.filtrar_ids(categorias, None).tolist()
+        referencia_n = min(args.estudiantes, 200)
+        inicio = time.perf_counter()
+        for semilla in semillas[:referencia_n]:
+            rng = random.Random(semilla)
+            copia = pool[:]
+            rng.shuffle(copia)
+            copia[:args.n]
+        barajar = (time.perf_counter() - inicio) / referencia_n
+
+        print(f"{args.filas:,d} preguntas; selección de {len(pool):,d}, estratos {tamanos}")
+        print(f"agrupar estratos (una vez por filtro): {preparar * 1000:.1f} ms")
+        print(f"estratificado: {args.estudiantes / estratificado:12,.0f} formas/s "
+              f"({estratificado / args.estudiantes * 1e6:.1f} µs por forma)")
+        print(f"barajar todo:  {1 / barajar:12,.0f} formas/s ({barajar * 1e6:.1f} µs por forma)")
+        print(f"formas distintas: {len(set(map(tuple, formas))):,d} de {len(formas):,d}; "
+              f"balanceadas: {balanceadas:,d}; misma semilla, misma forma: {repetida}")
+        indice.cerrar()
+        conexiones.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark de la instantánea binaria del banco.
+
+Exporta un banco sintético a una instantánea y compara, para un proceso
+que arranca, cargar el IndiceColumnar desde SQLite contra abrir la
+instantánea con mmap. También mide filtrar+muestrear desde cada fuente, y
+lanza varios procesos que abren la misma instantánea y muestrean, para
+ver cuánta memoria privada agrega cada uno (en Linux, Private_* de
+/proc/self/smaps_rollup; las páginas del archivo se comparten).
+
+Uso:
+    python benchmarks/bench_instantanea.py
+    python benchmarks/bench_instantanea.py --filas 1000000 --procesos 8
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import obtener_gestor
+from esquema import crear_esquema, insertar_preguntas
+from indice_memoria import IndiceColumnar
+from instantanea import Instantanea, exportar
+from listas_sql import lista_json, seleccion_por_ids
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+
+
+def crear_base(ruta, filas, rng):
+    conn = sqlite3.connect(ruta)
+    crear_esquema(conn.cursor())
+    with conn:
+        insertar_preguntas(conn.cursor(), (
+            (categoria, f"{categoria}-{rng.randrange(200):03d}", rng.randint(1, 3),
+             f'¿Pregunta sintética número {i}, con un enunciado de largo realista?',
+             'Primera opción', 'Segunda opción', 'Tercera opción', 'Cuarta opción', rng.choice('abcd'))
+            for i in range(filas) for categoria in [rng.choice(CATEGORIAS)]))
+    return conn
+
+
+def memoria_privada_kb():
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            return sum(int(linea.split()[1]) for linea in f if linea.startswith('Private_'))
+    except OSError:
+        return None
+
+
+def trabajador(ruta, cola):
+    antes = memoria_privada_kb()
+    inicio = time.perf_counter()
+    instantanea = Instantanea(ruta)
+    abrir = time.perf_counter() - inicio
+    temas = instantanea.temas_disponibles(['micro', 'macro'])
+    for _ in range(200):
+        instantanea.por_ids(instantanea.muestrear_ids(['micro', 'macro'], temas, None, 8))
+    despues = memoria_privada_kb()
+    cola.put((abrir, None if antes is None else despues - antes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la instantánea binaria")
+    parser.add_argument('--filas', type=int, default=300000)
+    parser.add_argument('--procesos', type=int, default=4)
+    parser.add_argument('--muestras', type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta_db = os.path.join(tmp, 'bench.db')
+        ruta_snap = os.path.join(tmp, 'bench.snap')
+        conn = crear_base(ruta_db, args.filas, random.Random(42))
+
+        inicio = time.perf_counter()
+        exportar(conn, ruta_snap)
+        exportacion = time.perf_counter() - inicio
+        print(f"{args.filas:,d} preguntas: base {os.path.getsize(ruta_db) / 2**20:.1f} MB, "
+              f"instantánea {os.path.getsize(ruta_snap) / 2**20:.1f} MB (exportada en {exportacion:.1f}s)\n")
+
+        conexiones = obtener_gestor(ruta_db)
+        inicio = time.perf_counter()
+        indice = IndiceColumnar(conexiones)
+        carga_indice = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        instantanea = Instantanea(ruta_snap)
+        carga_snap = time.perf_counter() - inicio
+        print(f"arranque: IndiceColumnar {carga_indice * 1000:9.1f} ms   instantánea {carga_snap * 1000:7.3f} ms")
+
+        temas = instantanea.temas_disponibles(['micro', 'macro'])
+        lector = conexiones.conexion()
+        inicio = time.perf_counter()
+        for _ in range(args.muestras):
+            ids = indice.muestrear_ids(['micro', 'macro'], temas, None, 8)
+            lector.execute(seleccion_por_ids(), [lista_json(ids)]).fetchall()
+        desde_indice = (time.perf_counter() - inicio) / args.muestras
+        inicio = time.perf_counter()
+        for _ in range(args.muestras):
+            instantanea.por_ids(instantanea.muestrear_ids(['micro', 'macro'], temas, None, 8))
+        desde_snap = (time.perf_counter() - inicio) / args.muestras
+        print(f"muestrear 8: índice + SQLite {desde_indice * 1000:6.2f} ms   "
+              f"instantánea {desde_snap * 1000:6.2f} ms")
+
+        cola = multiprocessing.Queue()
+        procesos = [multiprocessing.Process(target=trabajador, args=(ruta_snap, cola))
+                    for _ in range(args.procesos)]
+        for proceso in procesos:
+            proceso.start()
+        resultados = [cola.get() for _ in procesos]
+        for proceso in procesos:
+            proceso.join()
+        print(f"\n{args.procesos} procesos con la misma instantánea:")
+        for abrir, privada in resultados:
+            extra = f", memoria privada +{privada / 1024:.1f} MB" if privada is not None else ""
+            print(f"  abrir {abrir * 1000:.3f} ms{extra}")
+
+        instantanea.cerrar()
+        indice.cerrar()
+        conexiones.cerrar()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark de filtros con muchas categorías/temas seleccionados.
+
+Compara el filtro anterior, con un marcador ? por tema
+(categoria IN (?, ?, ...) AND tema IN (?, ?, ...)), contra el de
+listas_sql, que pasa cada lista como un arreglo JSON leído con json_each y
+mantiene constante el texto de la sentencia. Para cada cantidad de temas
+seleccionados repite la consulta de obtener_preguntas y el muestreo (con
+marcadores, la consulta de muestreo anterior; con json_each,
+muestrear_ids); entre repeticiones se desmarcan hasta dos temas, como hace
+un estudiante en la pantalla de configuración, así que con marcadores el
+texto SQL cambia y hay que volver a compilarlo.
+
+Cada medición se hace dos veces: sin estadísticas del planificador y
+después de ANALYZE (PRAGMA optimize, al cerrar la aplicación, crea la
+misma tabla sqlite_stat1), porque con estadísticas SQLite puede elegir
+otro plan para las mismas consultas. Con pocos temas en un banco con
+muchos temas la selección es muy chica, el caso en que un mal plan
+recorre todo el banco.
+
+Uso:
+    python benchmarks/bench_listas_in.py
+    python benchmarks/bench_listas_in.py --temas 3 10 1000 10000 40000 --filas 200000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import crear_esquema, insertar_preguntas
+from listas_sql import filtro_preguntas
+from muestreo import muestrear_ids
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+
+
+def filtro_marcadores(categorias, temas, dificultad=None):
+    """El filtro anterior: un marcador por valor"""
+    where = 'categoria IN ({}) AND tema IN ({})'.format(
+        ','.join('?' * len(categorias)), ','.join('?' * len(temas)))
+    params = list(categorias) + list(temas)
+    if dificultad:
+        where += ' AND dificultad = ?'
+        params.append(dificultad)
+    return where, params
+
+
+def crear_base(ruta, filas, temas_por_categoria, rng):
+    conn = sqlite3.connect(ruta)
+    conn.execute("PRAGMA journal_mode = WAL")
+    crear_esquema(conn.cursor())
+    with conn:
+        insertar_preguntas(conn.cursor(), (
+            (categoria, f"{categoria}-{rng.randrange(temas_por_categoria):05d}", rng.randint(1, 3),
+             f'Pregunta sintética {i}', 'A', 'B', 'C', 'D', rng.choice('abcd'))
+            for i in range(filas) for categoria in [rng.choice(CATEGORIAS)]))
+    return conn
+
+
+def consultas(conn, filtro, temas, rng):
+    """(nombre, función que ejecuta la consulta) para obtener_preguntas y el muestreo"""
+    where, params = filtro(CATEGORIAS, temas, 2)
+    obtener = f'SELECT * FROM preguntas WHERE {where} ORDER BY RANDOM()'
+    if filtro is filtro_preguntas:
+        def muestrear():
+            return muestrear_ids(conn, CATEGORIAS, temas, 2, 8, rng)
+    else:
+        def muestrear():
+            return conn.execute(f'SELECT id FROM preguntas WHERE {where} AND azar >= ? ORDER BY azar LIMIT ?',
+                                params + [0, 8]).fetchall()
+    return (
+        ('obtener_preguntas', lambda: conn.execute(obtener, params).fetchall()),
+        ('muestrear_ids', muestrear),
+    )
+
+
+def medir(conn, filtro, todos, k, repeticiones, rng):
+    """Tiempo medio (ms) por consulta, o el error de SQLite"""
+    tiempos = {}
+    for _ in range(repeticiones):
+        temas = rng.sample(todos, k)[:k - rng.randrange(min(3, k))]
+        for nombre, consulta in consultas(conn, filtro, temas, rng):
+            inicio = time.perf_counter()
+            try:
+                consulta()
+            except sqlite3.OperationalError as e:
+                return str(e)
+            tiempos[nombre] = tiempos.get(nombre, 0.0) + time.perf_counter() - inicio
+    return {nombre: total / repeticiones * 1000 for nombre, total in tiempos.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de filtros con listas grandes")
+    parser.add_argument('--temas', type=int, nargs='+', default=[3, 10, 100, 1000, 10000])
+    parser.add_argument('--filas', type=int, default=100000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    temas_por_categoria = max(args.temas) // len(CATEGORIAS) + 1
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = crear_base(os.path.join(tmp, 'bench.db'), args.filas, temas_por_categoria, random.Random(42))
+        todos = [fila[0] for fila in conn.execute("SELECT DISTINCT tema FROM preguntas")]
+        print(f"{args.filas:,d} preguntas, {len(todos):,d} temas distintos\n")
+        print(f"{'estadísticas':>12} {'temas':>7} {'consulta':18s} {'marcadores ms':>14} {'json_each ms':>13}")
+        for estadisticas in ('no', 'sí'):
+            if estadisticas == 'sí':
+                conn.execute("ANALYZE")
+            for k in args.temas:
+                k = min(k, len(todos))
+                resultados = [medir(conn, filtro, todos, k, args.repeticiones, random.Random(k))
+                              for filtro in (filtro_marcadores, filtro_preguntas)]
+                for nombre in ('obtener_preguntas', 'muestrear_ids'):
+                    celdas = [r if isinstance(r, str) else f"{r[nombre]:.3f}" for r in resultados]
+                    print(f"{estadisticas:>12} {k:7,d} {nombre:18s} {celdas[0]:>14} {celdas[1]:>13}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
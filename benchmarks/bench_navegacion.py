@@ -0,0 +1,115 @@
+"""
+Benchmark de latencia de navegación entre pantallas (requiere display).
+
+Repite el ciclo inicio → configuración → quiz → resultados → inicio que
+hace un usuario con "Nuevo Quiz", primero reconstruyendo cada pantalla
+como antes (GestorPantallas con cache=False) y luego reutilizándolas.
+Mide cada transición hasta que Tk termina de procesar la geometría
+(update_idletasks) y cuenta los widgets vivos al final.
+
+Uso:
+    python benchmarks/bench_navegacion.py
+    python benchmarks/bench_navegacion.py --app Quiz2 --ciclos 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+TRANSICIONES = ('configuracion', 'quiz', 'resultados', 'inicio')
+
+# Quiz1 o Quiz2, según --app
+app_modulo = None
+
+
+def contar_widgets(widget):
+    return 1 + sum(contar_widgets(hijo) for hijo in widget.winfo_children())
+
+
+def esperar(root, condicion):
+    while not condicion():
+        root.update()
+        time.sleep(0.002)
+
+
+def medir(root, accion):
+    inicio = time.perf_counter()
+    accion()
+    root.update_idletasks()
+    return time.perf_counter() - inicio
+
+
+def ciclo(app, root, rng, tiempos):
+    tiempos['configuracion'].append(medir(root, app.mostrar_configuracion))
+    esperar(root, lambda: not app.tareas.ocupada('temas'))
+
+    # Igual que _quiz_listo, sin el cuadro de diálogo informativo
+    categorias = ['micro', 'macro', 'finanzas']
+    df_quiz = app.banco.muestrear(categorias, app.lista_temas.seleccionados(), None, n=8)
+    app.quiz = app_modulo.QuizEngine(df_quiz)
+    app.cuenta = None
+    app.timer_id = None
+    tiempos['quiz'].append(medir(root, app.mostrar_quiz))
+
+    for _ in range(app.quiz.total):
+        app.seleccionar_opcion(rng.randrange(4))
+        app.siguiente_pregunta()
+    tiempos['resultados'].append(medir(root, app.finalizar_quiz))
+    root.update()
+
+    tiempos['inicio'].append(medir(root, app.mostrar_inicio))
+    root.update()
+
+
+def correr(cache, ciclos):
+    root = app_modulo.tk.Tk()
+    app = app_modulo.QuizApp(root)
+    app.pantallas.cache = cache
+    esperar(root, lambda: app.banco is not None)
+
+    rng = random.Random(0)
+    tiempos = {nombre: [] for nombre in TRANSICIONES}
+    ciclo(app, root, rng, {nombre: [] for nombre in TRANSICIONES})  # calentamiento
+    for _ in range(ciclos):
+        ciclo(app, root, rng, tiempos)
+
+    widgets = contar_widgets(root)
+    construidas = app.pantallas.construidas
+    app.registro.cerrar()
+    app.renderizador.cerrar()
+    app.tareas.cerrar()
+    root.destroy()
+    return tiempos, widgets, construidas
+
+
+def main():
+    global app_modulo
+    parser = argparse.ArgumentParser(description="Benchmark de navegación entre pantallas")
+    parser.add_argument('--app', default='Quiz1', choices=['Quiz1', 'Quiz2'])
+    parser.add_argument('--ciclos', type=int, default=20)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench_navegacion_'))
+    app_modulo = __import__(args.app)
+
+    for cache, nombre in ((False, 'reconstruyendo'), (True, 'reutilizando')):
+        try:
+            tiempos, widgets, construidas = correr(cache, args.ciclos)
+        except app_modulo.tk.TclError as e:
+            print(f"No se pudo abrir la ventana (¿hay display disponible?): {e}")
+            return
+        print(f"\n{nombre}: {construidas} pantallas construidas, {widgets} widgets vivos al final")
+        for transicion in TRANSICIONES:
+            valores = tiempos[transicion]
+            print(f"  → {transicion:14s} mediana {statistics.median(valores) * 1000:7.1f} ms   "
+                  f"máx {max(valores) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
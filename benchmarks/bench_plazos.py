@@ -0,0 +1,151 @@
+"""
+Benchmark del vencimiento de plazos para muchas sesiones simultáneas.
+
+Compara, con un reloj simulado de 1 s por tick durante el límite de 600 s:
+  - rueda:   RuedaPlazos (O(1) programar/cancelar, sólo mira ranuras vencidas)
+  - heap:    heapq con cancelación perezosa
+  - revisar: revisar todas las sesiones en cada tick (equivale a un timer por sesión)
+Luego mide el servidor de sesiones finalizando por lotes las sesiones vencidas.
+
+Uso:
+    python benchmarks/bench_plazos.py
+    python benchmarks/bench_plazos.py --sesiones 10000 100000 --cancelar 0.3
+"""
+import argparse
+import asyncio
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from planificador_plazos import RuedaPlazos
+
+LIMITE = 600
+
+
+class RelojSimulado:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def plazos_aleatorios(n, rng):
+    # Las sesiones empiezan escalonadas durante los primeros 5 minutos
+    return [rng.uniform(0, 300) + LIMITE for _ in range(n)]
+
+
+def con_rueda(plazos, canceladas):
+    reloj = RelojSimulado()
+    rueda = RuedaPlazos(resolucion=1.0, reloj=reloj)
+    inicio = time.perf_counter()
+    for i, plazo in enumerate(plazos):
+        rueda.programar(i, plazo)
+    for i in canceladas:
+        rueda.cancelar(i)
+    vencidas = 0
+    for segundo in range(int(max(plazos)) + 2):
+        reloj.ahora = float(segundo)
+        vencidas += len(rueda.avanzar())
+    return time.perf_counter() - inicio, vencidas
+
+
+def con_heap(plazos, canceladas):
+    inicio = time.perf_counter()
+    heap = []
+    for i, plazo in enumerate(plazos):
+        heapq.heappush(heap, (plazo, i))
+    anuladas = set(canceladas)
+    vencidas = 0
+    for segundo in range(int(max(plazos)) + 2):
+        while heap and heap[0][0] <= segundo:
+            _, i = heapq.heappop(heap)
+            if i in anuladas:
+                anuladas.discard(i)
+            else:
+                vencidas += 1
+    return time.perf_counter() - inicio, vencidas
+
+
+def revisando_todas(plazos, canceladas):
+    inicio = time.perf_counter()
+    activas = dict(enumerate(plazos))
+    for i in canceladas:
+        del activas[i]
+    vencidas = 0
+    for segundo in range(int(max(plazos)) + 2):
+        listas = [i for i, plazo in activas.items() if plazo <= segundo]
+        for i in listas:
+            del activas[i]
+        vencidas += len(listas)
+    return time.perf_counter() - inicio, vencidas
+
+
+def finalizacion_servidor(n, rng):
+    """Tiempo de vencer n sesiones dentro de ServidorSesiones, por lotes como lo hace su tarea de plazos"""
+    from motor_quiz import PreguntaQuiz, QuizEngine
+    from servidor_sesiones import LOTE_VENCIDAS, Sesion, ServidorSesiones
+
+    with tempfile.TemporaryDirectory() as tmp:
+        servidor = ServidorSesiones(os.path.join(tmp, 'plazos.db'))
+        preguntas = [PreguntaQuiz(i, 'micro', 'Tema', 1, 'p', 'a', 'b', 'c', 'd', 'a') for i in range(8)]
+        for i in range(n):
+            motor = QuizEngine(preguntas)
+            motor.marcar_respuesta(rng.choice('abcd'))
+            sesion = Sesion(motor, f'estudiante{i}', LIMITE)
+            servidor.sesiones[str(i)] = sesion
+            servidor.plazos.programar(str(i), sesion.plazo)
+
+        # Igual que la tarea del servidor: lotes de LOTE_VENCIDAS, cediendo entre lotes
+        inicio = time.perf_counter()
+        vencidas = 0
+        peor_lote = 0.0
+        ahora = time.monotonic() + LIMITE + 2
+        while True:
+            inicio_lote = time.perf_counter()
+            vencidas += servidor.vencer_plazos(ahora=ahora, maximo=LOTE_VENCIDAS)
+            peor_lote = max(peor_lote, time.perf_counter() - inicio_lote)
+            if not servidor.pendientes_de_vencer:
+                break
+        t_vencer = time.perf_counter() - inicio
+        servidor.registro.vaciar()
+        t_total = time.perf_counter() - inicio
+        asyncio.run(servidor.detener())
+        return vencidas, t_vencer, peor_lote, t_total, servidor.registro.lotes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de vencimiento de plazos")
+    parser.add_argument('--sesiones', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--cancelar', type=float, default=0.3,
+                        help='fracción de sesiones que terminan antes del plazo')
+    parser.add_argument('--sin-revisar', action='store_true',
+                        help='omitir la estrategia de revisar todas (lenta con 100k)')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for n in args.sesiones:
+        plazos = plazos_aleatorios(n, rng)
+        canceladas = rng.sample(range(n), int(n * args.cancelar))
+        print(f"\n{n:,} sesiones, {len(canceladas):,} finalizadas antes del plazo, "
+              f"{int(max(plazos)) + 2} ticks de 1 s")
+        estrategias = [('rueda', con_rueda), ('heap', con_heap)]
+        if not args.sin_revisar:
+            estrategias.append(('revisar', revisando_todas))
+        for nombre, funcion in estrategias:
+            segundos, vencidas = funcion(plazos, canceladas)
+            print(f"  {nombre:8s} {segundos * 1000:9.1f} ms   vencidas {vencidas:,}")
+
+        vencidas, t_vencer, peor_lote, t_total, lotes = finalizacion_servidor(n, rng)
+        print(f"  servidor: {vencidas:,} sesiones finalizadas en {t_vencer * 1000:.0f} ms "
+              f"(bucle bloqueado como máximo {peor_lote * 1000:.0f} ms por lote); "
+              f"intentos en disco tras {t_total * 1000:.0f} ms ({lotes} transacciones)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark del motor con quizzes largos (sin interfaz).
+
+Para cada tamaño mide la memoria que ocupa un QuizEngine recién creado
+(tracemalloc) y el costo por clic de lo que hace la pantalla del quiz:
+saltar a una pregunta al azar con ir_a, marcarla, y pedir el estado
+respondida/pendiente de la página visible del navegador. Al final
+califica el quiz completo.
+
+Uso:
+    python benchmarks/bench_quiz_grande.py
+    python benchmarks/bench_quiz_grande.py --tamanos 8 200 2000 20000 --clics 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor_quiz import PreguntaQuiz, QuizEngine
+
+POR_PAGINA = 20
+
+
+def preguntas_sinteticas(n, rng):
+    return [PreguntaQuiz(i, rng.choice(['micro', 'macro', 'finanzas']), f'Tema {i % 97}',
+                         rng.randint(1, 3), f'Pregunta {i}', 'a', 'b', 'c', 'd', rng.choice('abcd'))
+            for i in range(n)]
+
+
+def medir(n, clics, rng):
+    preguntas = preguntas_sinteticas(n, rng)
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    quiz = QuizEngine(preguntas)
+    memoria = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+
+    destinos = [rng.randrange(n) for _ in range(clics)]
+    letras = [rng.choice('abcd') for _ in range(clics)]
+    inicio = time.perf_counter()
+    for i, letra in zip(destinos, letras):
+        quiz.ir_a(i)
+        quiz.iniciar_pregunta()
+        quiz.marcar_respuesta(letra)
+        pagina = i // POR_PAGINA * POR_PAGINA
+        quiz.respondidas_en(pagina, pagina + POR_PAGINA)
+    por_clic = (time.perf_counter() - inicio) / clics
+
+    inicio = time.perf_counter()
+    quiz.finalizar_compacto()
+    calificar = time.perf_counter() - inicio
+    return memoria, por_clic, quiz.n_respondidas, calificar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de quizzes largos")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[8, 200, 2000, 20000])
+    parser.add_argument('--clics', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # Carga numpy antes de medir para no contarlo como memoria del primer motor
+    QuizEngine(preguntas_sinteticas(1, rng)).finalizar_compacto()
+    print(f"{'preguntas':>10} {'motor KB':>9} {'B/preg':>7} {'µs/clic':>8} {'respondidas':>12} {'calificar ms':>13}")
+    for n in args.tamanos:
+        memoria, por_clic, respondidas, calificar = medir(n, args.clics, rng)
+        print(f"{n:10,d} {memoria / 1024:9.1f} {memoria / n:7.0f} {por_clic * 1e6:8.2f} "
+              f"{respondidas:12,d} {calificar * 1000:13.2f}")
+
+
+if __name__ == "__main__":
+    main()
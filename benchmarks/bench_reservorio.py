@@ -0,0 +1,92 @@
+"""
+Benchmark del muestreo con reservorio sobre el cursor de SQLite.
+
+Para selecciones de distinto tamaño compara cargar todo el filtro con
+pd.read_sql_query y recortarlo con samplear (lo que hacía filtrar +
+samplear) contra muestrear con metodo='reservorio', que lee el cursor con
+fetchmany y sólo guarda n filas. Mide tiempo y memoria pico (tracemalloc).
+Al final genera un lote de exámenes con generar_examenes, todos en una
+sola pasada por la selección.
+
+Uso:
+    python benchmarks/bench_reservorio.py
+    python benchmarks/bench_reservorio.py --filas 1000000 --examenes 2000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import insertar_preguntas
+from listas_sql import filtro_preguntas
+
+CATEGORIAS = ['micro', 'macro', 'finanzas']
+
+
+def _filas_sinteticas(n, rng):
+    for i in range(n):
+        categoria = rng.choice(CATEGORIAS)
+        yield (categoria, f"{categoria}-tema-{rng.randrange(20):02d}", rng.randint(1, 3),
+               f'Pregunta sintética número {i} con un enunciado de largo realista',
+               'Opción A', 'Opción B', 'Opción C', 'Opción D', rng.choice('abcd'))
+
+
+def medir(funcion):
+    """Resultado, tiempo y memoria pico (en otra corrida: tracemalloc hace lento todo)"""
+    inicio = time.perf_counter()
+    resultado = funcion()
+    tiempo = time.perf_counter() - inicio
+    tracemalloc.start()
+    funcion()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return resultado, tiempo, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del muestreo con reservorio")
+    parser.add_argument('--filas', type=int, default=300000)
+    parser.add_argument('--n', type=int, default=8)
+    parser.add_argument('--examenes', type=int, default=1000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='bench_reservorio_'))
+    from Quiz1 import BancoPreguntas
+
+    banco = BancoPreguntas(cache=False)
+    conn = banco.db.conexiones.conexion()
+    insertar_preguntas(conn.cursor(), _filas_sinteticas(args.filas, random.Random(42)))
+    conn.commit()
+    banco.filtrar(['micro'], ['micro-tema-00'])  # importa pandas antes de medir
+
+    todos = {c: banco.temas_disponibles([c]) for c in CATEGORIAS}
+    selecciones = [
+        (['micro'], todos['micro'][-2:], 1),
+        (['micro'], todos['micro'], None),
+        (CATEGORIAS, sum(todos.values(), []), None),
+    ]
+
+    print(f"{'seleccion':>10} {'cargar+samplear':>24} {'reservorio':>24}")
+    for categorias, temas, dificultad in selecciones:
+        df, t_df, pico_df = medir(lambda: banco.samplear(banco.filtrar(categorias, temas, dificultad), args.n))
+        _, t_res, pico_res = medir(lambda: banco.muestrear(categorias, temas, dificultad, args.n, 'reservorio'))
+        where, params = filtro_preguntas(categorias, temas, dificultad)
+        seleccion = conn.execute(f"SELECT COUNT(*) FROM preguntas WHERE {where}", params).fetchone()[0]
+        print(f"{seleccion:10,d} {t_df * 1000:9.1f} ms {pico_df / 2**20:9.1f} MB "
+              f"{t_res * 1000:9.1f} ms {pico_res / 2**20:9.2f} MB")
+
+    categorias, temas, _ = selecciones[1]
+    semillas = range(args.examenes)
+    examenes, t_lote, pico_lote = medir(lambda: banco.generar_examenes(semillas, categorias, temas, n=args.n))
+    formas = {tuple(grupo['id']) for _, grupo in examenes.groupby('examen')}
+    print(f"\n{args.examenes:,d} exámenes de {args.n} en una pasada: {t_lote * 1000:.0f} ms "
+          f"({t_lote / args.examenes * 1e6:.0f} µs por examen), pico {pico_lote / 2**20:.1f} MB; "
+          f"distintos: {len(formas):,d}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Prueba de resistencia (soak) del ciclo completo de un quiz, sin interfaz.
+
+Repite N veces lo que hace un quiosco con "Nuevo Quiz": muestrear preguntas,
+responderlas, calificar, registrar el intento y dibujar las gráficas de
+resultados. Informa el RSS del proceso a lo largo de los ciclos y, con
+tracemalloc, las líneas que más memoria acumularon después del calentamiento.
+
+Uso:
+    python benchmarks/soak_quiz.py --ciclos 500
+    python benchmarks/soak_quiz.py --ciclos 2000 --top 15 --db /tmp/soak.db
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def rss_mb():
+    """RSS actual (Linux); en otros sistemas, el máximo alcanzado"""
+    try:
+        with open('/proc/self/status') as estado:
+            for linea in estado:
+                if linea.startswith('VmRSS:'):
+                    return int(linea.split()[1]) / 1024
+    except OSError:
+        pass
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / (1024 * 1024) if sys.platform == 'darwin' else maximo / 1024
+
+
+def ciclo(app, banco, registro, renderizador, rng):
+    categorias = ['micro', 'macro', 'finanzas']
+    temas = banco.temas_disponibles(categorias)
+    quiz = app.QuizEngine(banco.muestrear(categorias, temas, None, 8))
+    for _ in range(quiz.total):
+        quiz.iniciar_pregunta()
+        quiz.marcar_respuesta(rng.choice('abcd'))
+        quiz.ir_siguiente()
+    puntaje, total, aciertos = quiz.finalizar_compacto()
+    registro.registrar('soak', puntaje, total, quiz.filas_respuestas(aciertos))
+
+    resumen = app.ResumenResultados.desde_motor(quiz, aciertos)
+    clave = resumen.clave()
+    futuros = [
+        renderizador.solicitar('comparativo', app.grafico_desempeno_comparativo, resumen, clave, (10, 4)),
+        renderizador.solicitar('dificultad', app.grafico_dificultad, resumen, clave),
+        renderizador.solicitar('evolucion', app.grafico_linea_evolucion, resumen, clave),
+    ]
+    for futuro in futuros:
+        futuro.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test del ciclo de quiz")
+    parser.add_argument('--ciclos', type=int, default=500)
+    parser.add_argument('--calentamiento', type=int, default=20,
+                        help='ciclos antes de tomar la instantánea inicial de tracemalloc')
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--db', help='carpeta de trabajo (por defecto, una temporal)')
+    args = parser.parse_args()
+
+    carpeta = args.db or tempfile.mkdtemp(prefix='soak_quiz_')
+    os.makedirs(carpeta, exist_ok=True)
+    os.chdir(carpeta)
+
+    import Quiz1 as app
+    banco = app.BancoPreguntas(indice_memoria=True)
+    registro = app.EscritorIntentos(banco.db.conexiones)
+    renderizador = app.RenderizadorGraficos()
+    rng = random.Random(0)
+
+    for _ in range(args.calentamiento):
+        ciclo(app, banco, registro, renderizador, rng)
+    registro.vaciar()
+
+    tracemalloc.start()
+    inicial = tracemalloc.take_snapshot()
+    rss_inicial = rss_mb()
+    print(f"{'ciclo':>7} {'RSS MB':>9} {'Δ MB':>8} {'ms/ciclo':>9}")
+    print(f"{0:7d} {rss_inicial:9.1f} {0:8.1f}")
+
+    paso = max(1, args.ciclos // 10)
+    inicio = time.perf_counter()
+    for i in range(1, args.ciclos + 1):
+        ciclo(app, banco, registro, renderizador, rng)
+        if i % paso == 0 or i == args.ciclos:
+            registro.vaciar()
+            rss = rss_mb()
+            ms = (time.perf_counter() - inicio) * 1000 / i
+            print(f"{i:7d} {rss:9.1f} {rss - rss_inicial:8.1f} {ms:9.1f}")
+
+    final = tracemalloc.take_snapshot()
+    registro.cerrar()
+    renderizador.cerrar()
+
+    print(f"\nFiguras creadas: {renderizador.figuras.creadas} "
+          f"(préstamos: {renderizador.figuras.prestamos}); "
+          f"imágenes en caché: {len(renderizador._cache)}; intentos escritos: {registro.escritos}")
+    print(f"\nTop {args.top} de memoria acumulada desde el calentamiento (tracemalloc):")
+    for estadistica in final.compare_to(inicial, 'lineno')[:args.top]:
+        print(f"  {estadistica}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Caché LRU de resultados de consultas al banco, invalidada por versión del banco
+"""
+import sys
+import threading
+from collections import OrderedDict
+
+from esquema import leer_version_banco
+
+
+def clave_filtro(consulta, categorias=(), temas=None, dificultad=None):
+    """Clave normalizada: el orden y las repeticiones de categorías y temas no importan"""
+    return (consulta,
+            tuple(sorted(set(categorias))),
+            None if temas is None else tuple(sorted(set(temas))),
+            int(dificultad) if dificultad else None)
+
+
+# Filas que se miden de verdad para estimar el tamaño de un DataFrame
+FILAS_MUESTRA = 1000
+
+
+def tamano_aproximado(valor):
+    """Bytes aproximados de un resultado (DataFrame, arreglo, dict, lista o tupla de valores simples)"""
+    if hasattr(valor, 'memory_usage'):
+        # Medir cada texto cuesta tanto como la consulta: se mide una muestra y se escala
+        n = len(valor)
+        muestra = valor.head(FILAS_MUESTRA)
+        medidos = int(muestra.memory_usage(index=True, deep=True).sum())
+        return medidos * n // len(muestra) if len(muestra) else medidos
+    if hasattr(valor, 'nbytes'):
+        return int(valor.nbytes)
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(sys.getsizeof(k) + tamano_aproximado(v) for k, v in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(sys.getsizeof(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+class VersionBanco:
+    """Versión del banco vista desde una conexión propia.
+
+    PRAGMA data_version cambia cuando otra conexión confirma una escritura,
+    y consultarlo no lee ninguna página. Sólo en ese caso se lee la fila de
+    version_banco, que cuenta los cambios en preguntas; registrar intentos
+    cambia data_version pero no la versión del banco.
+    """
+
+    def __init__(self, conexiones):
+        self._conn = conexiones.nueva_conexion()
+        self._lock = threading.Lock()
+        self._data_version = None
+        self._version = None
+
+    def actual(self):
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self._data_version:
+                self._data_version = data_version
+                self._version = leer_version_banco(self._conn)
+            return self._version
+
+    def cerrar(self):
+        self._conn.close()
+
+
+class CacheLRU:
+    """Caché LRU acotada en entradas y en bytes, vaciada cuando cambia el banco.
+
+    obtener(clave, calcular) devuelve el valor guardado o llama a calcular()
+    y lo guarda. Antes de cada búsqueda se consulta la versión del banco: si
+    cambió, se descartan todas las entradas. Los valores se comparten entre
+    llamadas, así que no deben modificarse (los DataFrames se entregan como
+    copia superficial). Los contadores aciertos, fallos, desalojos e
+    invalidaciones permiten ver qué tan útil es.
+    """
+
+    def __init__(self, version=None, max_entradas=128, max_bytes=32 * 1024 * 1024):
+        self.version = version
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.invalidaciones = 0
+        self.bytes = 0
+        self._entradas = OrderedDict()
+        self._version_vista = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def _validar(self):
+        """Vacía la caché si el banco cambió (llamar con el lock tomado)"""
+        if self.version is None:
+            return None
+        version = self.version.actual()
+        if version != self._version_vista:
+            if self._entradas:
+                self.invalidaciones += 1
+            self._entradas.clear()
+            self.bytes = 0
+            self._version_vista = version
+        return version
+
+    def obtener(self, clave, calcular):
+        with self._lock:
+            version = self._validar()
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entregar(entrada[0])
+            self.fallos += 1
+
+        # La consulta corre sin el lock: otros hilos pueden leer mientras tanto
+        valor = calcular()
+        tamano = tamano_aproximado(valor)
+        if tamano > self.max_bytes:
+            return valor
+
+        with self._lock:
+            # Si el banco cambió durante la consulta, el resultado no se guarda
+            if self._validar() == version:
+                anterior = self._entradas.pop(clave, None)
+                if anterior is not None:
+                    self.bytes -= anterior[1]
+                self._entradas[clave] = (valor, tamano)
+                self.bytes += tamano
+                while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                    _, (_, liberado) = self._entradas.popitem(last=False)
+                    self.bytes -= liberado
+                    self.desalojos += 1
+        return self._entregar(valor)
+
+    @staticmethod
+    def _entregar(valor):
+        if hasattr(valor, 'copy') and hasattr(valor, 'memory_usage'):
+            return valor.copy(deep=False)
+        if isinstance(valor, list):
+            return list(valor)
+        return valor
+
+    def vaciar(self):
+        with self._lock:
+            self._entradas.clear()
+            self.bytes = 0
+
+    def estadisticas(self):
+        with self._lock:
+            return {'entradas': len(self._entradas), 'bytes': self.bytes,
+                    'aciertos': self.aciertos, 'fallos': self.fallos,
+                    'desalojos': self.desalojos, 'invalidaciones': self.invalidaciones}
@@ -0,0 +1,56 @@
+"""
+Calificación vectorizada de respuestas (un quiz o lotes de hojas de respuesta)
+
+Las letras se codifican como enteros pequeños: a=0, b=1, c=2, d=3 y -1 para
+"sin responder", de modo que calificar es una sola comparación de arreglos.
+"""
+from diferido import ModuloDiferido
+
+np = ModuloDiferido("numpy")
+
+LETRAS = ('a', 'b', 'c', 'd')
+SIN_RESPUESTA = -1
+_CODIGOS = {letra: i for i, letra in enumerate(LETRAS)}
+_CODIGOS.update({letra.upper(): i for i, letra in enumerate(LETRAS)})
+
+
+def codigo_letra(letra):
+    """Código de una letra ('' o desconocida -> SIN_RESPUESTA)"""
+    return _CODIGOS.get(letra, SIN_RESPUESTA)
+
+
+def codificar_letras(letras):
+    """Convierte una secuencia de letras en un arreglo int8"""
+    return np.fromiter((_CODIGOS.get(letra, SIN_RESPUESTA) for letra in letras),
+                       dtype=np.int8, count=len(letras))
+
+
+def decodificar_codigos(codigos):
+    """Convierte códigos int8 en letras ('' para sin responder)"""
+    return [LETRAS[c] if c >= 0 else '' for c in codigos.tolist()]
+
+
+def calificar(elegidas, correctas, tiempos=None):
+    """Califica un quiz en una pasada.
+
+    elegidas y correctas son arreglos int8 de igual largo. Devuelve
+    (aciertos bool, puntaje, tiempos float64 por pregunta).
+    """
+    aciertos = np.asarray(elegidas) == np.asarray(correctas)
+    if tiempos is None:
+        tiempos = np.zeros(len(aciertos))
+    return aciertos, int(np.count_nonzero(aciertos)), np.asarray(tiempos, dtype=np.float64)
+
+
+def calificar_lote(matriz_elegidas, correctas):
+    """Califica muchas hojas de respuesta a la vez.
+
+    matriz_elegidas: arreglo (estudiantes x preguntas) de códigos int8.
+    correctas: clave (preguntas,) común a todos o matriz del mismo tamaño.
+    Devuelve (aciertos bool, puntajes por estudiante, tasa de acierto por pregunta).
+    """
+    matriz_elegidas = np.asarray(matriz_elegidas)
+    aciertos = matriz_elegidas == np.asarray(correctas)
+    puntajes = np.count_nonzero(aciertos, axis=1)
+    tasa_por_pregunta = aciertos.mean(axis=0) if len(aciertos) else np.zeros(aciertos.shape[1])
+    return aciertos, puntajes, tasa_por_pregunta
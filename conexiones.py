@@ -0,0 +1,121 @@
+"""
+Gestor de conexiones SQLite compartido por Quiz1.py y Quiz2.py
+"""
+import atexit
+import sqlite3
+import threading
+
+# Pragmas aplicados a cada conexión nueva
+PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",       # ~16 MB de caché de páginas
+    "PRAGMA mmap_size = 268435456",     # 256 MB mapeados en memoria
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class GestorConexiones:
+    """Mantiene una conexión SQLite persistente por hilo (pool acotado)"""
+
+    def __init__(self, db_path, max_conexiones=16, timeout=30.0):
+        self.db_path = db_path
+        self.max_conexiones = max_conexiones
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._cupos = threading.BoundedSemaphore(max_conexiones)
+        self._abiertas = {}
+        self._cerrado = False
+
+    def _abrir(self):
+        """Abre y configura una conexión nueva"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                               check_same_thread=False)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def nueva_conexion(self):
+        """Abre una conexión configurada fuera del pool (la cierra quien la pide)"""
+        return self._abrir()
+
+    def conexion(self):
+        """Devuelve la conexión del hilo actual, creándola si no existe"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
+        if self._cerrado:
+            raise RuntimeError("El gestor de conexiones ya fue cerrado")
+        if not self._cupos.acquire(timeout=self.timeout):
+            raise RuntimeError(f"Se alcanzó el máximo de {self.max_conexiones} conexiones")
+
+        try:
+            conn = self._abrir()
+        except Exception:
+            self._cupos.release()
+            raise
+
+        with self._lock:
+            self._abiertas[threading.get_ident()] = conn
+        self._local.conn = conn
+        return conn
+
+    def liberar(self):
+        """Cierra la conexión del hilo actual (útil al terminar hilos de trabajo)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._abiertas.pop(threading.get_ident(), None)
+        self._cerrar_conexion(conn)
+        self._cupos.release()
+
+    def cerrar(self):
+        """Cierra todas las conexiones abiertas"""
+        with self._lock:
+            self._cerrado = True
+            conexiones = list(self._abiertas.values())
+            self._abiertas.clear()
+        for conn in conexiones:
+            self._cerrar_conexion(conn)
+            self._cupos.release()
+
+    @staticmethod
+    def _cerrar_conexion(conn):
+        try:
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+        except sqlite3.Error:
+            pass
+        conn.close()
+
+
+# =============== REGISTRO GLOBAL ===============
+
+_gestores = {}
+_gestores_lock = threading.Lock()
+
+
+def obtener_gestor(db_path):
+    """Devuelve el gestor compartido para una ruta de base de datos"""
+    with _gestores_lock:
+        gestor = _gestores.get(db_path)
+        if gestor is None or gestor._cerrado:
+            gestor = GestorConexiones(db_path)
+            _gestores[db_path] = gestor
+        return gestor
+
+
+def cerrar_todos():
+    """Cierra todos los gestores registrados (se ejecuta al salir)"""
+    with _gestores_lock:
+        gestores = list(_gestores.values())
+        _gestores.clear()
+    for gestor in gestores:
+        gestor.cerrar()
+
+
+atexit.register(cerrar_todos)
@@ -0,0 +1,288 @@
+"""
+Controles Tk compartidos por las dos versiones del quiz
+"""
+import math
+import tkinter as tk
+
+
+class ScrollableFrame(tk.Frame):
+    """Frame con scroll para mejor visualización de temas"""
+    def __init__(self, parent, *args, **kwargs):
+        tk.Frame.__init__(self, parent, *args, **kwargs)
+
+        # Crear canvas y scrollbar
+        self.canvas = tk.Canvas(self, borderwidth=0, background="#ffffff")
+        self.scrollbar = tk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.scrollable_frame = tk.Frame(self.canvas, background="#ffffff")
+
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        )
+
+        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+
+class ListaTemasVirtual(ScrollableFrame):
+    """Lista de temas con casillas que sólo crea widgets para las filas visibles.
+
+    Las filas son Checkbuttons colocados directamente en el canvas (a
+    y = índice * alto_fila) y se reciclan al desplazarse: con miles de temas
+    hay tantos widgets como filas caben en pantalla. La selección vive en un
+    set de temas, no en un BooleanVar por tema. El cuadro de filtro busca
+    subcadenas sin distinguir mayúsculas y, mientras el texto sólo se
+    alarga, filtra sobre el resultado anterior en lugar de sobre todos.
+    """
+
+    def __init__(self, parent, alto_fila=24, fuente=('Arial', 9), **kwargs):
+        super().__init__(parent, **kwargs)
+        self.alto_fila = alto_fila
+        self.fuente = fuente
+        self.temas = []
+        self.seleccion = set()
+        self._minusculas = []
+        self._filtrados = []
+        self._filtro = ''
+        self._filas = []
+
+        # Las filas van directo al canvas: el frame interno de ScrollableFrame
+        # no se usa, y la región de scroll la fija la cantidad de temas filtrados
+        self.scrollable_frame.unbind("<Configure>")
+        self.canvas.delete("all")
+        self.canvas.configure(yscrollincrement=alto_fila, yscrollcommand=self._al_desplazar)
+        self.canvas.bind("<Configure>", self._al_redimensionar)
+        self._enlazar_rueda(self.canvas)
+
+        barra = tk.Frame(self, background="#ffffff")
+        barra.pack(side="top", fill="x", before=self.canvas)
+        tk.Label(barra, text="🔍", background="#ffffff").pack(side="left")
+        self.texto_filtro = tk.StringVar()
+        self.texto_filtro.trace_add("write", lambda *_: self._filtrar())
+        tk.Entry(barra, textvariable=self.texto_filtro, font=fuente).pack(side="left", fill="x", expand=True)
+        tk.Button(barra, text="Todos", font=fuente,
+                  command=lambda: self.marcar_filtrados(True)).pack(side="left", padx=(4, 0))
+        tk.Button(barra, text="Ninguno", font=fuente,
+                  command=lambda: self.marcar_filtrados(False)).pack(side="left", padx=(2, 0))
+        self._conteo = tk.Label(barra, font=fuente, background="#ffffff", fg="gray")
+        self._conteo.pack(side="left", padx=4)
+
+        self._aviso = tk.Label(self.canvas, font=('Arial', 10), background="#ffffff",
+                               fg="gray", justify="center")
+
+    # ---------- datos ----------
+
+    def cargar(self, temas, seleccionar=True):
+        """Reemplaza los temas de la lista (todos marcados, salvo seleccionar=False)"""
+        self.temas = list(temas)
+        self._minusculas = [tema.casefold() for tema in self.temas]
+        self.seleccion = set(self.temas) if seleccionar else set()
+        self._filtro = None
+        self._filtrar()
+
+    def aviso(self, texto):
+        """Vacía la lista y muestra un mensaje en su lugar (cargando, sin categorías, ...)"""
+        self.cargar([])
+        self._mostrar_aviso(texto)
+
+    def seleccionados(self):
+        """Temas marcados, en el orden de la lista (incluye los que oculta el filtro)"""
+        return [tema for tema in self.temas if tema in self.seleccion]
+
+    def marcar_filtrados(self, valor):
+        """Marca o desmarca todos los temas que deja ver el filtro"""
+        visibles = (self.temas[i] for i in self._filtrados)
+        if valor:
+            self.seleccion.update(visibles)
+        else:
+            self.seleccion.difference_update(visibles)
+        self._dibujar(forzar=True)
+
+    def __len__(self):
+        return len(self.temas)
+
+    def _filtrar(self):
+        texto = self.texto_filtro.get().strip().casefold()
+        if self._filtro is not None and texto == self._filtro:
+            return
+        if self._filtro and texto.startswith(self._filtro):
+            # El texto sólo se alargó: basta con filtrar el resultado anterior
+            base = self._filtrados
+        else:
+            base = range(len(self.temas))
+        if texto:
+            self._filtrados = [i for i in base if texto in self._minusculas[i]]
+        else:
+            self._filtrados = list(base)
+        self._filtro = texto
+
+        if self.temas and not self._filtrados:
+            self._mostrar_aviso("Ningún tema coincide con el filtro")
+        else:
+            self._aviso.place_forget()
+        self._conteo.config(text=f"{len(self._filtrados)}/{len(self.temas)}" if self.temas else "")
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(),
+                                            len(self._filtrados) * self.alto_fila))
+        self.canvas.yview_moveto(0)
+        self._dibujar(forzar=True)
+
+    def _mostrar_aviso(self, texto):
+        self._aviso.config(text=texto)
+        self._aviso.place(relx=0.5, y=20, anchor="n")
+
+    # ---------- filas recicladas ----------
+
+    def _al_redimensionar(self, event):
+        necesarias = math.ceil(event.height / self.alto_fila) + 1
+        while len(self._filas) < necesarias:
+            self._filas.append(self._crear_fila(len(self._filas)))
+        for fila in self._filas:
+            self.canvas.itemconfigure(fila[0], width=event.width)
+        self.canvas.configure(scrollregion=(0, 0, event.width,
+                                            len(self._filtrados) * self.alto_fila))
+        self._dibujar()
+
+    def _crear_fila(self, j):
+        var = tk.BooleanVar(value=False)
+        chk = tk.Checkbutton(self.canvas, variable=var, font=self.fuente, anchor="w",
+                             background="#ffffff", command=lambda: self._alternar(j))
+        self._enlazar_rueda(chk)
+        item = self.canvas.create_window(0, 0, window=chk, anchor="nw", height=self.alto_fila,
+                                         width=self.canvas.winfo_width(), state="hidden")
+        # [item del canvas, checkbutton, variable, índice filtrado que muestra]
+        return [item, chk, var, None]
+
+    def _alternar(self, j):
+        _, _, var, i = self._filas[j]
+        if i is None:
+            return
+        tema = self.temas[self._filtrados[i]]
+        if var.get():
+            self.seleccion.add(tema)
+        else:
+            self.seleccion.discard(tema)
+
+    def _al_desplazar(self, primero, ultimo):
+        self.scrollbar.set(primero, ultimo)
+        self._dibujar()
+
+    def _dibujar(self, forzar=False):
+        """Asigna a cada fila del pool el tema que le toca según el desplazamiento"""
+        primero = int(self.canvas.canvasy(0) // self.alto_fila)
+        for j, fila in enumerate(self._filas):
+            item, chk, var, anterior = fila
+            i = primero + j
+            if i >= len(self._filtrados):
+                if anterior is not None:
+                    self.canvas.itemconfigure(item, state="hidden")
+                    fila[3] = None
+                continue
+            if i != anterior or forzar:
+                tema = self.temas[self._filtrados[i]]
+                chk.config(text=tema)
+                var.set(tema in self.seleccion)
+                self.canvas.coords(item, 0, i * self.alto_fila)
+                if anterior is None:
+                    self.canvas.itemconfigure(item, state="normal")
+                fila[3] = i
+
+    def _enlazar_rueda(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self._rueda(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self._rueda(-1))
+        widget.bind("<Button-5>", lambda e: self._rueda(1))
+
+    def _rueda(self, unidades):
+        self.canvas.yview_scroll(unidades * 3, "units")
+
+
+class NavegadorPreguntas(tk.Frame):
+    """Tira de botones numerados para saltar a cualquier pregunta, por páginas.
+
+    Sólo existen por_pagina botones: cambiar de página o de pregunta
+    reconfigura esos mismos botones, así que el costo de cada clic no
+    depende del largo del quiz. El estado respondida/pendiente se pide a
+    respondidas_en(inicio, fin) sólo para la página visible.
+    """
+
+    COLOR_ACTUAL = '#2196F3'
+    COLOR_RESPONDIDA = '#C8E6C9'
+    COLOR_PENDIENTE = '#EEEEEE'
+
+    def __init__(self, parent, al_elegir, por_pagina=20, **kwargs):
+        kwargs.setdefault('bg', 'white')
+        super().__init__(parent, **kwargs)
+        self.al_elegir = al_elegir
+        self.por_pagina = por_pagina
+        self.total = 0
+        self.pagina = 0
+        self.actual = 0
+        self._respondidas_en = lambda inicio, fin: [False] * (fin - inicio)
+
+        fuente = ('Arial', 8)
+        self._btn_anterior = tk.Button(self, text="◀", font=fuente, width=2,
+                                       command=lambda: self.ir_pagina(self.pagina - 1))
+        self._btn_anterior.pack(side='left')
+        botones = tk.Frame(self, bg=kwargs['bg'])
+        botones.pack(side='left', padx=4)
+        self._botones = []
+        for j in range(por_pagina):
+            btn = tk.Button(botones, font=fuente, width=3, relief='groove',
+                            command=lambda j=j: self.al_elegir(self.pagina * self.por_pagina + j))
+            btn.grid(row=0, column=j, padx=1)
+            self._botones.append(btn)
+        self._btn_siguiente = tk.Button(self, text="▶", font=fuente, width=2,
+                                        command=lambda: self.ir_pagina(self.pagina + 1))
+        self._btn_siguiente.pack(side='left')
+        self._lbl_pagina = tk.Label(self, font=fuente, bg=kwargs['bg'], fg='gray')
+        self._lbl_pagina.pack(side='left', padx=6)
+
+    @property
+    def paginas(self):
+        return max(1, math.ceil(self.total / self.por_pagina))
+
+    def configurar(self, total, respondidas_en):
+        """Prepara la tira para un quiz nuevo de total preguntas"""
+        self.total = total
+        self._respondidas_en = respondidas_en
+        self.actualizar(0)
+
+    def actualizar(self, actual):
+        """Resalta la pregunta actual y muestra su página"""
+        self.actual = actual
+        self.pagina = actual // self.por_pagina
+        self._dibujar()
+
+    def ir_pagina(self, pagina):
+        self.pagina = min(max(pagina, 0), self.paginas - 1)
+        self._dibujar()
+
+    def marcar(self, i):
+        """Recolorea sólo el botón de la pregunta i (tras responderla)"""
+        j = i - self.pagina * self.por_pagina
+        if 0 <= j < self.por_pagina and i < self.total:
+            self._colorear(self._botones[j], i, self._respondidas_en(i, i + 1)[0])
+
+    def _colorear(self, btn, i, respondida):
+        if i == self.actual:
+            btn.config(bg=self.COLOR_ACTUAL, fg='white')
+        else:
+            btn.config(bg=self.COLOR_RESPONDIDA if respondida else self.COLOR_PENDIENTE, fg='black')
+
+    def _dibujar(self):
+        inicio = self.pagina * self.por_pagina
+        fin = min(self.total, inicio + self.por_pagina)
+        estados = self._respondidas_en(inicio, fin)
+        for j, btn in enumerate(self._botones):
+            i = inicio + j
+            if i < fin:
+                btn.config(text=str(i + 1))
+                self._colorear(btn, i, estados[j])
+                btn.grid()
+            else:
+                btn.grid_remove()
+        self._btn_anterior.config(state='normal' if self.pagina > 0 else 'disabled')
+        self._btn_siguiente.config(state='normal' if self.pagina < self.paginas - 1 else 'disabled')
+        self._lbl_pagina.config(text=f"Pág. {self.pagina + 1}/{self.paginas}")
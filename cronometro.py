@@ -0,0 +1,107 @@
+"""
+Medición de tiempos del quiz con reloj monotónico (sin pandas)
+"""
+import time
+
+from diferido import ModuloDiferido
+
+np = ModuloDiferido("numpy")
+
+
+def formato_reloj(segundos):
+    """MM:SS, o H:MM:SS cuando hay horas (exámenes largos)"""
+    horas, resto = divmod(int(segundos), 3600)
+    minutos, segundos = divmod(resto, 60)
+    if horas:
+        return f"{horas}:{minutos:02d}:{segundos:02d}"
+    return f"{minutos:02d}:{segundos:02d}"
+
+
+class CronometroPreguntas:
+    """Acumula el tiempo que se pasa en cada pregunta, sumando todas sus visitas.
+
+    entrar(i) cierra la visita abierta (si hay una) y abre otra en i; salir()
+    sólo cierra. Volver a una pregunta suma tiempo en lugar de reemplazarlo.
+    Los tiempos se guardan en nanosegundos enteros, así que no hay error de
+    redondeo acumulado.
+    """
+    __slots__ = ('ns', 'visitas', '_actual', '_desde', '_reloj')
+
+    def __init__(self, n, reloj=time.monotonic_ns):
+        self.ns = [0] * n
+        self.visitas = [0] * n
+        self._actual = None
+        self._desde = 0
+        self._reloj = reloj
+
+    @property
+    def actual(self):
+        """Pregunta con la visita abierta (None si no hay ninguna)"""
+        return self._actual
+
+    def entrar(self, i):
+        if self._actual == i:
+            return
+        ahora = self._reloj()
+        self._cerrar(ahora)
+        self._actual = i
+        self._desde = ahora
+        self.visitas[i] += 1
+
+    def salir(self):
+        if self._actual is not None:
+            self._cerrar(self._reloj())
+
+    def _cerrar(self, ahora):
+        if self._actual is not None:
+            self.ns[self._actual] += ahora - self._desde
+            self._actual = None
+
+    def _ns_con_abierta(self):
+        ns = list(self.ns)
+        if self._actual is not None:
+            ns[self._actual] += self._reloj() - self._desde
+        return ns
+
+    def segundos(self):
+        """Permanencia por pregunta en segundos (incluye la visita abierta)"""
+        return [t / 1e9 for t in self._ns_con_abierta()]
+
+    def arreglo(self):
+        """Permanencia por pregunta como arreglo float64 de segundos"""
+        return np.array(self._ns_con_abierta(), dtype=np.float64) / 1e9
+
+
+class CuentaRegresiva:
+    """Cuenta regresiva contra un plazo absoluto.
+
+    El tiempo restante se calcula siempre desde el plazo, así que un tick que
+    llega tarde no se acumula: el siguiente se programa para el próximo
+    cambio de segundo real.
+    """
+    __slots__ = ('duracion', 'inicio', 'plazo', '_reloj')
+
+    def __init__(self, segundos, reloj=time.monotonic):
+        self.duracion = segundos
+        self._reloj = reloj
+        self.inicio = reloj()
+        self.plazo = self.inicio + segundos
+
+    def restante(self):
+        return max(0.0, self.plazo - self._reloj())
+
+    def transcurrido(self):
+        return min(self.duracion, self._reloj() - self.inicio)
+
+    def vencida(self):
+        return self._reloj() >= self.plazo
+
+    def segundos_mostrados(self):
+        """Segundos enteros a mostrar (redondeo hacia arriba, como un reloj de pared)"""
+        restante = self.restante()
+        return int(restante) + (restante % 1 > 0)
+
+    def ms_hasta_tick(self):
+        """Milisegundos hasta que cambie el segundo mostrado"""
+        fraccion = self.restante() % 1
+        return max(1, int(fraccion * 1000) + 1) if fraccion else 1000
@@ -0,0 +1,39 @@
+"""
+Importación diferida de módulos pesados (pandas, numpy, matplotlib)
+"""
+import importlib
+import threading
+
+
+class ModuloDiferido:
+    """Se comporta como el módulo indicado, pero lo importa en el primer uso.
+
+    antes: función opcional que se ejecuta justo antes de importar (por
+    ejemplo, elegir el backend de matplotlib antes de cargar pyplot).
+    """
+
+    def __init__(self, nombre, antes=None):
+        self._nombre = nombre
+        self._antes = antes
+        self._modulo = None
+        self._lock = threading.Lock()
+
+    def _cargar(self):
+        with self._lock:
+            if self._modulo is None:
+                if self._antes is not None:
+                    self._antes()
+                self._modulo = importlib.import_module(self._nombre)
+        return self._modulo
+
+    @property
+    def cargado(self):
+        return self._modulo is not None
+
+    def __getattr__(self, atributo):
+        modulo = self._modulo if self._modulo is not None else self._cargar()
+        return getattr(modulo, atributo)
+
+    def __repr__(self):
+        estado = "cargado" if self.cargado else "sin cargar"
+        return f"<ModuloDiferido {self._nombre} ({estado})>"
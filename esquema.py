@@ -0,0 +1,289 @@
+"""
+Esquema de la base de datos del quiz (tablas e índices)
+"""
+import hashlib
+import sqlite3
+
+# azar: clave aleatoria precalculada por fila, usada para muestrear
+# preguntas con un recorrido de índice en lugar de ORDER BY RANDOM()
+SQL_TABLA_PREGUNTAS = '''
+    CREATE TABLE IF NOT EXISTS preguntas (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        categoria TEXT NOT NULL,
+        tema TEXT NOT NULL,
+        dificultad INTEGER NOT NULL CHECK (dificultad IN (1, 2, 3)),
+        pregunta TEXT NOT NULL,
+        opcion_a TEXT NOT NULL,
+        opcion_b TEXT NOT NULL,
+        opcion_c TEXT NOT NULL,
+        opcion_d TEXT NOT NULL,
+        correcta TEXT NOT NULL CHECK (correcta IN ('a', 'b', 'c', 'd')),
+        azar INTEGER DEFAULT (random()),
+        hash_contenido TEXT
+    )
+'''
+
+# Intentos de quiz y sus respuestas (escritos por registro_intentos)
+SQL_TABLAS_INTENTOS = ('''
+    CREATE TABLE IF NOT EXISTS intentos (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        usuario TEXT NOT NULL,
+        fecha TEXT NOT NULL,
+        puntaje INTEGER NOT NULL,
+        total INTEGER NOT NULL,
+        duracion_seg REAL
+    )
+''', '''
+    CREATE TABLE IF NOT EXISTS respuestas (
+        intento_id INTEGER NOT NULL REFERENCES intentos (id),
+        posicion INTEGER NOT NULL,
+        pregunta_id INTEGER NOT NULL,
+        elegida TEXT NOT NULL,
+        correcta INTEGER NOT NULL CHECK (correcta IN (0, 1)),
+        tiempo_seg REAL,
+        PRIMARY KEY (intento_id, posicion)
+    ) WITHOUT ROWID
+''')
+
+# Inserción común a los datos de ejemplo y al importador; las preguntas
+# repetidas (mismo hash de contenido) se ignoran
+SQL_INSERTAR_PREGUNTA = '''
+    INSERT OR IGNORE INTO preguntas (categoria, tema, dificultad, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta, hash_contenido)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Bases creadas antes de existir la columna azar: ALTER TABLE no admite un
+# DEFAULT no constante, así que un trigger la rellena en cada inserción
+SQL_TRIGGER_AZAR = '''
+    CREATE TRIGGER IF NOT EXISTS trg_preguntas_azar
+    AFTER INSERT ON preguntas
+    WHEN NEW.azar IS NULL
+    BEGIN
+        UPDATE preguntas SET azar = random() WHERE id = NEW.id;
+    END
+'''
+
+# Conteos por categoria/tema/dificultad mantenidos por triggers: las
+# pantallas de estadísticas y la lista de temas leen esta tabla (una fila por
+# combinación, no por pregunta) en lugar de agrupar todo el banco
+SQL_TABLA_ESTADISTICAS = '''
+    CREATE TABLE IF NOT EXISTS estadisticas_banco (
+        categoria TEXT NOT NULL,
+        tema TEXT NOT NULL,
+        dificultad INTEGER NOT NULL,
+        cantidad INTEGER NOT NULL,
+        PRIMARY KEY (categoria, tema, dificultad)
+    ) WITHOUT ROWID
+'''
+
+SQL_TRIGGERS_ESTADISTICAS = ('''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_insertar
+    AFTER INSERT ON preguntas
+    BEGIN
+        INSERT INTO estadisticas_banco (categoria, tema, dificultad, cantidad)
+        VALUES (NEW.categoria, NEW.tema, NEW.dificultad, 1)
+        ON CONFLICT (categoria, tema, dificultad) DO UPDATE SET cantidad = cantidad + 1;
+    END
+''', '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_borrar
+    AFTER DELETE ON preguntas
+    BEGIN
+        UPDATE estadisticas_banco SET cantidad = cantidad - 1
+        WHERE categoria = OLD.categoria AND tema = OLD.tema AND dificultad = OLD.dificultad;
+        DELETE FROM estadisticas_banco
+        WHERE categoria = OLD.categoria AND tema = OLD.tema AND dificultad = OLD.dificultad
+          AND cantidad <= 0;
+    END
+''', '''
+    CREATE TRIGGER IF NOT EXISTS trg_estadisticas_actualizar
+    AFTER UPDATE OF categoria, tema, dificultad ON preguntas
+    WHEN OLD.categoria IS NOT NEW.categoria OR OLD.tema IS NOT NEW.tema
+      OR OLD.dificultad IS NOT NEW.dificultad
+    BEGIN
+        UPDATE estadisticas_banco SET cantidad = cantidad - 1
+        WHERE categoria = OLD.categoria AND tema = OLD.tema AND dificultad = OLD.dificultad;
+        DELETE FROM estadisticas_banco
+        WHERE categoria = OLD.categoria AND tema = OLD.tema AND dificultad = OLD.dificultad
+          AND cantidad <= 0;
+        INSERT INTO estadisticas_banco (categoria, tema, dificultad, cantidad)
+        VALUES (NEW.categoria, NEW.tema, NEW.dificultad, 1)
+        ON CONFLICT (categoria, tema, dificultad) DO UPDATE SET cantidad = cantidad + 1;
+    END
+''')
+
+# Contador que sube con cada cambio en preguntas. PRAGMA data_version
+# también cambia cuando se registran intentos; este contador permite a las
+# cachés distinguir si lo que cambió fue el banco
+SQL_TABLA_VERSION = ('''
+    CREATE TABLE IF NOT EXISTS version_banco (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        modificaciones INTEGER NOT NULL DEFAULT 0
+    )
+''', '''
+    INSERT OR IGNORE INTO version_banco (id, version) VALUES (1, 0)
+''')
+
+SQL_TRIGGERS_VERSION = tuple(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_version_{nombre}
+    AFTER {evento} ON preguntas
+    BEGIN
+        UPDATE version_banco SET version = version + 1 WHERE id = 1;
+    END
+''' for nombre, evento in (('insertar', 'INSERT'), ('borrar', 'DELETE'), ('actualizar', 'UPDATE')))
+
+# Marca aparte para borrados y cambios de categoria/tema/dificultad: las
+# inserciones no la tocan, así el índice en memoria sabe si puede agregar
+# las filas nuevas al final o tiene que recargar (el trigger de azar hace
+# un UPDATE por cada INSERT, por eso version no sirve para distinguirlos)
+SQL_TRIGGERS_MODIFICACIONES = tuple(f'''
+    CREATE TRIGGER IF NOT EXISTS trg_modificaciones_{nombre}
+    AFTER {evento} ON preguntas
+    BEGIN
+        UPDATE version_banco SET modificaciones = modificaciones + 1 WHERE id = 1;
+    END
+''' for nombre, evento in (('borrar', 'DELETE'), ('actualizar', 'UPDATE OF categoria, tema, dificultad')))
+
+# Índices para los patrones de acceso de DatabaseManager:
+# - obtener_preguntas filtra por categoria y tema (y opcionalmente
+#   dificultad). Los dos índices compuestos terminan en azar: muestrear_ids
+#   busca en ellos, por cada combinación categoría/tema (y dificultad, si se
+#   filtra por ella), las primeras claves a partir del pivote sin ordenar
+#   la selección.
+# - Ninguna consulta filtra sólo por dificultad (los conteos por dificultad
+#   salen de estadisticas_banco), así que no hay índice sobre esa columna.
+# - idx_preguntas_azar permite recorrer el banco en orden aleatorio y cortar
+#   en cuanto se obtienen n preguntas que cumplen el filtro.
+# - idx_preguntas_hash (único) descarta preguntas duplicadas al importar.
+# - intentos por usuario y por fecha; respuestas por pregunta.
+INDICES = (
+    ("idx_preguntas_filtro_azar", "preguntas (categoria, tema, dificultad, azar)"),
+    ("idx_preguntas_tema_azar", "preguntas (categoria, tema, azar)"),
+    ("idx_preguntas_azar", "preguntas (azar)"),
+    ("idx_preguntas_hash", "preguntas (hash_contenido)", True),
+    ("idx_intentos_usuario_fecha", "intentos (usuario, fecha)"),
+    ("idx_intentos_fecha", "intentos (fecha)"),
+    ("idx_respuestas_pregunta", "respuestas (pregunta_id, intento_id)"),
+)
+
+# Índices reemplazados por otros más completos o que ninguna consulta usa;
+# crear_indices los borra de las bases existentes
+INDICES_OBSOLETOS = ("idx_preguntas_cat_tema_dif", "idx_preguntas_dificultad")
+
+
+def hash_pregunta(categoria, tema, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta):
+    """Hash del contenido de una pregunta (sin distinguir mayúsculas ni espacios extremos).
+
+    La dificultad no entra: la misma pregunta con otra dificultad es un duplicado.
+    """
+    partes = (categoria, tema, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta)
+    texto = '\x1f'.join(str(p).strip().lower() for p in partes)
+    return hashlib.blake2b(texto.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def insertar_preguntas(cursor, filas):
+    """Inserta filas (categoria, tema, dificultad, pregunta, a, b, c, d, correcta).
+
+    Devuelve cuántas se insertaron; las duplicadas se descartan.
+    """
+    filas = (tuple(fila) for fila in filas)
+    cursor.executemany(SQL_INSERTAR_PREGUNTA, (fila + (hash_pregunta(*fila[:2], *fila[3:]),) for fila in filas))
+    return cursor.rowcount
+
+
+def _migrar_columna_hash(cursor):
+    """Agrega la columna hash_contenido en bases existentes"""
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(preguntas)")]
+    if 'hash_contenido' not in columnas:
+        cursor.execute("ALTER TABLE preguntas ADD COLUMN hash_contenido TEXT")
+
+
+def _rellenar_hashes(cursor):
+    """Calcula el hash de las filas que aún no lo tienen (requiere el índice único)"""
+    pendientes = cursor.execute('''
+        SELECT id, categoria, tema, pregunta, opcion_a, opcion_b, opcion_c, opcion_d, correcta
+        FROM preguntas WHERE hash_contenido IS NULL
+    ''').fetchall()
+    # Las preguntas ya repetidas en la base conservan hash NULL
+    cursor.executemany("UPDATE OR IGNORE preguntas SET hash_contenido = ? WHERE id = ?",
+                       [(hash_pregunta(*fila[1:]), fila[0]) for fila in pendientes])
+
+
+def _migrar_columna_azar(cursor):
+    """Agrega y rellena la columna azar en bases existentes"""
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(preguntas)")]
+    if 'azar' not in columnas:
+        cursor.execute("ALTER TABLE preguntas ADD COLUMN azar INTEGER")
+        cursor.execute("UPDATE preguntas SET azar = random() WHERE azar IS NULL")
+    cursor.execute(SQL_TRIGGER_AZAR)
+
+
+def reconstruir_estadisticas(cursor):
+    """Recalcula estadisticas_banco desde cero a partir de las preguntas"""
+    cursor.execute("DELETE FROM estadisticas_banco")
+    cursor.execute('''
+        INSERT INTO estadisticas_banco (categoria, tema, dificultad, cantidad)
+        SELECT categoria, tema, dificultad, COUNT(*) FROM preguntas
+        GROUP BY categoria, tema, dificultad
+    ''')
+
+
+def _crear_estadisticas(cursor):
+    """Crea la tabla de conteos y sus triggers; la llena si aún no existían"""
+    existian = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_estadisticas_insertar'"
+    ).fetchone()
+    cursor.execute(SQL_TABLA_ESTADISTICAS)
+    for sql in SQL_TRIGGERS_ESTADISTICAS:
+        cursor.execute(sql)
+    if not existian:
+        reconstruir_estadisticas(cursor)
+
+
+def _crear_version(cursor):
+    cursor.execute(SQL_TABLA_VERSION[0])
+    columnas = [fila[1] for fila in cursor.execute("PRAGMA table_info(version_banco)")]
+    if 'modificaciones' not in columnas:
+        cursor.execute("ALTER TABLE version_banco ADD COLUMN modificaciones INTEGER NOT NULL DEFAULT 0")
+    for sql in SQL_TABLA_VERSION[1:] + SQL_TRIGGERS_VERSION + SQL_TRIGGERS_MODIFICACIONES:
+        cursor.execute(sql)
+
+
+def leer_version_banco(conn):
+    """Valor actual del contador de cambios del banco (0 si la tabla no existe)"""
+    try:
+        fila = conn.execute("SELECT version FROM version_banco WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return fila[0] if fila else 0
+
+
+def leer_modificaciones_banco(conn):
+    """Cuántos borrados o cambios de categoria/tema/dificultad hubo en preguntas (0 si no se registran)"""
+    try:
+        fila = conn.execute("SELECT modificaciones FROM version_banco WHERE id = 1").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    return fila[0] if fila else 0
+
+
+def crear_indices(cursor):
+    """Crea los índices si no existen (idempotente sobre bases existentes)"""
+    for nombre in INDICES_OBSOLETOS:
+        cursor.execute(f"DROP INDEX IF EXISTS {nombre}")
+    for nombre, definicion, *unico in INDICES:
+        tipo = "UNIQUE INDEX" if unico else "INDEX"
+        cursor.execute(f"CREATE {tipo} IF NOT EXISTS {nombre} ON {definicion}")
+
+
+def crear_esquema(cursor):
+    """Crea tablas e índices del banco de preguntas"""
+    cursor.execute(SQL_TABLA_PREGUNTAS)
+    for sql in SQL_TABLAS_INTENTOS:
+        cursor.execute(sql)
+    _migrar_columna_azar(cursor)
+    _migrar_columna_hash(cursor)
+    _crear_estadisticas(cursor)
+    _crear_version(cursor)
+    crear_indices(cursor)
+    _rellenar_hashes(cursor)
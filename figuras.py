@@ -0,0 +1,59 @@
+"""
+Pool acotado de figuras de matplotlib reutilizables
+"""
+import threading
+from contextlib import contextmanager
+
+from diferido import ModuloDiferido
+
+figure = ModuloDiferido("matplotlib.figure")
+
+
+class PoolFiguras:
+    """Reutiliza un número fijo de Figure por tamaño en vez de crear una por gráfica.
+
+    prestar() entrega una figura vacía y la recupera al salir del bloque;
+    fig.clear() suelta ejes, artistas y textos, de modo que nada de la
+    gráfica anterior sobrevive. Si todas las figuras de un tamaño están
+    prestadas se espera a que vuelva una, así que la memoria queda acotada
+    por max_por_tamano figuras por cada tamaño usado.
+    """
+
+    def __init__(self, max_por_tamano=2, dpi=100):
+        self.max_por_tamano = max_por_tamano
+        self.dpi = dpi
+        self.prestamos = 0
+        self._libres = {}
+        self._creadas = {}
+        self._condicion = threading.Condition()
+
+    @property
+    def creadas(self):
+        with self._condicion:
+            return sum(self._creadas.values())
+
+    @contextmanager
+    def prestar(self, tamano):
+        tamano = tuple(tamano)
+        fig = self._tomar(tamano)
+        try:
+            yield fig
+        finally:
+            self._devolver(tamano, fig)
+
+    def _tomar(self, tamano):
+        with self._condicion:
+            libres = self._libres.setdefault(tamano, [])
+            while not libres and self._creadas.get(tamano, 0) >= self.max_por_tamano:
+                self._condicion.wait()
+            self.prestamos += 1
+            if libres:
+                return libres.pop()
+            self._creadas[tamano] = self._creadas.get(tamano, 0) + 1
+        return figure.Figure(figsize=tamano, dpi=self.dpi)
+
+    def _devolver(self, tamano, fig):
+        fig.clear()
+        with self._condicion:
+            self._libres[tamano].append(fig)
+            self._condicion.notify()
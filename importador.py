@@ -0,0 +1,181 @@
+"""
+Importador masivo de preguntas desde archivos CSV o JSONL.
+
+Lee los archivos fila a fila, valida cada pregunta con las mismas reglas
+del esquema, descarta duplicados por hash de contenido e inserta en lotes
+dentro de una transacción por lote. La memoria usada no depende del tamaño
+del archivo.
+
+Uso:
+    python importador.py banco.csv otro_banco.jsonl
+    python importador.py banco.csv --db quiz_economia.db --lote 10000
+
+Columnas esperadas: categoria, tema, dificultad, pregunta, opcion_a,
+opcion_b, opcion_c, opcion_d, correcta
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from conexiones import obtener_gestor
+from esquema import crear_esquema, insertar_preguntas
+
+COLUMNAS = ('categoria', 'tema', 'dificultad', 'pregunta',
+            'opcion_a', 'opcion_b', 'opcion_c', 'opcion_d', 'correcta')
+MAX_ERRORES_MOSTRADOS = 20
+
+
+class ResultadoImportacion:
+    """Contadores de una importación"""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.leidas = 0
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.segundos = 0.0
+
+    @property
+    def duplicadas(self):
+        return self.leidas - self.insertadas - self.rechazadas
+
+    @property
+    def filas_por_segundo(self):
+        return self.leidas / self.segundos if self.segundos > 0 else 0.0
+
+    def __str__(self):
+        return (f"{self.archivo}: {self.leidas:,} leídas, {self.insertadas:,} insertadas, "
+                f"{self.duplicadas:,} duplicadas, {self.rechazadas:,} rechazadas "
+                f"en {self.segundos:.1f}s ({self.filas_por_segundo:,.0f} filas/s)")
+
+
+def validar_fila(registro):
+    """Valida un registro (dict) y devuelve la tupla lista para insertar"""
+    faltantes = [c for c in COLUMNAS if registro.get(c) in (None, '')]
+    if faltantes:
+        raise ValueError(f"faltan columnas: {', '.join(faltantes)}")
+
+    valor = registro['dificultad']
+    if isinstance(valor, bool):
+        raise ValueError(f"dificultad no numérica: {valor!r}")
+    if isinstance(valor, float) and not valor.is_integer():
+        # int() truncaría 2.7 a 2; en CSV "2.7" ya se rechaza
+        raise ValueError(f"dificultad no entera: {valor!r}")
+    try:
+        dificultad = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError(f"dificultad no numérica: {valor!r}")
+    if dificultad not in (1, 2, 3):
+        raise ValueError(f"dificultad fuera de rango (1-3): {dificultad}")
+
+    correcta = str(registro['correcta']).strip().lower()
+    if correcta not in ('a', 'b', 'c', 'd'):
+        raise ValueError(f"respuesta correcta inválida (a-d): {registro['correcta']!r}")
+
+    return (str(registro['categoria']).strip(), str(registro['tema']).strip(), dificultad,
+            str(registro['pregunta']).strip(),
+            str(registro['opcion_a']).strip(), str(registro['opcion_b']).strip(),
+            str(registro['opcion_c']).strip(), str(registro['opcion_d']).strip(),
+            correcta)
+
+
+def leer_csv(ruta):
+    """Genera (número de línea, registro) de un CSV con encabezado"""
+    with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+        lector = csv.DictReader(archivo)
+        for registro in lector:
+            # DictReader junta los campos de más bajo la clave None
+            sobrantes = registro.get(None)
+            if sobrantes:
+                registro = {'_error': f"{len(sobrantes)} campo(s) de más: {sobrantes!r}"}
+            yield lector.line_num, registro
+
+
+def leer_jsonl(ruta):
+    """Genera (número de línea, registro) de un archivo JSON Lines"""
+    with open(ruta, encoding='utf-8') as archivo:
+        for numero, linea in enumerate(archivo, start=1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError as e:
+                registro = {'_error': f"JSON inválido: {e.msg}"}
+            if not isinstance(registro, dict):
+                # 42, null o [1] son JSON válido pero no una pregunta
+                registro = {'_error': 'se esperaba un objeto JSON'}
+            yield numero, registro
+
+
+def _lector(ruta):
+    if ruta.lower().endswith(('.jsonl', '.ndjson')):
+        return leer_jsonl(ruta)
+    if ruta.lower().endswith('.csv'):
+        return leer_csv(ruta)
+    raise ValueError(f"Formato no soportado: {ruta} (usa .csv o .jsonl)")
+
+
+def _filas_validas(ruta, resultado):
+    """Valida en streaming, contando y reportando las filas rechazadas"""
+    for numero, registro in _lector(ruta):
+        resultado.leidas += 1
+        try:
+            if '_error' in registro:
+                raise ValueError(registro['_error'])
+            yield validar_fila(registro)
+        except (ValueError, AttributeError) as e:
+            resultado.rechazadas += 1
+            if resultado.rechazadas <= MAX_ERRORES_MOSTRADOS:
+                print(f"  Línea {numero} rechazada: {e}")
+            elif resultado.rechazadas == MAX_ERRORES_MOSTRADOS + 1:
+                print("  (se omiten más errores)")
+
+
+def importar(ruta, conexiones, tamano_lote=5000):
+    """Importa un archivo al banco y devuelve un ResultadoImportacion"""
+    conn = conexiones.conexion()
+    crear_esquema(conn.cursor())
+    conn.commit()
+
+    resultado = ResultadoImportacion(ruta)
+    filas = _filas_validas(ruta, resultado)
+    inicio = time.perf_counter()
+
+    while True:
+        lote = list(islice(filas, tamano_lote))
+        if not lote:
+            break
+        with conn:
+            resultado.insertadas += insertar_preguntas(conn.cursor(), lote)
+        resultado.segundos = time.perf_counter() - inicio
+        print(f"  {resultado.leidas:,} filas procesadas ({resultado.filas_por_segundo:,.0f} filas/s)")
+
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa preguntas desde CSV o JSONL")
+    parser.add_argument('archivos', nargs='+', help='archivos .csv o .jsonl')
+    parser.add_argument('--db', default='quiz_economia.db', help='base de datos destino')
+    parser.add_argument('--lote', type=int, default=5000, help='filas por transacción')
+    args = parser.parse_args(argv)
+
+    conexiones = obtener_gestor(args.db)
+    codigo = 0
+    for ruta in args.archivos:
+        print(f"Importando {ruta}...")
+        try:
+            print(importar(ruta, conexiones, args.lote))
+        except (OSError, ValueError) as e:
+            print(f"Error importando {ruta}: {e}")
+            codigo = 1
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
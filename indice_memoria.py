@@ -0,0 +1,189 @@
+"""
+Índice columnar en memoria del banco de preguntas
+"""
+import threading
+from collections import namedtuple
+
+from diferido import ModuloDiferido
+from esquema import leer_modificaciones_banco, leer_version_banco
+
+np = ModuloDiferido("numpy")
+
+
+# Columnas y vocabularios de un mismo momento del banco
+Vista = namedtuple('Vista', 'ids cat tema dificultad categorias temas pos_categorias pos_temas')
+
+
+class ColumnasBanco:
+    """Consultas sobre el banco guardado en columnas NumPy.
+
+    Las subclases llenan ids (int64), cat y tema (códigos sobre los
+    vocabularios categorias y temas, con sus posiciones en _pos_categorias y
+    _pos_temas) y dificultad (int8). Cada consulta toma una Vista con
+    vista(), que sincroniza antes de leer las columnas; aquí sincronizar()
+    no hace nada.
+    """
+
+    generacion = 0
+
+    def sincronizar(self):
+        pass
+
+    def vista(self):
+        """Columnas y vocabularios actuales, leídos juntos después de sincronizar"""
+        self.sincronizar()
+        return self._vista()
+
+    def _vista(self):
+        return Vista(self.ids, self.cat, self.tema, self.dificultad,
+                     self.categorias, self.temas, self._pos_categorias, self._pos_temas)
+
+    def _codigos(self, valores, posiciones):
+        return np.array([posiciones[v] for v in valores if v in posiciones], dtype=np.int32)
+
+    def mascara(self, categorias, temas=None, dificultad=None, vista=None):
+        """Máscara booleana de las filas que cumplen el filtro (sobre vista, o la actual)"""
+        if vista is None:
+            vista = self.vista()
+        mask = np.isin(vista.cat, self._codigos(categorias, vista.pos_categorias))
+        if temas is not None:
+            mask &= np.isin(vista.tema, self._codigos(temas, vista.pos_temas))
+        if dificultad:
+            mask &= vista.dificultad == dificultad
+        return mask
+
+    def filtrar_ids(self, categorias, temas, dificultad=None):
+        """Ids de las preguntas que cumplen el filtro"""
+        vista = self.vista()
+        return vista.ids[self.mascara(categorias, temas, dificultad, vista)]
+
+    def contar(self, categorias, temas=None, dificultad=None):
+        """Cantidad de preguntas que cumplen el filtro"""
+        return int(np.count_nonzero(self.mascara(categorias, temas, dificultad)))
+
+    def temas_disponibles(self, categorias):
+        """Temas distintos de las categorías dadas, ordenados por nombre"""
+        vista = self.vista()
+        codigos = np.unique(vista.tema[self.mascara(categorias, vista=vista)])
+        return sorted(vista.temas[c] for c in codigos)
+
+    def estadisticas_dificultad(self):
+        """Cantidad de preguntas por dificultad (1, 2, 3)"""
+        conteo = np.bincount(self.vista().dificultad, minlength=4)
+        return {nivel: int(conteo[nivel]) for nivel in (1, 2, 3) if conteo[nivel]}
+
+    def muestrear_ids(self, categorias, temas, dificultad=None, n=8, rng=None):
+        """Hasta n ids al azar que cumplen el filtro"""
+        ids = self.filtrar_ids(categorias, temas, dificultad)
+        if rng is None:
+            rng = np.random.default_rng()
+        if len(ids) <= n:
+            return rng.permutation(ids).tolist()
+        return rng.choice(ids, size=n, replace=False).tolist()
+
+
+class IndiceColumnar(ColumnasBanco):
+    """Carga el banco una vez en columnas NumPy y responde filtros con máscaras.
+
+    categoria y tema se guardan como códigos enteros sobre un vocabulario,
+    dificultad como int8 e id como int64. Los cambios externos se detectan
+    con PRAGMA data_version sobre una conexión propia; si el contador de
+    version_banco no cambió (por ejemplo, sólo se registraron intentos) no
+    se hace nada; si no hubo borrados ni cambios de categoría, tema o
+    dificultad (la marca modificaciones de version_banco) las filas nuevas
+    se agregan al final, y si no se recarga todo.
+    """
+
+    def __init__(self, conexiones):
+        self._conn = conexiones.nueva_conexion()
+        self._lock = threading.Lock()
+        self._data_version = None
+        # Sube cada vez que cambian las columnas (para cachés derivadas)
+        self.generacion = 0
+        self.recargar()
+
+    # ---------- carga ----------
+
+    def _leer(self, desde_id=0):
+        return self._conn.execute('''
+            SELECT id, categoria, tema, dificultad FROM preguntas
+            WHERE id > ?
+            ORDER BY id
+        ''', (desde_id,)).fetchall()
+
+    def _codificar(self, valores, vocabulario, posiciones):
+        codigos = np.empty(len(valores), dtype=np.int32)
+        for i, valor in enumerate(valores):
+            codigo = posiciones.get(valor)
+            if codigo is None:
+                codigo = posiciones[valor] = len(vocabulario)
+                vocabulario.append(valor)
+            codigos[i] = codigo
+        return codigos
+
+    def _columnas(self, filas):
+        if filas:
+            ids, categorias, temas, dificultades = zip(*filas)
+        else:
+            ids, categorias, temas, dificultades = (), (), (), ()
+        return (np.fromiter(ids, dtype=np.int64, count=len(ids)),
+                self._codificar(categorias, self.categorias, self._pos_categorias).astype(np.int16),
+                self._codificar(temas, self.temas, self._pos_temas),
+                np.fromiter(dificultades, dtype=np.int8, count=len(dificultades)))
+
+    def recargar(self):
+        """Recarga el índice completo desde la base de datos"""
+        with self._lock:
+            self._data_version = self._version_actual()
+            self._version_banco = leer_version_banco(self._conn)
+            self._modificaciones = leer_modificaciones_banco(self._conn)
+            self.generacion += 1
+            self.categorias, self._pos_categorias = [], {}
+            self.temas, self._pos_temas = [], {}
+            self.ids, self.cat, self.tema, self.dificultad = self._columnas(self._leer())
+
+    def _version_actual(self):
+        return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _agregar(self, filas):
+        ids, cat, tema, dificultad = self._columnas(filas)
+        self.ids = np.concatenate([self.ids, ids])
+        self.cat = np.concatenate([self.cat, cat])
+        self.tema = np.concatenate([self.tema, tema])
+        self.dificultad = np.concatenate([self.dificultad, dificultad])
+        self.generacion += 1
+
+    def sincronizar(self):
+        """Actualiza el índice si la base cambió desde la última lectura"""
+        with self._lock:
+            version = self._version_actual()
+            if version == self._data_version:
+                return
+            self._data_version = version
+            version_banco = leer_version_banco(self._conn)
+            if version_banco == self._version_banco:
+                # La escritura fue en otra tabla: las preguntas siguen iguales
+                return
+            self._version_banco = version_banco
+
+            modificaciones = leer_modificaciones_banco(self._conn)
+            max_id = int(self.ids[-1]) if len(self.ids) else 0
+            total = self._conn.execute("SELECT COUNT(*) FROM preguntas").fetchone()[0]
+            nuevas = self._leer(max_id)
+            if (modificaciones == self._modificaciones and nuevas
+                    and total == len(self.ids) + len(nuevas)):
+                # Sólo inserciones al final: actualización incremental
+                self._agregar(nuevas)
+                return
+        # Borrados o modificaciones: recarga completa
+        self.recargar()
+
+    def vista(self):
+        # recargar y _agregar reemplazan las columnas una por una con el lock
+        # tomado: se leen con el lock para no mezclar largos
+        self.sincronizar()
+        with self._lock:
+            return self._vista()
+
+    def cerrar(self):
+        self._conn.close()
@@ -0,0 +1,223 @@
+"""
+Instantánea binaria de sólo lectura del banco de preguntas, leída con mmap.
+
+El archivo tiene una cabecera JSON (cantidad de filas, versión del banco,
+vocabularios de categoría y tema, y la ubicación de cada sección) seguida de
+secciones alineadas a 8 bytes:
+
+    id int64, dificultad int8, cat int16, tema int32, correcta uint8 (letra ASCII)
+    para cada texto (pregunta, opcion_a..opcion_d): offsets uint64[n + 1] y
+    un bloque UTF-8 con todos los textos seguidos
+
+Las columnas se abren con np.frombuffer sobre el mapa del archivo: abrir
+una instantánea no lee ni convierte nada, y todos los procesos que la abran
+comparten las mismas páginas del caché del sistema operativo.
+
+Uso:
+    python instantanea.py --db quiz_economia.db --salida quiz_economia.snap
+"""
+import argparse
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import time
+from array import array
+
+from diferido import ModuloDiferido
+from esquema import leer_version_banco
+from indice_memoria import ColumnasBanco
+
+np = ModuloDiferido("numpy")
+
+MAGIA = b'QZSNAP01'
+ALINEACION = 8
+CAMPOS_TEXTO = ('pregunta', 'opcion_a', 'opcion_b', 'opcion_c', 'opcion_d')
+# sección -> (tipo NumPy, código de array.array)
+COLUMNAS = {'id': ('<i8', 'q'), 'dificultad': ('|i1', 'b'), 'cat': ('<i2', 'h'),
+            'tema': ('<i4', 'i'), 'correcta': ('|u1', 'B')}
+LOTE_EXPORTACION = 10000
+
+
+def exportar(conn, ruta):
+    """Compila la tabla preguntas en una instantánea; devuelve la cantidad de filas.
+
+    Se escribe en un archivo temporal que luego reemplaza a ruta, de modo que
+    los procesos que tengan abierta la instantánea anterior la siguen viendo
+    entera. La versión y las filas se leen en una misma transacción, así la
+    versión de la cabecera corresponde a las filas exportadas.
+    """
+    columnas = {nombre: array(codigo) for nombre, (_, codigo) in COLUMNAS.items()}
+    textos = {campo: (array('Q', [0]), bytearray()) for campo in CAMPOS_TEXTO}
+    vocabularios = {'categorias': ([], {}), 'temas': ([], {})}
+
+    def codigo(vocabulario, valor):
+        lista, posiciones = vocabularios[vocabulario]
+        if valor not in posiciones:
+            posiciones[valor] = len(lista)
+            lista.append(valor)
+        return posiciones[valor]
+
+    propia = not conn.in_transaction
+    if propia:
+        conn.execute("BEGIN")
+    try:
+        version = leer_version_banco(conn)
+        cursor = conn.execute(f'''
+            SELECT id, categoria, tema, dificultad, correcta, {', '.join(CAMPOS_TEXTO)}
+            FROM preguntas ORDER BY id
+        ''')
+        while True:
+            filas = cursor.fetchmany(LOTE_EXPORTACION)
+            if not filas:
+                break
+            for id_, categoria, tema, dificultad, correcta, *resto in filas:
+                columnas['id'].append(id_)
+                columnas['cat'].append(codigo('categorias', categoria))
+                columnas['tema'].append(codigo('temas', tema))
+                columnas['dificultad'].append(dificultad)
+                columnas['correcta'].append(ord(correcta))
+                for campo, texto in zip(CAMPOS_TEXTO, resto):
+                    offsets, datos = textos[campo]
+                    datos += texto.encode('utf-8')
+                    offsets.append(len(datos))
+    finally:
+        if propia:
+            conn.execute("COMMIT")
+
+    secciones = [(nombre, COLUMNAS[nombre][0], datos) for nombre, datos in columnas.items()]
+    for campo, (offsets, datos) in textos.items():
+        secciones.append((f'{campo}.offsets', '<u8', offsets))
+        secciones.append((f'{campo}.datos', '|u1', datos))
+
+    # La cabecera necesita los offsets de las secciones, que dependen de su
+    # propio largo: se reserva espacio de sobra y se rellena con espacios
+    cabecera = {'filas': len(columnas['id']), 'version_banco': version, 'creada': time.time(),
+                'categorias': vocabularios['categorias'][0], 'temas': vocabularios['temas'][0],
+                'secciones': {}}
+    reserva = len(json.dumps(cabecera, ensure_ascii=False).encode('utf-8')) + 96 * len(secciones)
+    inicio = _alinear(len(MAGIA) + 4 + reserva)
+    for nombre, tipo, datos in secciones:
+        largo = len(datos) * (datos.itemsize if isinstance(datos, array) else 1)
+        cabecera['secciones'][nombre] = {'tipo': tipo, 'inicio': inicio, 'bytes': largo}
+        inicio = _alinear(inicio + largo)
+    texto_cabecera = json.dumps(cabecera, ensure_ascii=False).encode('utf-8')
+    if len(texto_cabecera) > reserva:
+        # ljust no recorta: las secciones quedarían corridas respecto de sus offsets
+        raise ValueError(f"La cabecera ocupa {len(texto_cabecera)} bytes y se reservaron {reserva}")
+    texto_cabecera = texto_cabecera.ljust(reserva)
+
+    temporal = f'{ruta}.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(MAGIA + struct.pack('<I', reserva) + texto_cabecera)
+        for nombre, _, datos in secciones:
+            f.write(b'\0' * (cabecera['secciones'][nombre]['inicio'] - f.tell()))
+            f.write(datos.tobytes() if isinstance(datos, array) else datos)
+    os.replace(temporal, ruta)
+    return cabecera['filas']
+
+
+def _alinear(posicion):
+    return -(-posicion // ALINEACION) * ALINEACION
+
+
+class Instantanea(ColumnasBanco):
+    """Banco de sólo lectura servido desde una instantánea mapeada en memoria.
+
+    Responde las mismas consultas que IndiceColumnar (máscaras, conteos,
+    temas, muestreo de ids) sin conexión a SQLite, y además devuelve las
+    filas completas: los textos se decodifican sólo para las filas pedidas.
+    version_banco indica a qué versión del banco corresponde.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as f:
+            self._mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mapa[:len(MAGIA)] != MAGIA:
+            self._mapa.close()
+            raise ValueError(f"{ruta} no es una instantánea del banco")
+        largo = struct.unpack_from('<I', self._mapa, len(MAGIA))[0]
+        inicio = len(MAGIA) + 4
+        cabecera = json.loads(self._mapa[inicio:inicio + largo])
+
+        self.filas = cabecera['filas']
+        self.version_banco = cabecera['version_banco']
+        self.creada = cabecera['creada']
+        self.categorias = cabecera['categorias']
+        self.temas = cabecera['temas']
+        self._pos_categorias = {valor: i for i, valor in enumerate(self.categorias)}
+        self._pos_temas = {valor: i for i, valor in enumerate(self.temas)}
+        self._secciones = cabecera['secciones']
+
+        self.ids = self._seccion('id')
+        self.dificultad = self._seccion('dificultad')
+        self.cat = self._seccion('cat')
+        self.tema = self._seccion('tema')
+        self.correcta = self._seccion('correcta')
+        self._textos = {campo: (self._seccion(f'{campo}.offsets'),
+                                self._secciones[f'{campo}.datos']['inicio'])
+                        for campo in CAMPOS_TEXTO}
+
+    def _seccion(self, nombre):
+        seccion = self._secciones[nombre]
+        tipo = np.dtype(seccion['tipo'])
+        if not seccion['bytes']:
+            return np.empty(0, dtype=tipo)
+        return np.frombuffer(self._mapa, dtype=tipo, count=seccion['bytes'] // tipo.itemsize,
+                             offset=seccion['inicio'])
+
+    def __len__(self):
+        return self.filas
+
+    def _texto(self, campo, posicion):
+        offsets, inicio = self._textos[campo]
+        desde, hasta = int(offsets[posicion]), int(offsets[posicion + 1])
+        return self._mapa[inicio + desde:inicio + hasta].decode('utf-8')
+
+    def fila(self, posicion):
+        """Fila completa en el orden de CAMPOS_PREGUNTA (id, categoria, tema, dificultad, textos, correcta)"""
+        textos = [self._texto(campo, posicion) for campo in CAMPOS_TEXTO]
+        return (int(self.ids[posicion]), self.categorias[self.cat[posicion]], self.temas[self.tema[posicion]],
+                int(self.dificultad[posicion]), *textos, chr(self.correcta[posicion]))
+
+    def por_ids(self, ids):
+        """Filas de las preguntas indicadas, en el mismo orden (las que no existen se omiten)"""
+        ids = np.asarray(ids, dtype=np.int64)
+        posiciones = np.searchsorted(self.ids, ids)
+        existe = posiciones < self.filas
+        existe[existe] = self.ids[posiciones[existe]] == ids[existe]
+        return [self.fila(int(p)) for p in posiciones[existe]]
+
+    def filtrar_filas(self, categorias, temas, dificultad=None):
+        """Filas de todas las preguntas que cumplen el filtro, en orden de id"""
+        return [self.fila(int(p)) for p in np.flatnonzero(self.mascara(categorias, temas, dificultad))]
+
+    def cerrar(self):
+        # Las columnas son vistas del mapa: hay que soltarlas antes de cerrarlo
+        self.ids = self.dificultad = self.cat = self.tema = self.correcta = None
+        self._textos = {}
+        try:
+            self._mapa.close()
+        except BufferError:
+            # Alguien conserva una vista; el mapa se libera cuando la suelte
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exporta el banco de preguntas a una instantánea binaria")
+    parser.add_argument('--db', default='quiz_economia.db', help='base de datos de origen')
+    parser.add_argument('--salida', default='quiz_economia.snap', help='archivo de la instantánea')
+    args = parser.parse_args(argv)
+
+    conn = sqlite3.connect(args.db)
+    inicio = time.perf_counter()
+    filas = exportar(conn, args.salida)
+    conn.close()
+    print(f"{filas:,d} preguntas exportadas a {args.salida} "
+          f"({os.path.getsize(args.salida) / 2**20:.1f} MB) en {time.perf_counter() - inicio:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
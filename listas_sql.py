@@ -0,0 +1,48 @@
+"""
+Filtros por listas de valores con texto SQL constante (json_each)
+"""
+import json
+
+# Una lista se pasa como un único parámetro con un arreglo JSON: el texto de
+# la sentencia no depende de cuántos valores haya, así que la caché de
+# sentencias de sqlite3 la reutiliza y no se choca con el límite de variables
+EN_LISTA = 'IN (SELECT value FROM json_each(?))'
+
+
+def _filtro(prefijo, con_dificultad):
+    where = f'{prefijo}categoria {EN_LISTA} AND {prefijo}tema {EN_LISTA}'
+    return where + f' AND {prefijo}dificultad = ?' if con_dificultad else where
+
+
+# (usar_indice, con_dificultad) -> cláusula WHERE. El + delante de una
+# columna impide que SQLite use un índice sobre ella
+FILTROS_PREGUNTAS = {(usar_indice, con_dificultad): _filtro('' if usar_indice else '+', con_dificultad)
+                     for usar_indice in (True, False) for con_dificultad in (True, False)}
+
+
+def lista_json(valores):
+    """Arreglo JSON con los valores (acepta enteros de NumPy)"""
+    return json.dumps(list(valores), ensure_ascii=False, default=int)
+
+
+def filtro_preguntas(categorias, temas, dificultad=None, usar_indice=True):
+    """Cláusula WHERE por categorías, temas y dificultad opcional, con sus parámetros.
+
+    Hay un texto fijo por combinación de opciones, sea cual sea el largo de
+    las listas. Con usar_indice=False las columnas del filtro no usan
+    índices, para que la consulta recorra el índice de su ORDER BY.
+    """
+    params = [lista_json(categorias), lista_json(temas)]
+    if dificultad:
+        params.append(int(dificultad))
+    return FILTROS_PREGUNTAS[usar_indice, bool(dificultad)], params
+
+
+def seleccion_por_ids(columnas='*', tabla='preguntas'):
+    """SELECT de las filas con los ids de un arreglo JSON, en el orden del arreglo"""
+    campos = ', '.join(f't.{c}' for c in columnas) if columnas != '*' else 't.*'
+    return f'''
+        SELECT {campos} FROM json_each(?) AS j
+        JOIN {tabla} AS t ON t.id = j.value
+        ORDER BY j.key
+    '''
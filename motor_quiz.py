@@ -0,0 +1,153 @@
+"""
+Motor del quiz sin interfaz gráfica, compartido por las apps Tk y el servidor de sesiones
+"""
+from calificacion import SIN_RESPUESTA, calificar, codificar_letras, codigo_letra
+from cronometro import CronometroPreguntas
+from diferido import ModuloDiferido
+
+pd = ModuloDiferido("pandas")
+
+
+# Tamaño máximo de un examen de práctica y tiempo asignado a cada pregunta
+MAX_PREGUNTAS = 2000
+SEGUNDOS_POR_PREGUNTA = 75
+
+CAMPOS_PREGUNTA = ('id', 'categoria', 'tema', 'dificultad', 'pregunta',
+                   'opcion_a', 'opcion_b', 'opcion_c', 'opcion_d', 'correcta')
+
+
+class PreguntaQuiz:
+    """Pregunta compacta (sin DataFrame); admite pregunta['campo'] como una fila de pandas"""
+    __slots__ = CAMPOS_PREGUNTA
+    
+    def __init__(self, id, categoria, tema, dificultad, pregunta,
+                 opcion_a, opcion_b, opcion_c, opcion_d, correcta):
+        self.id = int(id)
+        self.categoria = categoria
+        self.tema = tema
+        self.dificultad = int(dificultad)
+        self.pregunta = pregunta
+        self.opcion_a = opcion_a
+        self.opcion_b = opcion_b
+        self.opcion_c = opcion_c
+        self.opcion_d = opcion_d
+        self.correcta = str(correcta).lower().strip()
+    
+    def __getitem__(self, campo):
+        return getattr(self, campo)
+
+
+def _a_preguntas(preguntas):
+    """Acepta un DataFrame, filas en el orden de CAMPOS_PREGUNTA o PreguntaQuiz"""
+    if hasattr(preguntas, 'itertuples'):
+        filas = preguntas[list(CAMPOS_PREGUNTA)].itertuples(index=False, name=None)
+    else:
+        filas = preguntas
+    return [fila if isinstance(fila, PreguntaQuiz) else PreguntaQuiz(*fila) for fila in filas]
+
+
+class QuizEngine:
+    """Lógica del quiz (navegación, respuestas, tiempos y calificación).
+
+    Todo el estado por pregunta es de tamaño fijo (una letra, un código int8
+    y un tiempo), así que saltar a cualquier pregunta con ir_a(i), marcar una
+    respuesta o consultar si una página de preguntas está respondida cuesta
+    lo mismo con 8 preguntas que con 2000.
+    """
+    
+    def __init__(self, preguntas):
+        # Las preguntas se convierten una sola vez en registros con __slots__:
+        # el acceso por índice no crea objetos nuevos
+        self.preguntas = _a_preguntas(preguntas)
+        self.total = len(self.preguntas)
+        self.idx = 0
+        self.elegidas = [''] * self.total
+        self.cronometro = CronometroPreguntas(self.total)
+        
+        # Respuestas y clave codificadas como int8 para calificar vectorizado
+        self.codigos_elegidos = codificar_letras(self.elegidas)
+        self.codigos_correctos = codificar_letras([p.correcta for p in self.preguntas])
+        self.n_respondidas = 0
+        # Tiempos por pregunta fijados al calificar (None mientras el quiz sigue)
+        self.tiempos_finales = None
+    
+    @property
+    def df_preguntas(self):
+        """Preguntas como DataFrame (se construye sólo si alguien lo pide)"""
+        return pd.DataFrame([[getattr(p, c) for c in CAMPOS_PREGUNTA] for p in self.preguntas],
+                            columns=list(CAMPOS_PREGUNTA))
+    
+    def pregunta_actual(self):
+        if self.idx < self.total:
+            return self.preguntas[self.idx]
+        return None
+    
+    @property
+    def tiempos(self):
+        """Segundos en cada pregunta, sumando todas las visitas"""
+        return self.cronometro.segundos()
+    
+    def iniciar_pregunta(self):
+        self.cronometro.entrar(self.idx)
+    
+    def marcar_respuesta(self, letra):
+        codigo = codigo_letra(letra)
+        antes = self.respondida(self.idx)
+        self.n_respondidas += (codigo != SIN_RESPUESTA) - antes
+        self.elegidas[self.idx] = letra
+        self.codigos_elegidos[self.idx] = codigo
+    
+    def respondida(self, i):
+        return bool(self.codigos_elegidos[i] != SIN_RESPUESTA)
+    
+    def respondidas_en(self, inicio, fin):
+        """Arreglo bool (vista de los códigos int8) de las preguntas respondidas en [inicio, fin)"""
+        return self.codigos_elegidos[inicio:fin] != SIN_RESPUESTA
+    
+    def ir_a(self, i):
+        """Salta directamente a la pregunta i; False si el índice no existe"""
+        if not 0 <= i < self.total:
+            return False
+        if i != self.idx:
+            self.cronometro.salir()
+            self.idx = i
+        return True
+    
+    def ir_siguiente(self):
+        return self.idx < self.total - 1 and self.ir_a(self.idx + 1)
+    
+    def ir_anterior(self):
+        return self.idx > 0 and self.ir_a(self.idx - 1)
+    
+    def _cerrar_pregunta_final(self):
+        self.cronometro.salir()
+    
+    def finalizar_compacto(self):
+        """Califica sin construir DataFrames: (correctas, total, aciertos por pregunta)"""
+        self._cerrar_pregunta_final()
+        aciertos, correctas, self.tiempos_finales = calificar(self.codigos_elegidos, self.codigos_correctos,
+                                                              self.cronometro.arreglo())
+        return correctas, self.total, aciertos
+    
+    def filas_respuestas(self, aciertos):
+        """Filas (pregunta_id, elegida, correcta, tiempo_seg) para registrar el intento"""
+        tiempos = self.tiempos if self.tiempos_finales is None else self.tiempos_finales
+        return [(p.id, elegida, int(acierto), float(tiempo))
+                for p, elegida, acierto, tiempo in zip(self.preguntas, self.elegidas, aciertos, tiempos)]
+    
+    def finalizar(self):
+        correctas, total, aciertos = self.finalizar_compacto()
+        
+        # El DataFrame de resultados sólo se arma aquí, para las gráficas
+        df_resultados = pd.DataFrame({
+            'id': [p.id for p in self.preguntas],
+            'categoria': [p.categoria for p in self.preguntas],
+            'tema': [p.tema for p in self.preguntas],
+            'dificultad': [p.dificultad for p in self.preguntas],
+            'pregunta': [p.pregunta for p in self.preguntas],
+            'opcion_elegida': list(self.elegidas),
+            'correcta': [p.correcta for p in self.preguntas],
+            'correcta_bool': aciertos,
+            'tiempo_seg': self.tiempos_finales
+        })
+        return correctas, total, df_resultados
@@ -0,0 +1,253 @@
+"""
+Muestreo de preguntas directamente en SQLite
+"""
+import heapq
+import math
+import random
+
+from listas_sql import FILTROS_PREGUNTAS, filtro_preguntas
+
+AZAR_MIN = -2 ** 63
+AZAR_MAX = 2 ** 63 - 1
+
+# Con más combinaciones categoría/tema que esto no se consultan los conteos
+# ni se busca cada una: se recorre directamente idx_preguntas_azar
+SONDEOS_MAX = 500
+
+# La ventana tomada a partir del pivote tiene SOBREMUESTREO·n claves y de
+# ella se eligen n al azar, para que el examen no sea siempre un bloque
+# contiguo de claves
+SOBREMUESTREO = 4
+
+# Selecciones de hasta este tamaño se leen enteras y se muestrean de forma
+# exacta: leer unos miles de ids cuesta poco y la ventana no es uniforme
+SELECCION_EXACTA = 5000
+
+# Filas que se piden al cursor por vez al muestrear con reservorio
+LOTE_CURSOR = 1000
+
+METODOS = ('azar', 'reservorio')
+
+
+def _sql_sondeos(con_dificultad):
+    """Una búsqueda por combinación (de estadisticas_banco) en el índice que termina en azar.
+
+    Cada combinación aporta sus primeras claves dentro del rango y sólo esas
+    se ordenan. Los parámetros son los del filtro, el rango de azar y dos
+    veces el límite.
+    """
+    where = FILTROS_PREGUNTAS[True, con_dificultad]
+    if con_dificultad:
+        campos, indice, extra = 'categoria, tema, dificultad', 'idx_preguntas_filtro_azar', \
+            '\n              AND q.dificultad = par.dificultad'
+    else:
+        campos, indice, extra = 'categoria, tema', 'idx_preguntas_tema_azar', ''
+    return f'''
+        SELECT p.id
+        FROM (SELECT DISTINCT {campos} FROM estadisticas_banco WHERE {where}) AS par
+        CROSS JOIN preguntas AS p
+        WHERE p.id IN (
+            SELECT q.id FROM preguntas AS q INDEXED BY {indice}
+            WHERE q.categoria = par.categoria AND q.tema = par.tema{extra}
+              AND q.azar BETWEEN ? AND ?
+            ORDER BY q.azar
+            LIMIT ?
+        )
+        ORDER BY p.azar
+        LIMIT ?
+    '''
+
+
+SQL_SONDEOS = {con_dificultad: _sql_sondeos(con_dificultad) for con_dificultad in (False, True)}
+
+
+def _sql_recorrido(con_dificultad):
+    """Recorre idx_preguntas_azar desde el rango pedido, filtrando cada fila"""
+    where = FILTROS_PREGUNTAS[False, con_dificultad]
+    return f'''
+        SELECT id FROM preguntas INDEXED BY idx_preguntas_azar
+        WHERE {where} AND azar BETWEEN ? AND ?
+        ORDER BY azar
+        LIMIT ?
+    '''
+
+
+SQL_RECORRIDOS = {con_dificultad: _sql_recorrido(con_dificultad) for con_dificultad in (False, True)}
+
+# Todos los ids de la selección, leídos del índice compuesto que la cubre
+SQL_SELECCION = {con_dificultad: f'''
+    SELECT id FROM preguntas INDEXED BY {indice}
+    WHERE {FILTROS_PREGUNTAS[True, con_dificultad]}
+''' for con_dificultad, indice in ((False, 'idx_preguntas_tema_azar'), (True, 'idx_preguntas_filtro_azar'))}
+
+
+def _conteo_filtro(conn, where, params):
+    """Combinaciones categoría/tema con preguntas que cumplen el filtro, y cuántas preguntas suman"""
+    return conn.execute(f'''
+        SELECT COUNT(*), COALESCE(SUM(cantidad), 0) FROM (
+            SELECT SUM(cantidad) AS cantidad FROM estadisticas_banco
+            WHERE {where}
+            GROUP BY categoria, tema
+        )
+    ''', params).fetchone()
+
+
+def muestrear_ids(conn, categorias, temas, dificultad=None, n=8, rng=random):
+    """Devuelve hasta n ids aleatorios que cumplen el filtro.
+
+    Cada pregunta tiene una clave aleatoria fija (columna azar). Se elige un
+    pivote al azar, se toman las SOBREMUESTREO·n primeras claves a partir de
+    él (dando la vuelta al inicio si hace falta) y de ellas n al azar. El
+    costo depende de n y de cuántas combinaciones categoría/tema se eligen,
+    no del tamaño del banco ni de la selección (pasado SELECCION_EXACTA).
+
+    Con los conteos de estadisticas_banco se elige cómo juntar las claves,
+    según cuántas filas habría que leer con cada forma: la selección
+    entera si tiene hasta SELECCION_EXACTA preguntas o si leerla cuesta
+    menos que las otras formas (y entonces la muestra es exacta); una
+    búsqueda por combinación en el índice que termina en azar si cada
+    combinación tiene muchas preguntas; o, con selecciones grandes (o más
+    de SONDEOS_MAX combinaciones), un recorrido de idx_preguntas_azar,
+    donde las filas aparecen enseguida. Los índices se fijan con INDEXED
+    BY, así que los planes no cambian cuando ANALYZE (o PRAGMA optimize)
+    llena sqlite_stat1.
+
+    Limitación de la ventana (sólo en selecciones grandes): como las claves
+    no cambian, dos preguntas sólo salen juntas si están a menos de
+    SOBREMUESTREO·n posiciones en el orden de azar, y cada pregunta sale
+    algo más o menos seguido según la separación de su clave con las
+    anteriores. Para exámenes independientes entre sí están
+    el índice columnar, el muestreo estratificado y muestrear_filas.
+    """
+    if n <= 0 or not categorias or not temas:
+        return []
+
+    where, params = filtro_preguntas(categorias, temas, dificultad)
+    ventana = n * SOBREMUESTREO
+    if len(categorias) * len(temas) > SONDEOS_MAX:
+        query, limites = SQL_RECORRIDOS[bool(dificultad)], 1
+    else:
+        pares, seleccion = _conteo_filtro(conn, where, params)
+        if not seleccion:
+            return []
+        # Filas leídas con cada forma: la selección; hasta una ventana por
+        # combinación; o, en idx_preguntas_azar, total / seleccion filas por
+        # cada una de la ventana
+        total = conn.execute("SELECT MAX(id) FROM preguntas").fetchone()[0]
+        sondeos, recorrido = pares * ventana, ventana * total / seleccion
+        if seleccion <= max(SELECCION_EXACTA, min(sondeos, recorrido)):
+            ids = [fila[0] for fila in conn.execute(SQL_SELECCION[bool(dificultad)], params)]
+            return rng.sample(ids, min(n, len(ids)))
+        if recorrido <= sondeos:
+            query, limites = SQL_RECORRIDOS[bool(dificultad)], 1
+        else:
+            query, limites = SQL_SONDEOS[bool(dificultad)], 2
+
+    pivote = rng.randint(AZAR_MIN, AZAR_MAX)
+    ids = [fila[0] for fila in conn.execute(query, params + [pivote, AZAR_MAX] + [ventana] * limites)]
+    if len(ids) < ventana and pivote > AZAR_MIN:
+        faltan = [ventana - len(ids)] * limites
+        ids += [fila[0] for fila in conn.execute(query, params + [AZAR_MIN, pivote - 1] + faltan)]
+
+    return rng.sample(ids, min(n, len(ids)))
+
+
+class Reservorio:
+    """Muestra uniforme de k elementos de una secuencia de largo desconocido.
+
+    Usa el algoritmo L: después de llenar la muestra calcula cuántos
+    elementos saltar hasta el próximo reemplazo, así que sólo llama al
+    generador unas k·log(N/k) veces y nunca guarda más de k elementos.
+    """
+
+    def __init__(self, k, rng=random):
+        self.k = k
+        self.rng = rng
+        self.muestra = []
+        self._w = 1.0
+        self._siguiente = None
+
+    def _u(self):
+        # En (0, 1): log(0) no está definido
+        return self.rng.random() or 5e-324
+
+    def _saltar(self, desde):
+        self._w *= math.exp(math.log(self._u()) / self.k)
+        self._siguiente = desde + int(math.log(self._u()) / math.log1p(-self._w))
+
+    @property
+    def llena(self):
+        return len(self.muestra) == self.k
+
+    @property
+    def siguiente(self):
+        """Posición del próximo elemento que entra en la muestra (None mientras no esté llena)"""
+        return self._siguiente
+
+    def ofrecer(self, lote, inicio):
+        """Procesa un lote de elementos cuyo primero ocupa la posición inicio de la secuencia"""
+        if not self.llena:
+            j = min(self.k - len(self.muestra), len(lote))
+            self.muestra.extend(lote[:j])
+            if not self.llena:
+                return
+            self._saltar(inicio + j)
+        fin = inicio + len(lote)
+        while self._siguiente < fin:
+            self.reemplazar(lote, inicio)
+
+    def reemplazar(self, lote, inicio):
+        """Mete en la muestra el elemento de la posición siguiente (que debe estar en el lote)"""
+        self.muestra[self.rng.randrange(self.k)] = lote[self._siguiente - inicio]
+        self._saltar(self._siguiente + 1)
+
+
+def reservorios_cursor(cursor, k, rngs, lote=LOTE_CURSOR):
+    """Una muestra de hasta k filas del cursor por cada rng, en una sola pasada.
+
+    Las filas se leen con fetchmany, de a lote: la memoria pico es
+    O(k·len(rngs) + lote) sin importar cuántas filas devuelva la consulta.
+    Una vez llenos, los reservorios esperan en un heap ordenado por su
+    próxima posición, así que cada lote sólo toca a los que reemplazan algo.
+    """
+    if k <= 0:
+        return [[] for _ in rngs]
+    reservorios = [Reservorio(k, rng) for rng in rngs]
+    pendientes = None
+    inicio = 0
+    while True:
+        filas = cursor.fetchmany(lote)
+        if not filas:
+            break
+        if pendientes is None:
+            for reservorio in reservorios:
+                reservorio.ofrecer(filas, inicio)
+            if reservorios and reservorios[0].llena:
+                pendientes = [(r.siguiente, i) for i, r in enumerate(reservorios)]
+                heapq.heapify(pendientes)
+        else:
+            fin = inicio + len(filas)
+            while pendientes and pendientes[0][0] < fin:
+                reservorio = reservorios[pendientes[0][1]]
+                reservorio.reemplazar(filas, inicio)
+                heapq.heapreplace(pendientes, (reservorio.siguiente, pendientes[0][1]))
+        inicio += len(filas)
+    for reservorio in reservorios:
+        reservorio.rng.shuffle(reservorio.muestra)
+    return [reservorio.muestra for reservorio in reservorios]
+
+
+def muestrear_filas(conn, columnas, categorias, temas, dificultad=None, n=8, rngs=(random,)):
+    """Hasta n filas al azar que cumplen el filtro, por cada rng, leyendo el resultado en streaming.
+
+    A diferencia de muestrear_ids no necesita la columna azar ni un índice:
+    recorre una vez todas las filas que cumplen el filtro, sin guardarlas.
+    """
+    if not categorias or not temas:
+        return [[] for _ in rngs]
+    where, params = filtro_preguntas(categorias, temas, dificultad)
+    cursor = conn.execute(f"SELECT {', '.join(columnas)} FROM preguntas WHERE {where}", params)
+    try:
+        return reservorios_cursor(cursor, n, rngs)
+    finally:
+        cursor.close()
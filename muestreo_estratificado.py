@@ -0,0 +1,112 @@
+"""
+Muestreo estratificado con semilla por sesión sobre el índice columnar
+"""
+import random
+
+from diferido import ModuloDiferido
+from cache_consultas import CacheLRU, clave_filtro
+
+np = ModuloDiferido("numpy")
+
+# Campo por el que se estratifica -> columna de la Vista del índice
+CAMPOS_ESTRATO = {'dificultad': 'dificultad', 'tema': 'tema', 'categoria': 'cat'}
+
+
+def indices_floyd(m, k, rng):
+    """k posiciones distintas de range(m) en O(k) (algoritmo de Floyd), sin orden útil"""
+    elegidos = set()
+    for j in range(m - k, m):
+        t = rng.randrange(j + 1)
+        elegidos.add(j if t in elegidos else t)
+    return elegidos
+
+
+def repartir(n, tamanos, rng):
+    """Cuotas lo más parejas posible entre estratos, sin pasar el tamaño de ninguno.
+
+    Los estratos se llenan del más chico al más grande: lo que no cabe en
+    uno pequeño se reparte entre los siguientes. El orden entre estratos del
+    mismo tamaño lo decide rng, para que el sobrante de la división no caiga
+    siempre en el mismo.
+    """
+    orden = sorted(tamanos, key=lambda clave: (tamanos[clave], rng.random()))
+    restantes = min(n, sum(tamanos.values()))
+    cuotas = {}
+    for i, clave in enumerate(orden):
+        cuotas[clave] = min(tamanos[clave], restantes // (len(orden) - i))
+        restantes -= cuotas[clave]
+    return cuotas
+
+
+class MuestreadorEstratificado:
+    """Arma exámenes balanceados por dificultad, tema o categoría.
+
+    Para cada filtro agrupa una vez los ids del IndiceColumnar en un arreglo
+    por estrato (guardado en una CacheLRU y renovado cuando cambia la
+    generación del índice). Cada examen elige luego, en cada estrato, tantas
+    posiciones como indique su cuota con el algoritmo de Floyd: el costo es
+    O(n) y no depende del tamaño del banco ni de la selección. Con la misma
+    semilla se obtiene siempre el mismo examen, así que basta guardar la
+    semilla de una sesión para reconstruirlo.
+    """
+
+    def __init__(self, indice, max_filtros=64):
+        self.indice = indice
+        self._cache = CacheLRU(max_entradas=max_filtros)
+
+    def estratos(self, categorias, temas, dificultad=None, por='dificultad'):
+        """{valor del estrato: arreglo de ids} de las preguntas que cumplen el filtro"""
+        if por not in CAMPOS_ESTRATO:
+            raise ValueError(f"por debe ser uno de {', '.join(CAMPOS_ESTRATO)}")
+        self.indice.sincronizar()
+        clave = clave_filtro(por, categorias, temas, dificultad) + (self.indice.generacion,)
+        return self._cache.obtener(clave, lambda: self._agrupar(categorias, temas, dificultad, por))
+
+    def _agrupar(self, categorias, temas, dificultad, por):
+        vista = self.indice.vista()
+        mascara = self.indice.mascara(categorias, temas, dificultad, vista)
+        columna = getattr(vista, CAMPOS_ESTRATO[por])[mascara]
+        ids = vista.ids[mascara]
+        orden = np.argsort(columna, kind='stable')
+        valores, inicios = np.unique(columna[orden], return_index=True)
+        grupos = np.split(ids[orden], inicios[1:])
+        if por == 'dificultad':
+            nombres = [int(v) for v in valores]
+        else:
+            vocabulario = vista.temas if por == 'tema' else vista.categorias
+            nombres = [vocabulario[v] for v in valores]
+        return dict(zip(nombres, grupos))
+
+    def muestrear_ids(self, categorias, temas, dificultad=None, n=8, por='dificultad',
+                      cuotas=None, semilla=None):
+        """Ids de un examen balanceado, en orden aleatorio.
+
+        cuotas: {valor del estrato: cantidad}; su suma reemplaza a n y los
+        estratos que no aparecen no aportan preguntas. Sin cuotas, las n
+        preguntas se reparten lo más parejo posible entre los estratos
+        disponibles. semilla: cualquier valor aceptado por random.Random
+        (None = al azar).
+        """
+        rng = random.Random(semilla)
+        estratos = self.estratos(categorias, temas, dificultad, por)
+        if cuotas is None:
+            cuotas = repartir(n, {clave: len(ids) for clave, ids in estratos.items()}, rng)
+        else:
+            for clave, cuota in cuotas.items():
+                disponibles = len(estratos.get(clave, ()))
+                if cuota > disponibles:
+                    raise ValueError(f"El estrato {clave!r} tiene {disponibles} preguntas "
+                                     f"y la cuota pide {cuota}")
+
+        elegidos = []
+        for clave, cuota in cuotas.items():
+            if cuota > 0:
+                ids = estratos[clave]
+                elegidos.extend(int(ids[i]) for i in indices_floyd(len(ids), cuota, rng))
+        rng.shuffle(elegidos)
+        return elegidos
+
+    def formas(self, semillas, categorias, temas, dificultad=None, n=8, por='dificultad', cuotas=None):
+        """Un examen por semilla (p. ej. una por estudiante del curso)"""
+        return [self.muestrear_ids(categorias, temas, dificultad, n, por, cuotas, semilla)
+                for semilla in semillas]
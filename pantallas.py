@@ -0,0 +1,53 @@
+"""
+Pantallas construidas una sola vez y alternadas sin destruir widgets
+"""
+import tkinter as tk
+
+
+class GestorPantallas:
+    """Alterna las pantallas de la aplicación dentro de root.
+
+    Cada pantalla se registra con una función que recibe un Frame vacío y
+    crea sus widgets. La primera vez que se muestra se construye; después
+    sólo se oculta con pack_forget y se vuelve a empaquetar, de modo que
+    navegar no crea ni destruye widgets y la aplicación actualiza únicamente
+    los textos y datos que cambian. Con cache=False se comporta como antes
+    (destruye la pantalla al salir y la reconstruye al volver), lo que sirve
+    para comparar la latencia de navegación.
+    """
+
+    def __init__(self, root, cache=True):
+        self.root = root
+        self.cache = cache
+        self.actual = None
+        self.construidas = 0
+        self._constructores = {}
+        self._marcos = {}
+
+    def registrar(self, nombre, construir):
+        self._constructores[nombre] = construir
+
+    def mostrar(self, nombre):
+        """Deja visible la pantalla nombre (construyéndola si hace falta) y devuelve su Frame"""
+        if self.actual is not None and self.actual != nombre:
+            anterior = self._marcos.get(self.actual)
+            if anterior is not None:
+                if self.cache:
+                    anterior.pack_forget()
+                else:
+                    anterior.destroy()
+                    del self._marcos[self.actual]
+
+        marco = self._marcos.get(nombre)
+        if marco is None:
+            marco = tk.Frame(self.root, bg=self.root.cget('bg'))
+            self._constructores[nombre](marco)
+            self._marcos[nombre] = marco
+            self.construidas += 1
+        if self.actual != nombre:
+            marco.pack(fill='both', expand=True)
+        self.actual = nombre
+        return marco
+
+    def construida(self, nombre):
+        return nombre in self._marcos
@@ -0,0 +1,76 @@
+"""
+Rueda de plazos (timing wheel) para vencer muchas sesiones con un solo reloj
+"""
+import math
+import time
+
+
+class RuedaPlazos:
+    """Rueda de tiempo con ranuras de `resolucion` segundos.
+
+    programar() y cancelar() son O(1): cada clave vive en el diccionario de
+    la ranura de su tick de vencimiento. avanzar() recorre sólo las ranuras
+    de los ticks transcurridos desde la última llamada y devuelve de una vez
+    todas las claves vencidas, así que no hay un despertar por sesión. Los
+    plazos más lejanos que una vuelta completa (ranuras * resolucion) quedan
+    en su ranura hasta la vuelta que les corresponde.
+    """
+
+    def __init__(self, resolucion=1.0, ranuras=1024, reloj=time.monotonic):
+        self.resolucion = resolucion
+        self.ranuras = ranuras
+        self._reloj = reloj
+        self._origen = reloj()
+        self._tick = 0
+        self._ranuras = [{} for _ in range(ranuras)]
+        self._ubicacion = {}
+
+    def __len__(self):
+        return len(self._ubicacion)
+
+    def __contains__(self, clave):
+        return clave in self._ubicacion
+
+    def _tick_de(self, instante):
+        return math.ceil((instante - self._origen) / self.resolucion)
+
+    def programar(self, clave, plazo):
+        """Programa (o reprograma) clave para vencer en el instante `plazo` del reloj"""
+        self.cancelar(clave)
+        tick = max(self._tick + 1, self._tick_de(plazo))
+        ranura = tick % self.ranuras
+        self._ranuras[ranura][clave] = tick
+        self._ubicacion[clave] = ranura
+
+    def programar_en(self, clave, segundos):
+        self.programar(clave, self._reloj() + segundos)
+
+    def cancelar(self, clave):
+        ranura = self._ubicacion.pop(clave, None)
+        if ranura is not None:
+            del self._ranuras[ranura][clave]
+            return True
+        return False
+
+    def avanzar(self, ahora=None):
+        """Lista de claves cuyo plazo ya pasó (quedan fuera de la rueda)"""
+        if ahora is None:
+            ahora = self._reloj()
+        actual = math.floor((ahora - self._origen) / self.resolucion)
+        if actual <= self._tick:
+            return []
+
+        vencidas = []
+        # Tras una pausa larga basta con una vuelta: cada ranura se mira una vez
+        desde = max(self._tick + 1, actual - self.ranuras + 1)
+        for tick in range(desde, actual + 1):
+            ranura = self._ranuras[tick % self.ranuras]
+            if not ranura:
+                continue
+            listas = [clave for clave, vence in ranura.items() if vence <= actual]
+            for clave in listas:
+                del ranura[clave]
+                del self._ubicacion[clave]
+            vencidas.extend(listas)
+        self._tick = actual
+        return vencidas
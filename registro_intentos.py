@@ -0,0 +1,149 @@
+"""
+Registro de intentos de quiz con un escritor en segundo plano
+"""
+import atexit
+import numbers
+import queue
+import threading
+from datetime import datetime
+
+_FIN = object()
+
+
+class Intento:
+    """Intento pendiente de escribir"""
+    __slots__ = ('usuario', 'fecha', 'puntaje', 'total', 'duracion_seg', 'respuestas')
+
+    def __init__(self, usuario, fecha, puntaje, total, duracion_seg, respuestas):
+        self.usuario = usuario
+        self.fecha = fecha
+        self.puntaje = puntaje
+        self.total = total
+        self.duracion_seg = duracion_seg
+        self.respuestas = respuestas
+
+
+def _es_entero(valor):
+    # numbers.Integral también acepta los enteros de NumPy (ids leídos con pandas)
+    return isinstance(valor, numbers.Integral) and not isinstance(valor, bool)
+
+
+def _es_numero(valor):
+    return isinstance(valor, numbers.Real) and not isinstance(valor, bool)
+
+
+def validar_intento(usuario, puntaje, total, respuestas, duracion_seg=None):
+    """Comprueba los campos de un intento; lanza ValueError con el primero inválido"""
+    if not isinstance(usuario, str) or not usuario:
+        raise ValueError(f"usuario debe ser un texto no vacío: {usuario!r}")
+    if not _es_entero(total) or total < 0:
+        raise ValueError(f"total debe ser un entero >= 0: {total!r}")
+    if not _es_entero(puntaje) or not 0 <= puntaje <= total:
+        raise ValueError(f"puntaje debe ser un entero entre 0 y {total}: {puntaje!r}")
+    if duracion_seg is not None and not _es_numero(duracion_seg):
+        raise ValueError(f"duracion_seg debe ser un número: {duracion_seg!r}")
+    for fila in respuestas:
+        if len(fila) != 4 or not _es_entero(fila[0]):
+            raise ValueError(f"respuesta inválida (pregunta_id, elegida, correcta, tiempo_seg): {fila!r}")
+
+
+class EscritorIntentos:
+    """Guarda intentos desde un hilo propio, agrupando varios por transacción.
+
+    registrar() sólo encola y vuelve de inmediato, así que terminar un quiz
+    nunca espera al disco. El hilo toma todo lo que haya en la cola (hasta
+    tamano_lote intentos) y lo escribe en una sola transacción, de modo que
+    muchos envíos simultáneos comparten un único fsync. Si el lote falla se
+    vuelve a escribir cada intento en su propia transacción: sólo se pierde
+    el que la base rechaza (se cuenta en perdidos).
+    """
+
+    def __init__(self, conexiones, tamano_lote=500, espera_lote=0.05):
+        self.conexiones = conexiones
+        self.tamano_lote = tamano_lote
+        self.espera_lote = espera_lote
+        self.escritos = 0
+        self.lotes = 0
+        self.perdidos = 0
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._ejecutar, name="escritor-intentos", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    def registrar(self, usuario, puntaje, total, respuestas, duracion_seg=None):
+        """Encola un intento; respuestas son filas (pregunta_id, elegida, correcta, tiempo_seg).
+
+        Los campos se validan aquí (ValueError), antes de encolar: un intento
+        que la base va a rechazar no debe llegar al hilo escritor.
+        """
+        respuestas = [tuple(fila) for fila in respuestas]
+        validar_intento(usuario, puntaje, total, respuestas, duracion_seg)
+        fecha = datetime.now().isoformat(timespec='seconds')
+        self._cola.put(Intento(usuario, fecha, puntaje, total, duracion_seg, respuestas))
+
+    def vaciar(self):
+        """Bloquea hasta que todo lo encolado esté escrito"""
+        self._cola.join()
+
+    def cerrar(self):
+        """Escribe lo pendiente y detiene el hilo"""
+        if self._hilo.is_alive():
+            self._cola.put(_FIN)
+            self._hilo.join()
+
+    # ---------- hilo escritor ----------
+
+    def _tomar_lote(self, primero):
+        lote = [primero]
+        while len(lote) < self.tamano_lote:
+            try:
+                item = self._cola.get(timeout=self.espera_lote)
+            except queue.Empty:
+                break
+            if item is _FIN:
+                self._cola.task_done()
+                return lote, True
+            lote.append(item)
+        return lote, False
+
+    def _ejecutar(self):
+        terminar = False
+        while not terminar:
+            primero = self._cola.get()
+            if primero is _FIN:
+                self._cola.task_done()
+                break
+            lote, terminar = self._tomar_lote(primero)
+            try:
+                self._escribir(lote)
+            except Exception:
+                self._escribir_por_separado(lote)
+            finally:
+                for _ in lote:
+                    self._cola.task_done()
+        self.conexiones.liberar()
+
+    def _escribir_por_separado(self, lote):
+        """Reintenta un lote fallido intento por intento"""
+        for intento in lote:
+            try:
+                self._escribir([intento])
+            except Exception as e:
+                self.perdidos += 1
+                print(f"Error guardando el intento de {intento.usuario!r} ({intento.fecha}): {e}")
+
+    def _escribir(self, lote):
+        conn = self.conexiones.conexion()
+        with conn:
+            for intento in lote:
+                cursor = conn.execute('''
+                    INSERT INTO intentos (usuario, fecha, puntaje, total, duracion_seg)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (intento.usuario, intento.fecha, intento.puntaje, intento.total, intento.duracion_seg))
+                intento_id = cursor.lastrowid
+                conn.executemany('''
+                    INSERT INTO respuestas (intento_id, posicion, pregunta_id, elegida, correcta, tiempo_seg)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [(intento_id, posicion) + tuple(fila) for posicion, fila in enumerate(intento.respuestas)])
+        self.escritos += len(lote)
+        self.lotes += 1
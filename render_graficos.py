@@ -0,0 +1,76 @@
+"""
+Renderizado de gráficas fuera del hilo de Tk, con caché de imágenes PNG
+"""
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from figuras import PoolFiguras
+
+
+class RenderizadorGraficos:
+    """Dibuja figuras con Agg en un hilo propio y guarda los PNG resultantes.
+
+    Hay un único hilo trabajador porque matplotlib no admite dibujar desde
+    varios hilos a la vez. Las imágenes quedan en una caché LRU indexada por
+    (gráfica, clave de datos, tamaño), así que volver a mostrar los mismos
+    resultados no dibuja nada. Las figuras salen de un PoolFiguras y se
+    limpian al terminar, así que un quiz tras otro no acumula figuras.
+    """
+
+    def __init__(self, max_imagenes=32, dpi=100):
+        self.max_imagenes = max_imagenes
+        self.dpi = dpi
+        self.aciertos = 0
+        self.fallos = 0
+        self._cache = OrderedDict()
+        self._pendientes = {}
+        self._lock = threading.Lock()
+        self.figuras = PoolFiguras(max_por_tamano=1, dpi=dpi)
+        self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graficos")
+
+    def solicitar(self, nombre, funcion, datos, clave, tamano=(6, 4)):
+        """Devuelve un Future con los bytes PNG de funcion(fig, datos).
+
+        Si la imagen ya está en caché el Future se entrega resuelto; si ya se
+        está dibujando, se comparte el mismo Future.
+        """
+        clave_imagen = (nombre, clave, tuple(tamano))
+        with self._lock:
+            png = self._cache.get(clave_imagen)
+            if png is not None:
+                self._cache.move_to_end(clave_imagen)
+                self.aciertos += 1
+                futuro = Future()
+                futuro.set_result(png)
+                return futuro
+            futuro = self._pendientes.get(clave_imagen)
+            if futuro is None:
+                self.fallos += 1
+                futuro = self._ejecutor.submit(self._dibujar, clave_imagen, funcion, datos, tamano)
+                self._pendientes[clave_imagen] = futuro
+            return futuro
+
+    def en_cache(self, nombre, clave, tamano=(6, 4)):
+        with self._lock:
+            return (nombre, clave, tuple(tamano)) in self._cache
+
+    def _dibujar(self, clave_imagen, funcion, datos, tamano):
+        try:
+            buffer = io.BytesIO()
+            with self.figuras.prestar(tamano) as fig:
+                funcion(fig, datos)
+                fig.savefig(buffer, format='png', dpi=self.dpi)
+            png = buffer.getvalue()
+            with self._lock:
+                self._cache[clave_imagen] = png
+                while len(self._cache) > self.max_imagenes:
+                    self._cache.popitem(last=False)
+            return png
+        finally:
+            with self._lock:
+                self._pendientes.pop(clave_imagen, None)
+
+    def cerrar(self):
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,435 @@
+"""
+Servidor local HTTP/JSON de sesiones de quiz (sin interfaz gráfica).
+
+Permite tomar un mismo examen a todo un curso desde una sola máquina: cada
+estudiante tiene una sesión en memoria con su propio QuizEngine y todas
+comparten el mismo gestor de conexiones SQLite.
+
+Uso:
+    python servidor_sesiones.py --db quiz_economia.db --puerto 8765
+
+Endpoints:
+    POST /sesiones                      {"categorias": [...], "temas": [...], "dificultad": 2, "n": 8,
+                                         "usuario": "ana", "limite_seg": 600}
+                                        usuario es obligatorio (texto no vacío)
+                                        opcional: "estratos": "dificultad" | "tema" | "categoria"
+                                        reparte las n preguntas parejo entre estratos, o según
+                                        "cuotas": {"1": 3, "2": 3, "3": 2}; "semilla" fija el
+                                        examen (por defecto, el id de la sesión)
+    GET  /sesiones/<id>/pregunta        pregunta actual (sin la respuesta correcta);
+                                        con ?i=N salta antes a la pregunta N (desde 0)
+    POST /sesiones/<id>/respuesta       {"letra": "b"}  marca la respuesta y avanza
+    POST /sesiones/<id>/finalizar       puntaje y detalle; el intento se guarda y la sesión se descarta
+    GET  /salud                         sesiones activas
+
+Al vencer el límite de tiempo la sesión se califica y guarda sola; desde ese
+momento pregunta/respuesta devuelven 410 y finalizar entrega el resultado.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from conexiones import obtener_gestor
+from esquema import crear_esquema
+from motor_quiz import CAMPOS_PREGUNTA, PreguntaQuiz, QuizEngine
+from muestreo import muestrear_ids
+from muestreo_estratificado import CAMPOS_ESTRATO, MuestreadorEstratificado
+from indice_memoria import IndiceColumnar
+from listas_sql import EN_LISTA, lista_json, seleccion_por_ids
+from planificador_plazos import RuedaPlazos
+from registro_intentos import EscritorIntentos
+
+MAX_CUERPO = 64 * 1024
+MAX_PREGUNTAS = 200
+LIMITE_SEG = 600
+MAX_LIMITE_SEG = 24 * 3600
+MAX_RESULTADOS = 10_000
+LOTE_VENCIDAS = 500
+RAZONES = {200: 'OK', 201: 'Created', 400: 'Bad Request', 404: 'Not Found',
+           405: 'Method Not Allowed', 409: 'Conflict', 410: 'Gone', 413: 'Payload Too Large',
+           500: 'Internal Server Error'}
+
+
+class ErrorHTTP(Exception):
+    """Error con código de estado HTTP para devolver al cliente"""
+
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+        self.mensaje = mensaje
+
+
+# =============== BANCO Y SESIONES ===============
+
+class BancoSesiones:
+    """Acceso al banco de preguntas para el servidor (sin pandas)"""
+
+    def __init__(self, conexiones):
+        self.conexiones = conexiones
+        conn = self.conexiones.conexion()
+        crear_esquema(conn.cursor())
+        conn.commit()
+        self._estratificado = None
+        self._lock = threading.Lock()
+
+    def temas_disponibles(self, categorias):
+        conn = self.conexiones.conexion()
+        query = f'SELECT DISTINCT tema FROM estadisticas_banco WHERE categoria {EN_LISTA}'
+        return [fila[0] for fila in conn.execute(query, [lista_json(categorias)])]
+
+    def muestrear(self, categorias, temas, dificultad=None, n=8):
+        """Devuelve hasta n preguntas al azar como registros PreguntaQuiz"""
+        conn = self.conexiones.conexion()
+        if not temas:
+            temas = self.temas_disponibles(categorias)
+        ids = muestrear_ids(conn, categorias, temas, dificultad, n)
+        return self._por_ids(ids)
+
+    def muestrear_estratificado(self, categorias, temas, dificultad=None, n=8, por='dificultad',
+                                cuotas=None, semilla=None):
+        """Como muestrear, pero balanceado entre estratos y reproducible con la semilla"""
+        with self._lock:
+            if self._estratificado is None:
+                self._estratificado = MuestreadorEstratificado(IndiceColumnar(self.conexiones))
+        ids = self._estratificado.muestrear_ids(categorias, temas or None, dificultad, n,
+                                                por, cuotas, semilla)
+        return self._por_ids(ids)
+
+    def _por_ids(self, ids):
+        conn = self.conexiones.conexion()
+        query = seleccion_por_ids(CAMPOS_PREGUNTA)
+        return [PreguntaQuiz(*fila) for fila in conn.execute(query, [lista_json(ids)])]
+
+
+class Sesion:
+    """Estado en memoria de un estudiante"""
+    __slots__ = ('motor', 'usuario', 'creada', 'plazo')
+
+    def __init__(self, motor, usuario, limite_seg):
+        self.motor = motor
+        self.usuario = usuario
+        self.creada = time.monotonic()
+        self.plazo = self.creada + limite_seg
+
+
+class ServidorSesiones:
+    """Servidor asyncio con las sesiones activas en memoria.
+
+    Los límites de tiempo de todas las sesiones viven en una sola RuedaPlazos;
+    una tarea revisa la rueda una vez por tick y finaliza las sesiones vencidas
+    en lotes de LOTE_VENCIDAS, cediendo el bucle entre lotes para que una
+    ola de vencimientos no congele las demás peticiones. Sus resultados se
+    guardan (hasta MAX_RESULTADOS) para que el cliente los recoja con /finalizar.
+    """
+
+    def __init__(self, db_path, hilos_db=4, limite_seg=LIMITE_SEG):
+        self.banco = BancoSesiones(obtener_gestor(db_path))
+        self.registro = EscritorIntentos(self.banco.conexiones)
+        self.limite_seg = limite_seg
+        self.sesiones = {}
+        self.plazos = RuedaPlazos(resolucion=1.0)
+        self.resultados = OrderedDict()
+        self.vencidas = 0
+        self._por_vencer = deque()
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos_db, thread_name_prefix="sesiones-db")
+        self._servidor = None
+        self._vigilante = None
+
+    # ---------- operaciones ----------
+
+    async def crear_sesion(self, datos):
+        categorias = (self._validar_textos('categorias', datos.get('categorias'))
+                      or ['micro', 'macro', 'finanzas'])
+        temas = self._validar_textos('temas', datos.get('temas')) or []
+        usuario = datos.get('usuario')
+        if not isinstance(usuario, str) or not usuario.strip():
+            raise ErrorHTTP(400, "usuario debe ser un texto no vacío")
+        dificultad = datos.get('dificultad')
+        n = datos.get('n', 8)
+        if isinstance(n, bool) or not isinstance(n, int) or not 1 <= n <= MAX_PREGUNTAS:
+            raise ErrorHTTP(400, f"n debe ser un entero entre 1 y {MAX_PREGUNTAS}")
+        # True == 1 en Python: sin el chequeo de tipo, true pasaría como dificultad 1
+        if isinstance(dificultad, bool) or dificultad not in (None, 1, 2, 3):
+            raise ErrorHTTP(400, "dificultad debe ser 1, 2 o 3")
+        limite = datos.get('limite_seg', self.limite_seg)
+        if isinstance(limite, bool) or not isinstance(limite, (int, float)) or not 0 < limite <= MAX_LIMITE_SEG:
+            raise ErrorHTTP(400, f"limite_seg debe ser un número entre 0 y {MAX_LIMITE_SEG}")
+
+        por = datos.get('estratos')
+        cuotas = datos.get('cuotas')
+        if por is not None and por not in CAMPOS_ESTRATO:
+            raise ErrorHTTP(400, f"estratos debe ser uno de {', '.join(CAMPOS_ESTRATO)}")
+        if cuotas is not None:
+            cuotas = self._validar_cuotas(por, cuotas)
+
+        sesion_id = secrets.token_urlsafe(12)
+        loop = asyncio.get_running_loop()
+        if por is None:
+            preguntas = await loop.run_in_executor(self._ejecutor, self.banco.muestrear,
+                                                   categorias, temas, dificultad, n)
+        else:
+            # Sin semilla explícita se usa el id de la sesión: el examen se puede reconstruir
+            semilla = datos.get('semilla', sesion_id)
+            if isinstance(semilla, bool) or not isinstance(semilla, (int, str)):
+                raise ErrorHTTP(400, "semilla debe ser un entero o un texto")
+            try:
+                preguntas = await loop.run_in_executor(
+                    self._ejecutor, self.banco.muestrear_estratificado,
+                    categorias, temas, dificultad, n, por, cuotas, semilla)
+            except ValueError as e:
+                raise ErrorHTTP(409, str(e))
+        if not preguntas:
+            raise ErrorHTTP(409, "No hay preguntas para esta selección")
+
+        sesion = Sesion(QuizEngine(preguntas), usuario, limite)
+        self.sesiones[sesion_id] = sesion
+        self.plazos.programar(sesion_id, sesion.plazo)
+        respuesta = {'sesion': sesion_id, 'total': len(preguntas), 'limite_seg': limite}
+        if por is not None:
+            respuesta['semilla'] = semilla
+        return 201, respuesta
+
+    @staticmethod
+    def _validar_textos(campo, valores):
+        """Una lista de textos del JSON (None si no vino)"""
+        if valores is not None and (not isinstance(valores, list) or
+                                    not all(isinstance(v, str) for v in valores)):
+            raise ErrorHTTP(400, f"{campo} debe ser una lista de textos")
+        return valores
+
+    @staticmethod
+    def _validar_cuotas(por, cuotas):
+        """Convierte {"estrato": cantidad} del JSON; las claves de dificultad pasan a enteros"""
+        if por is None:
+            raise ErrorHTTP(400, "cuotas requiere estratos")
+        if not isinstance(cuotas, dict) or not all(
+                isinstance(c, int) and not isinstance(c, bool) and c >= 0 for c in cuotas.values()):
+            raise ErrorHTTP(400, "cuotas debe ser un objeto {estrato: cantidad >= 0}")
+        if not 1 <= sum(cuotas.values()) <= MAX_PREGUNTAS:
+            raise ErrorHTTP(400, f"las cuotas deben sumar entre 1 y {MAX_PREGUNTAS}")
+        if por == 'dificultad':
+            try:
+                return {int(clave): cantidad for clave, cantidad in cuotas.items()}
+            except ValueError:
+                raise ErrorHTTP(400, "las claves de cuotas por dificultad deben ser 1, 2 o 3")
+        return cuotas
+
+    def _sesion(self, sesion_id):
+        sesion = self.sesiones.get(sesion_id)
+        if sesion is None:
+            if sesion_id in self.resultados:
+                raise ErrorHTTP(410, "La sesión terminó por tiempo")
+            raise ErrorHTTP(404, "Sesión no encontrada")
+        return sesion
+
+    def pregunta(self, sesion_id, indice=None):
+        sesion = self._sesion(sesion_id)
+        motor = sesion.motor
+        if indice is not None and not motor.ir_a(indice):
+            raise ErrorHTTP(400, f"i debe estar entre 0 y {motor.total - 1}")
+        pregunta = motor.pregunta_actual()
+        motor.iniciar_pregunta()
+        return 200, {
+            'indice': motor.idx,
+            'total': motor.total,
+            'tema': pregunta.tema,
+            'dificultad': pregunta.dificultad,
+            'pregunta': pregunta.pregunta,
+            'opciones': {letra: pregunta[f'opcion_{letra}'] for letra in 'abcd'},
+            'elegida': motor.elegidas[motor.idx],
+            'respondidas': motor.n_respondidas,
+            'restante_seg': round(max(0.0, sesion.plazo - time.monotonic()), 1),
+        }
+
+    def responder(self, sesion_id, datos):
+        motor = self._sesion(sesion_id).motor
+        letra = str(datos.get('letra', '')).lower()
+        if letra not in ('a', 'b', 'c', 'd'):
+            raise ErrorHTTP(400, "letra debe ser a, b, c o d")
+        motor.marcar_respuesta(letra)
+        avanzo = motor.ir_siguiente()
+        return 200, {'indice': motor.idx, 'ultima': not avanzo}
+
+    def finalizar(self, sesion_id):
+        if sesion_id in self.resultados:
+            return 200, self.resultados.pop(sesion_id)
+        sesion = self._sesion(sesion_id)
+        self.plazos.cancelar(sesion_id)
+        return 200, self._cerrar(sesion_id, sesion)
+
+    def _cerrar(self, sesion_id, sesion, vencida=False):
+        """Califica, encola el intento y descarta la sesión; devuelve el resultado"""
+        motor = sesion.motor
+        puntaje, total, aciertos = motor.finalizar_compacto()
+        del self.sesiones[sesion_id]
+        filas = motor.filas_respuestas(aciertos)
+        self.registro.registrar(sesion.usuario, puntaje, total, filas,
+                                duracion_seg=time.monotonic() - sesion.creada)
+        detalle = [{'id': pregunta_id, 'elegida': elegida, 'correcta': pregunta.correcta,
+                    'acierto': bool(acierto), 'tiempo_seg': tiempo}
+                   for (pregunta_id, elegida, acierto, tiempo), pregunta in zip(filas, motor.preguntas)]
+        return {'usuario': sesion.usuario, 'puntaje': puntaje, 'total': total,
+                'vencida': vencida, 'detalle': detalle}
+
+    @property
+    def pendientes_de_vencer(self):
+        return len(self._por_vencer)
+
+    def vencer_plazos(self, ahora=None, maximo=None):
+        """Finaliza sesiones cuyo plazo pasó (hasta `maximo` por llamada); devuelve cuántas"""
+        self._por_vencer.extend(self.plazos.avanzar(ahora))
+        vencidas = 0
+        while self._por_vencer and (maximo is None or vencidas < maximo):
+            sesion_id = self._por_vencer.popleft()
+            sesion = self.sesiones.get(sesion_id)
+            if sesion is None:
+                continue
+            self.resultados[sesion_id] = self._cerrar(sesion_id, sesion, vencida=True)
+            vencidas += 1
+        while len(self.resultados) > MAX_RESULTADOS:
+            self.resultados.popitem(last=False)
+        self.vencidas += vencidas
+        return vencidas
+
+    async def _vigilar_plazos(self):
+        while True:
+            await asyncio.sleep(self.plazos.resolucion)
+            try:
+                self.vencer_plazos(maximo=LOTE_VENCIDAS)
+                while self._por_vencer:
+                    await asyncio.sleep(0)
+                    self.vencer_plazos(maximo=LOTE_VENCIDAS)
+            except Exception as e:
+                print(f"Error venciendo sesiones: {e}")
+
+    # ---------- HTTP ----------
+
+    async def _despachar(self, metodo, ruta, cuerpo):
+        url = urlsplit(ruta)
+        partes = [p for p in url.path.split('/') if p]
+        datos = {}
+        if cuerpo:
+            try:
+                datos = json.loads(cuerpo)
+            except json.JSONDecodeError:
+                raise ErrorHTTP(400, "El cuerpo no es JSON válido")
+            if not isinstance(datos, dict):
+                raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON")
+
+        if partes == ['salud'] and metodo == 'GET':
+            return 200, {'sesiones': len(self.sesiones), 'vencidas': self.vencidas}
+        if partes == ['sesiones'] and metodo == 'POST':
+            return await self.crear_sesion(datos)
+        if len(partes) == 3 and partes[0] == 'sesiones':
+            sesion_id, accion = partes[1], partes[2]
+            if accion == 'pregunta' and metodo == 'GET':
+                indice = parse_qs(url.query).get('i')
+                if indice is not None:
+                    try:
+                        indice = int(indice[0])
+                    except ValueError:
+                        raise ErrorHTTP(400, "i debe ser un entero")
+                return self.pregunta(sesion_id, indice)
+            if accion == 'respuesta' and metodo == 'POST':
+                return self.responder(sesion_id, datos)
+            if accion == 'finalizar' and metodo == 'POST':
+                return self.finalizar(sesion_id)
+            raise ErrorHTTP(405, "Método no permitido")
+        raise ErrorHTTP(404, "Ruta no encontrada")
+
+    async def _atender(self, reader, writer):
+        try:
+            while True:
+                linea = await reader.readline()
+                if not linea:
+                    break
+                metodo, ruta, _ = linea.decode('latin-1').split(' ', 2)
+
+                cabeceras = {}
+                while True:
+                    cabecera = await reader.readline()
+                    if cabecera in (b'\r\n', b'\n', b''):
+                        break
+                    nombre, _, valor = cabecera.decode('latin-1').partition(':')
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+
+                try:
+                    largo = int(cabeceras.get('content-length') or 0)
+                except ValueError:
+                    largo = -1
+                try:
+                    if largo < 0:
+                        # Sin un largo válido no se sabe dónde termina el cuerpo
+                        raise ErrorHTTP(400, "Content-Length inválido")
+                    if largo > MAX_CUERPO:
+                        raise ErrorHTTP(413, "Cuerpo demasiado grande")
+                    cuerpo = await reader.readexactly(largo) if largo else b''
+                    estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                except ErrorHTTP as e:
+                    estado, respuesta = e.estado, {'error': e.mensaje}
+                except Exception as e:
+                    estado, respuesta = 500, {'error': str(e)}
+
+                datos = json.dumps(respuesta, ensure_ascii=False).encode('utf-8')
+                cerrar = cabeceras.get('connection', '').lower() == 'close' or estado == 413 or largo < 0
+                writer.write(
+                    f"HTTP/1.1 {estado} {RAZONES.get(estado, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(datos)}\r\n"
+                    f"Connection: {'close' if cerrar else 'keep-alive'}\r\n\r\n".encode('latin-1') + datos)
+                await writer.drain()
+                if cerrar:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def iniciar(self, host='127.0.0.1', puerto=8765):
+        """Empieza a escuchar; devuelve el puerto real (útil con puerto=0)"""
+        self._servidor = await asyncio.start_server(self._atender, host, puerto)
+        self._vigilante = asyncio.create_task(self._vigilar_plazos())
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def detener(self):
+        if self._vigilante is not None:
+            self._vigilante.cancel()
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        self._ejecutor.shutdown(wait=False)
+        self.registro.cerrar()
+
+
+async def _principal(args):
+    servidor = ServidorSesiones(args.db, limite_seg=args.limite)
+    puerto = await servidor.iniciar(args.host, args.puerto)
+    print(f"Servidor de sesiones escuchando en http://{args.host}:{puerto}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.detener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de sesiones de quiz")
+    parser.add_argument('--db', default='quiz_economia.db')
+    parser.add_argument('--host', default='127.0.0.1', help='por defecto sólo localhost')
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--limite', type=float, default=LIMITE_SEG,
+                        help='límite de tiempo por sesión en segundos')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_principal(args))
+    except KeyboardInterrupt:
+        print("Servidor detenido")
+
+
+if __name__ == "__main__":
+    main()
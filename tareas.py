@@ -0,0 +1,99 @@
+"""
+Consultas en segundo plano con entrega de resultados en el hilo de Tk
+"""
+import queue
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EjecutorTareas:
+    """Corre funciones en un pool de hilos y entrega sus resultados en el hilo de Tk.
+
+    Cada tarea lleva una clave ('temas', 'quiz', ...). Lanzar otra tarea con
+    la misma clave deja obsoleta a la anterior: si todavía no empezó se
+    cancela, y si ya estaba corriendo su resultado se descarta sin llamar a
+    sus callbacks. Los hilos sólo escriben en una cola; la cola se revisa con
+    root.after mientras haya tareas vigentes, así que los callbacks siempre
+    corren en el hilo de Tk y, sin trabajo pendiente, no hay sondeo.
+    """
+
+    def __init__(self, root, hilos=2, intervalo_ms=30):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.descartadas = 0
+        self._cola = queue.Queue()
+        self._generacion = {}
+        self._vigentes = {}
+        self._revisando = False
+        self._ejecutor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="tareas")
+
+    def lanzar(self, clave, funcion, *args, al_terminar=None, al_fallar=None):
+        """Ejecuta funcion(*args) en segundo plano, reemplazando la tarea vigente de clave.
+
+        al_terminar(resultado) o al_fallar(error) se llaman en el hilo de Tk,
+        sólo si nadie lanzó ni canceló otra tarea con la misma clave antes.
+        """
+        self.cancelar(clave)
+        generacion = self._generacion.get(clave, 0) + 1
+        self._generacion[clave] = generacion
+        futuro = self._ejecutor.submit(self._correr, clave, generacion, funcion, args)
+        self._vigentes[clave] = (generacion, futuro, al_terminar, al_fallar)
+        self._programar_revision()
+        return generacion
+
+    def cancelar(self, clave):
+        """Deja obsoleta la tarea vigente de clave (True si había una)"""
+        vigente = self._vigentes.pop(clave, None)
+        if vigente is None:
+            return False
+        self._generacion[clave] += 1
+        vigente[1].cancel()
+        return True
+
+    def ocupada(self, clave):
+        return clave in self._vigentes
+
+    def _correr(self, clave, generacion, funcion, args):
+        try:
+            self._cola.put((clave, generacion, funcion(*args), None))
+        except Exception as e:
+            self._cola.put((clave, generacion, None, e))
+
+    def _programar_revision(self):
+        if not self._revisando:
+            self._revisando = True
+            self.root.after(self.intervalo_ms, self._revisar)
+
+    def _revisar(self):
+        """Hilo de Tk: entrega los resultados vigentes y descarta los obsoletos"""
+        self._revisando = False
+        try:
+            while True:
+                try:
+                    clave, generacion, resultado, error = self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                vigente = self._vigentes.get(clave)
+                if vigente is None or vigente[0] != generacion:
+                    self.descartadas += 1
+                    continue
+                del self._vigentes[clave]
+                _, _, al_terminar, al_fallar = vigente
+                if error is not None:
+                    if al_fallar is None:
+                        raise error
+                    al_fallar(error)
+                elif al_terminar is not None:
+                    al_terminar(resultado)
+        finally:
+            # Un callback que falla no debe dejar sin entregar a los demás
+            if self._vigentes:
+                try:
+                    self._programar_revision()
+                except tk.TclError:
+                    # La ventana ya se cerró
+                    self._revisando = False
+
+    def cerrar(self):
+        self._vigentes.clear()
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,106 @@
+"""
+Caché de consultas: claves normalizadas, desalojo LRU por entradas y bytes,
+e invalidación sólo cuando cambian las preguntas
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_consultas import CacheLRU, VersionBanco, clave_filtro
+from conexiones import GestorConexiones
+from esquema import crear_esquema, insertar_preguntas
+
+
+class VersionFija:
+    """Versión controlada por la prueba"""
+
+    def __init__(self):
+        self.valor = 0
+
+    def actual(self):
+        return self.valor
+
+
+class TestCacheLRU(unittest.TestCase):
+
+    def test_clave_filtro_normalizada(self):
+        self.assertEqual(clave_filtro('filtrar', ['b', 'a', 'a'], ('y', 'x'), '2'),
+                         clave_filtro('filtrar', ('a', 'b'), ['x', 'y'], 2))
+        self.assertNotEqual(clave_filtro('temas', ['a']), clave_filtro('temas', ['a'], []))
+        self.assertEqual(clave_filtro('temas', ['a'], dificultad=0)[-1], None)
+
+    def test_desaloja_la_menos_usada(self):
+        cache = CacheLRU(max_entradas=2)
+        cache.obtener('a', lambda: [1])
+        cache.obtener('b', lambda: [2])
+        self.assertEqual(cache.obtener('a', lambda: self.fail('a debía estar guardada')), [1])
+        cache.obtener('c', lambda: [3])
+
+        self.assertEqual(cache.obtener('b', lambda: ['recalculada']), ['recalculada'])
+        self.assertEqual((cache.aciertos, cache.fallos, cache.desalojos), (1, 4, 2))
+        self.assertEqual(len(cache), 2)
+
+    def test_limite_de_bytes(self):
+        cache = CacheLRU(max_bytes=2000)
+        grande = list(range(1000))
+        self.assertIs(cache.obtener('grande', lambda: grande), grande)
+        self.assertEqual((len(cache), cache.bytes), (0, 0))
+        for i in range(20):
+            cache.obtener(i, lambda: list(range(20)))
+        self.assertLessEqual(cache.bytes, 2000)
+        self.assertGreater(cache.desalojos, 0)
+
+    def test_invalidacion_por_version(self):
+        version = VersionFija()
+        cache = CacheLRU(version)
+        cache.obtener('a', lambda: 1)
+        version.valor = 1
+        self.assertEqual(cache.obtener('a', lambda: 2), 2)
+        self.assertEqual(cache.invalidaciones, 1)
+
+        # Si el banco cambia mientras se calcula, el resultado no se guarda
+        def calcular():
+            version.valor = 2
+            return 3
+        self.assertEqual(cache.obtener('b', calcular), 3)
+        self.assertEqual(cache.obtener('b', lambda: 4), 4)
+
+
+class TestVersionBanco(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        ruta = os.path.join(self.tmp.name, 'banco.db')
+        self.externa = sqlite3.connect(ruta)
+        crear_esquema(self.externa.cursor())
+        self.externa.commit()
+        self.conexiones = GestorConexiones(ruta)
+        self.version = VersionBanco(self.conexiones)
+
+    def tearDown(self):
+        self.version.cerrar()
+        self.conexiones.cerrar()
+        self.externa.close()
+        self.tmp.cleanup()
+
+    def test_solo_cambia_con_las_preguntas(self):
+        cache = CacheLRU(self.version)
+        cache.obtener('temas', lambda: ['oferta'])
+        with self.externa:
+            self.externa.execute("INSERT INTO intentos (usuario, fecha, puntaje, total) "
+                                 "VALUES ('ana', '2024-01-01', 1, 1)")
+        self.assertEqual(cache.obtener('temas', lambda: ['otra']), ['oferta'])
+
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(),
+                               [('micro', 'demanda', 1, 'P', 'A', 'B', 'C', 'D', 'a')])
+        self.assertEqual(cache.obtener('temas', lambda: ['demanda', 'oferta']), ['demanda', 'oferta'])
+        self.assertEqual(cache.invalidaciones, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
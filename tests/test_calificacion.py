@@ -0,0 +1,82 @@
+"""
+Calificación vectorizada: las preguntas sin responder no suman, los lotes
+califican por estudiante y por pregunta, y QuizEngine entrega los tiempos
+"""
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calificacion import (SIN_RESPUESTA, calificar, calificar_lote, codificar_letras,
+                          decodificar_codigos)
+from motor_quiz import QuizEngine
+
+
+def _pregunta(i, correcta):
+    return (i, 'micro', 'oferta', 1, f'Pregunta {i}', 'A', 'B', 'C', 'D', correcta)
+
+
+class TestCalificacion(unittest.TestCase):
+
+    def test_codificar_y_decodificar(self):
+        codigos = codificar_letras(['a', 'B', '', 'x', 'd'])
+        self.assertEqual(codigos.dtype, np.int8)
+        self.assertEqual(codigos.tolist(), [0, 1, SIN_RESPUESTA, SIN_RESPUESTA, 3])
+        self.assertEqual(decodificar_codigos(codigos), ['a', 'b', '', '', 'd'])
+
+    def test_calificar(self):
+        aciertos, puntaje, tiempos = calificar(codificar_letras(['a', '', 'c', 'a']),
+                                               codificar_letras(['a', 'b', 'd', 'a']))
+        self.assertEqual(aciertos.tolist(), [True, False, False, True])
+        self.assertEqual(puntaje, 2)
+        self.assertEqual(tiempos.tolist(), [0.0] * 4)
+
+        _, _, tiempos = calificar(codificar_letras(['a']), codificar_letras(['a']), [1.5])
+        self.assertEqual(tiempos.dtype, np.float64)
+        self.assertEqual(tiempos.tolist(), [1.5])
+
+    def test_calificar_lote(self):
+        hojas = np.array([codificar_letras(h) for h in (['a', 'b', 'c'], ['a', '', 'd'], ['', '', ''])])
+        clave = codificar_letras(['a', 'b', 'c'])
+        _, puntajes, tasa = calificar_lote(hojas, clave)
+        self.assertEqual(puntajes.tolist(), [3, 1, 0])
+        self.assertEqual(np.round(tasa, 3).tolist(), [0.667, 0.333, 0.333])
+
+        # Una clave por estudiante (formas distintas del examen)
+        claves = np.array([codificar_letras(c) for c in (['a', 'b', 'c'], ['a', 'a', 'd'], ['a', 'a', 'a'])])
+        _, puntajes, _ = calificar_lote(hojas, claves)
+        self.assertEqual(puntajes.tolist(), [3, 2, 0])
+
+        _, puntajes, tasa = calificar_lote(np.empty((0, 3), dtype=np.int8), clave)
+        self.assertEqual((puntajes.tolist(), tasa.tolist()), ([], [0.0, 0.0, 0.0]))
+
+
+class TestQuizEngine(unittest.TestCase):
+
+    def test_respuestas_y_tiempos(self):
+        motor = QuizEngine([_pregunta(i, c) for i, c in enumerate('abcd', start=1)])
+        motor.iniciar_pregunta()
+        motor.marcar_respuesta('b')
+        motor.marcar_respuesta('a')
+        motor.ir_siguiente()
+        motor.iniciar_pregunta()
+        motor.marcar_respuesta('c')
+        motor.ir_a(3)
+        motor.iniciar_pregunta()
+        motor.marcar_respuesta('d')
+        motor.marcar_respuesta('')
+        self.assertEqual(motor.n_respondidas, 2)
+
+        correctas, total, aciertos = motor.finalizar_compacto()
+        self.assertEqual((correctas, total), (1, 4))
+        filas = motor.filas_respuestas(aciertos)
+        self.assertEqual([fila[:3] for fila in filas], [(1, 'a', 1), (2, 'c', 0), (3, '', 0), (4, '', 0)])
+        self.assertTrue(all(fila[3] >= 0 for fila in filas))
+        self.assertEqual(len(motor.tiempos_finales), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+"""
+crear_esquema sobre una base existente borra los índices obsoletos y crea
+los actuales
+"""
+import os
+import sqlite3
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import INDICES, INDICES_OBSOLETOS, crear_esquema
+
+
+class TestIndices(unittest.TestCase):
+
+    def _indices(self, conn):
+        return {fila[0] for fila in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'")}
+
+    def test_borra_obsoletos_de_bases_existentes(self):
+        conn = sqlite3.connect(':memory:')
+        crear_esquema(conn.cursor())
+        conn.execute("CREATE INDEX idx_preguntas_dificultad ON preguntas (dificultad)")
+        conn.execute("CREATE INDEX idx_preguntas_cat_tema_dif ON preguntas (categoria, tema, dificultad)")
+
+        crear_esquema(conn.cursor())
+
+        indices = self._indices(conn)
+        self.assertEqual(indices, {nombre for nombre, *_ in INDICES})
+        self.assertFalse(indices & set(INDICES_OBSOLETOS))
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
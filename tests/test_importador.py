@@ -0,0 +1,107 @@
+"""
+Importador: validación de filas, duplicados por hash y archivos CSV/JSONL
+con líneas que no son preguntas
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import GestorConexiones
+from importador import COLUMNAS, importar, validar_fila
+
+VALIDA = {'categoria': 'micro', 'tema': 'oferta', 'dificultad': 2, 'pregunta': '¿Qué es la oferta?',
+          'opcion_a': 'A', 'opcion_b': 'B', 'opcion_c': 'C', 'opcion_d': 'D', 'correcta': 'B'}
+
+
+def _pregunta(i, **cambios):
+    return {**VALIDA, 'pregunta': f'Pregunta {i}', **cambios}
+
+
+class TestValidarFila(unittest.TestCase):
+
+    def test_fila_valida(self):
+        fila = validar_fila({**VALIDA, 'dificultad': '3', 'tema': ' oferta '})
+        self.assertEqual(fila, ('micro', 'oferta', 3, '¿Qué es la oferta?', 'A', 'B', 'C', 'D', 'b'))
+        self.assertEqual(validar_fila({**VALIDA, 'dificultad': 2.0})[2], 2)
+
+    def test_filas_rechazadas(self):
+        for cambio in ({'pregunta': ''}, {'tema': None}, {'dificultad': 'alta'}, {'dificultad': 4},
+                       {'dificultad': 2.7}, {'dificultad': True}, {'dificultad': '2.5'},
+                       {'correcta': 'e'}):
+            with self.subTest(cambio=cambio), self.assertRaises(ValueError):
+                validar_fila({**VALIDA, **cambio})
+
+
+class TestImportar(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta_db = os.path.join(self.tmp.name, 'banco.db')
+        self.conexiones = GestorConexiones(self.ruta_db)
+
+    def tearDown(self):
+        self.conexiones.cerrar()
+        self.tmp.cleanup()
+
+    def _archivo(self, nombre, contenido):
+        ruta = os.path.join(self.tmp.name, nombre)
+        with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+            archivo.write(contenido)
+        return ruta
+
+    def _jsonl(self, nombre, lineas):
+        return self._archivo(nombre, ''.join(
+            (linea if isinstance(linea, str) else json.dumps(linea)) + '\n' for linea in lineas))
+
+    def _csv(self, nombre, filas):
+        lineas = [','.join(COLUMNAS)] + [
+            ','.join(str(f[c]) for c in COLUMNAS) if isinstance(f, dict) else f for f in filas]
+        return self._archivo(nombre, '\r\n'.join(lineas) + '\r\n')
+
+    def _preguntas(self):
+        conn = sqlite3.connect(self.ruta_db)
+        try:
+            return [fila[0] for fila in conn.execute("SELECT pregunta FROM preguntas ORDER BY id")]
+        finally:
+            conn.close()
+
+    def test_lineas_jsonl_que_no_son_objetos(self):
+        ruta = self._jsonl('banco.jsonl', [_pregunta(1), '42', 'null', '[1]', '"texto"',
+                                           '{no es json', _pregunta(2)])
+        resultado = importar(ruta, self.conexiones)
+
+        self.assertEqual((resultado.leidas, resultado.insertadas, resultado.rechazadas), (7, 2, 5))
+        self.assertEqual(self._preguntas(), ['Pregunta 1', 'Pregunta 2'])
+
+    def test_csv_con_campos_de_mas(self):
+        fila = ','.join(str(_pregunta(2)[c]) for c in COLUMNAS)
+        ruta = self._csv('banco.csv', [_pregunta(1), fila + ',sobra', _pregunta(3)])
+        resultado = importar(ruta, self.conexiones)
+
+        self.assertEqual((resultado.insertadas, resultado.rechazadas), (2, 1))
+        self.assertEqual(self._preguntas(), ['Pregunta 1', 'Pregunta 3'])
+
+    def test_duplicados_entre_csv_y_jsonl(self):
+        # Mismo contenido salvo mayúsculas, espacios y dificultad: duplicado
+        csv_ruta = self._csv('banco.csv', [_pregunta(1), _pregunta(2), _pregunta(1),
+                                           _pregunta(3, dificultad=9)])
+        jsonl_ruta = self._jsonl('banco.jsonl', [_pregunta(2, dificultad=1, pregunta=' PREGUNTA 2 '),
+                                                 _pregunta(4), {'categoria': 'micro'}])
+
+        primero = importar(csv_ruta, self.conexiones, tamano_lote=2)
+        segundo = importar(jsonl_ruta, self.conexiones)
+
+        self.assertEqual((primero.leidas, primero.insertadas, primero.duplicadas, primero.rechazadas),
+                         (4, 2, 1, 1))
+        self.assertEqual((segundo.leidas, segundo.insertadas, segundo.duplicadas, segundo.rechazadas),
+                         (3, 1, 1, 1))
+        self.assertEqual(self._preguntas(), ['Pregunta 1', 'Pregunta 2', 'Pregunta 4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
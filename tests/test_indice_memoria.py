@@ -0,0 +1,85 @@
+"""
+Regresión: el índice columnar sigue respondiendo después de inserciones y
+borrados hechos desde otra conexión
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import GestorConexiones
+from esquema import crear_esquema, insertar_preguntas
+from indice_memoria import IndiceColumnar
+
+
+def _filas(desde, hasta, tema='oferta'):
+    return [('micro', tema, 1 + i % 3, f'Pregunta {i}', 'A', 'B', 'C', 'D', 'a')
+            for i in range(desde, hasta)]
+
+
+class TestIndiceColumnarCambiosExternos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, 'banco.db')
+        self.externa = sqlite3.connect(self.ruta)
+        crear_esquema(self.externa.cursor())
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(), _filas(0, 51))
+        self.conexiones = GestorConexiones(self.ruta)
+        self.indice = IndiceColumnar(self.conexiones)
+
+    def tearDown(self):
+        self.indice.cerrar()
+        self.conexiones.cerrar()
+        self.externa.close()
+        self.tmp.cleanup()
+
+    def test_insercion_entre_consultas(self):
+        self.assertEqual(len(self.indice.filtrar_ids(['micro'], ['oferta'])), 51)
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(), _filas(51, 52, tema='demanda'))
+
+        ids = self.indice.muestrear_ids(['micro'], ['oferta', 'demanda'], n=100)
+        self.assertEqual(len(ids), 52)
+        self.assertEqual(self.indice.temas_disponibles(['micro']), ['demanda', 'oferta'])
+
+    def test_borrado_entre_consultas(self):
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(), _filas(51, 53, tema='demanda'))
+        self.assertEqual(self.indice.temas_disponibles(['micro']), ['demanda', 'oferta'])
+        with self.externa:
+            self.externa.execute("DELETE FROM preguntas WHERE tema = 'demanda'")
+
+        self.assertEqual(self.indice.temas_disponibles(['micro']), ['oferta'])
+        self.assertEqual(len(self.indice.filtrar_ids(['micro'], ['oferta', 'demanda'])), 51)
+        self.assertEqual(self.indice.contar(['micro']), 51)
+
+    def test_actualizacion_e_insercion_entre_consultas(self):
+        self.assertEqual(self.indice.temas_disponibles(['micro']), ['oferta'])
+        # El conteo cuadra con "sólo inserciones", pero la fila 1 cambió de tema
+        with self.externa:
+            self.externa.execute("UPDATE preguntas SET tema = 'costos' WHERE id = 1")
+            insertar_preguntas(self.externa.cursor(), _filas(51, 52, tema='demanda'))
+
+        self.assertEqual(self.indice.temas_disponibles(['micro']), ['costos', 'demanda', 'oferta'])
+        self.assertEqual(self.indice.filtrar_ids(['micro'], ['costos']).tolist(), [1])
+        self.assertEqual(len(self.indice.filtrar_ids(['micro'], ['oferta'])), 50)
+
+    def test_esquema_anterior_sin_marca(self):
+        # Base creada antes de la marca modificaciones: crear_esquema la agrega
+        with self.externa:
+            self.externa.execute("DROP TRIGGER trg_modificaciones_borrar")
+            self.externa.execute("DROP TRIGGER trg_modificaciones_actualizar")
+            self.externa.execute("ALTER TABLE version_banco DROP COLUMN modificaciones")
+            crear_esquema(self.externa.cursor())
+            self.externa.execute("UPDATE preguntas SET dificultad = 3 WHERE id = 1")
+        self.assertEqual(self.externa.execute(
+            "SELECT modificaciones FROM version_banco").fetchone()[0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Instantánea: exportar y volver a abrir da las mismas filas que SQLite, la
+versión se lee junto con las filas y una cabecera que no entra en lo
+reservado es un error, no un archivo corrido
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instantanea
+from esquema import crear_esquema, insertar_preguntas, leer_version_banco
+from instantanea import Instantanea, exportar
+from motor_quiz import CAMPOS_PREGUNTA
+
+
+class TestInstantanea(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, 'banco.snap')
+        self.conn = sqlite3.connect(os.path.join(self.tmp.name, 'banco.db'))
+        crear_esquema(self.conn.cursor())
+        filas = [(('micro', 'macro')[i % 2], f'tema {i % 5}', 1 + i % 3, f'¿Pregunta {i}? ñandú €',
+                  'A', 'B', '', 'D' * i, 'abcd'[i % 4]) for i in range(60)]
+        with self.conn:
+            insertar_preguntas(self.conn.cursor(), filas)
+            self.conn.execute("DELETE FROM preguntas WHERE id % 7 = 0")
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def _filas_sqlite(self, where='1'):
+        return self.conn.execute(
+            f"SELECT {', '.join(CAMPOS_PREGUNTA)} FROM preguntas WHERE {where} ORDER BY id").fetchall()
+
+    def test_ida_y_vuelta(self):
+        self.assertEqual(exportar(self.conn, self.ruta), len(self._filas_sqlite()))
+        self.assertFalse(self.conn.in_transaction)
+
+        snap = Instantanea(self.ruta)
+        try:
+            self.assertEqual(snap.version_banco, leer_version_banco(self.conn))
+            self.assertEqual([snap.fila(i) for i in range(len(snap))], self._filas_sqlite())
+            self.assertEqual(snap.filtrar_filas(['macro'], ['tema 1', 'tema 3'], 2),
+                             self._filas_sqlite("categoria = 'macro' AND tema IN ('tema 1', 'tema 3') "
+                                                "AND dificultad = 2"))
+            self.assertEqual([fila[0] for fila in snap.por_ids([9, 7, 1])], [9, 1])
+        finally:
+            snap.cerrar()
+
+    def test_respeta_la_transaccion_del_llamador(self):
+        self.conn.execute("BEGIN")
+        exportar(self.conn, self.ruta)
+        self.assertTrue(self.conn.in_transaction)
+        self.conn.rollback()
+
+    def test_cabecera_que_no_entra_en_la_reserva(self):
+        # Offsets enormes: la cabecera final supera lo reservado
+        with mock.patch.object(instantanea, '_alinear', lambda posicion: posicion + 10 ** 120):
+            with self.assertRaises(ValueError):
+                exportar(self.conn, self.ruta)
+        self.assertFalse(os.path.exists(self.ruta))
+        self.assertFalse(self.conn.in_transaction)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+"""
+muestrear_ids: selecciones chicas se muestrean de forma exacta (cualquier
+par de preguntas puede salir junto); la ventana respeta el filtro.
+Reservorios: muestras uniformes, reproducibles por semilla y en una pasada
+"""
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import muestreo
+from esquema import crear_esquema, insertar_preguntas
+from muestreo import muestrear_filas, muestrear_ids, reservorios_cursor
+
+
+class CursorLista:
+    """Lo mínimo de un cursor: fetchmany sobre una lista"""
+
+    def __init__(self, filas):
+        self.filas = filas
+        self.posicion = 0
+
+    def fetchmany(self, cantidad):
+        lote = self.filas[self.posicion:self.posicion + cantidad]
+        self.posicion += len(lote)
+        return lote
+
+
+class ConBanco(unittest.TestCase):
+    """100 preguntas de micro: 40 de oferta y 60 de demanda"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = sqlite3.connect(os.path.join(self.tmp.name, 'banco.db'))
+        cursor = self.conn.cursor()
+        crear_esquema(cursor)
+        filas = [('micro', 'oferta' if i < 40 else 'demanda', 1 + i % 3, f'Pregunta {i}',
+                  'A', 'B', 'C', 'D', 'a') for i in range(100)]
+        with self.conn:
+            insertar_preguntas(cursor, filas)
+        self.oferta = {fila[0] for fila in self.conn.execute("SELECT id FROM preguntas WHERE tema = 'oferta'")}
+
+    def tearDown(self):
+        self.conn.close()
+        self.tmp.cleanup()
+
+
+class TestMuestrearIds(ConBanco):
+
+    def test_seleccion_chica_es_exacta(self):
+        rng = random.Random(7)
+        pares = set()
+        for _ in range(3000):
+            ids = muestrear_ids(self.conn, ['micro'], ['oferta'], n=2, rng=rng)
+            self.assertEqual(len(ids), 2)
+            self.assertLessEqual(set(ids), self.oferta)
+            pares.add(frozenset(ids))
+        # Con la ventana de 8 claves saldrían a lo sumo unos 40·7 pares distintos
+        total_pares = len(list(itertools.combinations(self.oferta, 2)))
+        self.assertGreater(len(pares), 0.9 * total_pares)
+
+    def test_ventana_respeta_el_filtro(self):
+        rng = random.Random(3)
+        dificultad_2 = {fila[0] for fila in self.conn.execute(
+            "SELECT id FROM preguntas WHERE tema = 'oferta' AND dificultad = 2")}
+        with mock.patch.object(muestreo, 'SELECCION_EXACTA', 0):
+            for _ in range(50):
+                ids = muestrear_ids(self.conn, ['micro'], ['oferta'], n=3, rng=rng)
+                self.assertEqual(len(set(ids)), 3)
+                self.assertLessEqual(set(ids), self.oferta)
+                ids = muestrear_ids(self.conn, ['micro'], ['oferta'], dificultad=2, n=20, rng=rng)
+                self.assertEqual(set(ids), dificultad_2)
+
+
+class TestReservorios(unittest.TestCase):
+
+    def test_menos_filas_que_k(self):
+        rng = random.Random(1)
+        muestra, = reservorios_cursor(CursorLista(list(range(3))), 5, [rng])
+        self.assertEqual(sorted(muestra), [0, 1, 2])
+        self.assertEqual(reservorios_cursor(CursorLista(list(range(3))), 0, [rng, rng]), [[], []])
+
+    def test_uniforme_entre_lotes(self):
+        # Lotes de 3: los reemplazos caen en lotes distintos y pasan por el heap
+        rngs = [random.Random(semilla) for semilla in range(4)]
+        veces = [0] * 20
+        repeticiones = 2500
+        for _ in range(repeticiones):
+            for muestra in reservorios_cursor(CursorLista(list(range(20))), 5, rngs, lote=3):
+                self.assertEqual(len(set(muestra)), 5)
+                for elemento in muestra:
+                    veces[elemento] += 1
+        esperado = repeticiones * len(rngs) * 5 / 20
+        for elemento, cantidad in enumerate(veces):
+            with self.subTest(elemento=elemento):
+                self.assertAlmostEqual(cantidad / esperado, 1, delta=0.08)
+
+    def test_misma_semilla_misma_muestra(self):
+        filas = list(range(1000))
+
+        def muestras(*semillas):
+            return reservorios_cursor(CursorLista(filas), 8, [random.Random(s) for s in semillas], lote=64)
+
+        primera, segunda = muestras(11, 12)
+        self.assertEqual(muestras(11)[0], primera)
+        self.assertEqual(muestras(12, 11), [segunda, primera])
+        self.assertNotEqual(primera, segunda)
+
+
+class TestMuestrearFilas(ConBanco):
+
+    def test_respeta_el_filtro(self):
+        rngs = [random.Random(1), random.Random(2)]
+        muestras = muestrear_filas(self.conn, ['id', 'tema', 'dificultad'], ['micro'], ['oferta'], 3, 5, rngs)
+        self.assertEqual(len(muestras), 2)
+        for muestra in muestras:
+            self.assertEqual(len(muestra), 5)
+            for id_, tema, dificultad in muestra:
+                self.assertIn(id_, self.oferta)
+                self.assertEqual((tema, dificultad), ('oferta', 3))
+        self.assertEqual(muestrear_filas(self.conn, ['id'], ['micro'], [], rngs=rngs), [[], []])
+
+
+if __name__ == '__main__':
+    unittest.main()
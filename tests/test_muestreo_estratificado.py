@@ -0,0 +1,102 @@
+"""
+Muestreo estratificado: Floyd elige posiciones distintas, las cuotas se
+reparten parejas y los exámenes se reconstruyen con la misma semilla
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import GestorConexiones
+from esquema import crear_esquema, insertar_preguntas
+from indice_memoria import IndiceColumnar
+from muestreo_estratificado import MuestreadorEstratificado, indices_floyd, repartir
+
+
+def _filas(desde, hasta, dificultad=None, tema=None):
+    return [('micro', tema or ('oferta', 'demanda')[i % 2], dificultad or 1 + i % 3, f'Pregunta {i}',
+             'A', 'B', 'C', 'D', 'a') for i in range(desde, hasta)]
+
+
+class TestFunciones(unittest.TestCase):
+
+    def test_indices_floyd(self):
+        rng = random.Random(5)
+        self.assertEqual(indices_floyd(6, 6, rng), set(range(6)))
+        self.assertEqual(indices_floyd(6, 0, rng), set())
+        veces = Counter()
+        for _ in range(4000):
+            elegidos = indices_floyd(10, 3, rng)
+            self.assertEqual(len(elegidos), 3)
+            self.assertLessEqual(elegidos, set(range(10)))
+            veces.update(elegidos)
+        for posicion in range(10):
+            self.assertAlmostEqual(veces[posicion] / 1200, 1, delta=0.1)
+
+    def test_repartir(self):
+        rng = random.Random(2)
+        self.assertEqual(repartir(9, {1: 10, 2: 10, 3: 10}, rng), {1: 3, 2: 3, 3: 3})
+        # Lo que no cabe en el estrato chico pasa a los otros
+        self.assertEqual(repartir(9, {1: 1, 2: 10, 3: 10}, rng), {1: 1, 2: 4, 3: 4})
+        self.assertEqual(repartir(50, {1: 2, 2: 3}, rng), {1: 2, 2: 3})
+        sobrantes = Counter()
+        for _ in range(300):
+            cuotas = repartir(4, {1: 10, 2: 10, 3: 10}, rng)
+            self.assertEqual(sorted(cuotas.values()), [1, 1, 2])
+            sobrantes.update(clave for clave, cuota in cuotas.items() if cuota == 2)
+        self.assertEqual(set(sobrantes), {1, 2, 3})
+
+
+class TestMuestreadorEstratificado(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, 'banco.db')
+        self.externa = sqlite3.connect(self.ruta)
+        crear_esquema(self.externa.cursor())
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(), _filas(0, 60))
+        self.conexiones = GestorConexiones(self.ruta)
+        self.indice = IndiceColumnar(self.conexiones)
+        self.muestreador = MuestreadorEstratificado(self.indice)
+        self.dificultad = dict(self.externa.execute("SELECT id, dificultad FROM preguntas"))
+
+    def tearDown(self):
+        self.indice.cerrar()
+        self.conexiones.cerrar()
+        self.externa.close()
+        self.tmp.cleanup()
+
+    def test_balanceado_y_reproducible(self):
+        ids = self.muestreador.muestrear_ids(['micro'], ['oferta', 'demanda'], n=9, semilla='curso-1')
+        self.assertEqual(len(set(ids)), 9)
+        self.assertEqual(Counter(self.dificultad[i] for i in ids), {1: 3, 2: 3, 3: 3})
+        self.assertEqual(self.muestreador.muestrear_ids(['micro'], ['oferta', 'demanda'], n=9,
+                                                        semilla='curso-1'), ids)
+
+        formas = self.muestreador.formas(range(20), ['micro'], ['oferta'], n=4, por='dificultad')
+        self.assertEqual(len({tuple(sorted(forma)) for forma in formas}), 20)
+
+    def test_cuotas(self):
+        ids = self.muestreador.muestrear_ids(['micro'], ['oferta', 'demanda'], cuotas={3: 5}, semilla=1)
+        self.assertEqual([self.dificultad[i] for i in ids], [3] * 5)
+        with self.assertRaises(ValueError):
+            self.muestreador.muestrear_ids(['micro'], ['oferta', 'demanda'], cuotas={3: 21})
+        with self.assertRaises(ValueError):
+            self.muestreador.muestrear_ids(['micro'], ['oferta'], por='autor')
+
+    def test_estratos_se_renuevan_con_el_indice(self):
+        self.assertEqual(set(self.muestreador.estratos(['micro'], ['oferta'], por='tema')), {'oferta'})
+        with self.externa:
+            insertar_preguntas(self.externa.cursor(), _filas(60, 63, tema='oferta', dificultad=2))
+        estratos = self.muestreador.estratos(['micro'], ['oferta'])
+        self.assertEqual({clave: len(ids) for clave, ids in estratos.items()}, {1: 10, 2: 13, 3: 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
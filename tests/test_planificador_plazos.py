@@ -0,0 +1,77 @@
+"""
+Rueda de plazos: nada vence antes de su plazo, cancelar y reprogramar son
+inmediatos y los plazos de más de una vuelta esperan su vuelta
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from planificador_plazos import RuedaPlazos
+
+
+class Reloj:
+    """Reloj manual para la rueda"""
+
+    def __init__(self):
+        self.ahora = 100.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestRuedaPlazos(unittest.TestCase):
+
+    def setUp(self):
+        self.reloj = Reloj()
+        self.rueda = RuedaPlazos(resolucion=1.0, ranuras=4, reloj=self.reloj)
+
+    def _avanzar(self, segundos):
+        self.reloj.ahora = 100.0 + segundos
+        return sorted(self.rueda.avanzar())
+
+    def test_no_vence_antes_de_tiempo(self):
+        self.rueda.programar_en('a', 2.5)
+        self.rueda.programar_en('b', 3)
+        self.assertEqual(self._avanzar(2.9), [])
+        self.assertEqual(self._avanzar(3.0), ['a', 'b'])
+        self.assertEqual(len(self.rueda), 0)
+        self.assertEqual(self._avanzar(4), [])
+
+    def test_cancelar_y_reprogramar(self):
+        self.rueda.programar_en('a', 1)
+        self.rueda.programar_en('b', 1)
+        self.assertTrue(self.rueda.cancelar('a'))
+        self.assertFalse(self.rueda.cancelar('a'))
+        self.rueda.programar_en('b', 3)
+        self.assertNotIn('a', self.rueda)
+        self.assertEqual(self._avanzar(2), [])
+        self.assertEqual(self._avanzar(3), ['b'])
+
+    def test_plazo_de_mas_de_una_vuelta(self):
+        # Con 4 ranuras, el plazo 10 cae en la misma ranura que el tick 2 y el 6
+        self.rueda.programar_en('lejos', 10)
+        self.rueda.programar_en('cerca', 2)
+        self.assertEqual(self._avanzar(2), ['cerca'])
+        self.assertEqual(self._avanzar(6), [])
+        self.assertIn('lejos', self.rueda)
+        self.assertEqual(self._avanzar(10), ['lejos'])
+
+    def test_plazo_pasado_y_pausa_larga(self):
+        self._avanzar(5)
+        # Un plazo ya pasado vence en el próximo tick, no en el actual
+        self.rueda.programar('pasado', self.reloj.ahora - 3)
+        self.assertEqual(self._avanzar(5.5), [])
+        self.assertEqual(self._avanzar(6), ['pasado'])
+
+        claves = [f's{i}' for i in range(10)]
+        for i, clave in enumerate(claves):
+            self.rueda.programar_en(clave, i + 0.5)
+        # Una pausa de varias vueltas devuelve todo lo vencido de una vez
+        self.assertEqual(self._avanzar(100), sorted(claves))
+        self.assertEqual(len(self.rueda), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
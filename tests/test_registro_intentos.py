@@ -0,0 +1,68 @@
+"""
+El escritor de intentos: un intento que la base rechaza no arrastra al
+resto de su lote, y registrar() valida antes de encolar
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conexiones import GestorConexiones
+from esquema import crear_esquema
+from registro_intentos import EscritorIntentos, Intento
+
+
+class TestEscritorIntentos(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        ruta = os.path.join(self.tmp.name, 'banco.db')
+        conn = sqlite3.connect(ruta)
+        crear_esquema(conn.cursor())
+        conn.commit()
+        conn.close()
+        self.conexiones = GestorConexiones(ruta)
+        # Espera de lote larga: los intentos encolados juntos van en un solo lote
+        self.escritor = EscritorIntentos(self.conexiones, espera_lote=0.5)
+
+    def tearDown(self):
+        self.escritor.cerrar()
+        self.conexiones.cerrar()
+        self.tmp.cleanup()
+
+    def _usuarios(self):
+        conn = sqlite3.connect(self.conexiones.db_path)
+        try:
+            return sorted(fila[0] for fila in conn.execute("SELECT usuario FROM intentos"))
+        finally:
+            conn.close()
+
+    def test_intento_rechazado_no_descarta_el_lote(self):
+        self.escritor.registrar('ana', 1, 1, [(1, 'a', 1, 2.0)])
+        # Pasa la validación de registrar, pero viola el CHECK de respuestas.correcta
+        self.escritor.registrar('beto', 1, 1, [(2, 'b', 2, 1.0)])
+        # Como si viniera de una versión sin validación: usuario NULL
+        self.escritor._cola.put(Intento(None, '2024-01-01T00:00:00', 0, 1, None, []))
+        self.escritor.registrar('carla', 0, 1, [(3, 'c', 0, 4.0)])
+        self.escritor.vaciar()
+
+        self.assertEqual(self._usuarios(), ['ana', 'carla'])
+        self.assertEqual(self.escritor.perdidos, 2)
+        self.assertEqual(self.escritor.escritos, 2)
+
+    def test_registrar_valida_los_campos(self):
+        for usuario, puntaje, total, respuestas in (
+                (None, 0, 1, []), ('', 0, 1, []), (5, 0, 1, []),
+                ('ana', 2, 1, []), ('ana', True, 1, []), ('ana', 0, '1', []),
+                ('ana', 0, 1, [(1, 'a')])):
+            with self.assertRaises(ValueError):
+                self.escritor.registrar(usuario, puntaje, total, respuestas)
+        self.escritor.vaciar()
+        self.assertEqual(self._usuarios(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
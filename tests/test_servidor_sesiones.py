@@ -0,0 +1,111 @@
+"""
+Validación de entrada del servidor de sesiones: cuerpos mal formados
+devuelven 400 con un mensaje, nunca 500 ni una conexión cerrada sin respuesta
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from esquema import crear_esquema, insertar_preguntas
+from servidor_sesiones import ServidorSesiones
+
+VALIDO = {'categorias': ['micro'], 'temas': ['oferta'], 'usuario': 'ana', 'n': 3}
+
+
+async def _pedir(puerto, solicitud):
+    """Envía una solicitud HTTP cruda; devuelve (estado, cuerpo JSON) o None si no hubo respuesta"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    try:
+        writer.write(solicitud)
+        await writer.drain()
+        linea = await reader.readline()
+        if not linea:
+            return None
+        estado = int(linea.split()[1])
+        largo = 0
+        while True:
+            cabecera = await reader.readline()
+            if cabecera in (b'\r\n', b''):
+                break
+            nombre, _, valor = cabecera.decode('latin-1').partition(':')
+            if nombre.lower() == 'content-length':
+                largo = int(valor)
+        return estado, json.loads(await reader.readexactly(largo))
+    finally:
+        writer.close()
+
+
+def _post(cuerpo, content_length=None):
+    datos = json.dumps(cuerpo).encode('utf-8')
+    largo = len(datos) if content_length is None else content_length
+    return (f"POST /sesiones HTTP/1.1\r\nContent-Length: {largo}\r\n"
+            f"Connection: close\r\n\r\n").encode('latin-1') + datos
+
+
+class TestValidacionServidor(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.tmp.name, 'banco.db')
+        conn = sqlite3.connect(self.ruta)
+        crear_esquema(conn.cursor())
+        with conn:
+            insertar_preguntas(conn.cursor(), [('micro', 'oferta', 1 + i % 3, f'Pregunta {i}',
+                                                'A', 'B', 'C', 'D', 'a') for i in range(10)])
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _con_servidor(self, prueba):
+        async def correr():
+            servidor = ServidorSesiones(self.ruta)
+            puerto = await servidor.iniciar(puerto=0)
+            try:
+                return await prueba(puerto)
+            finally:
+                await servidor.detener()
+        return asyncio.run(correr())
+
+    def test_campos_invalidos_devuelven_400(self):
+        casos = [
+            {'usuario': None}, {'usuario': 5}, {'usuario': ['ana']}, {'usuario': {}}, {'usuario': ''},
+            {'categorias': 'micro'}, {'categorias': 3}, {'temas': 'oferta'}, {'temas': ['oferta', 1]},
+            {'dificultad': True}, {'dificultad': 4}, {'n': True}, {'n': 0},
+        ]
+
+        async def prueba(puerto):
+            resultados = []
+            for cambio in casos:
+                resultados.append(await _pedir(puerto, _post({**VALIDO, **cambio})))
+            sin_usuario = {k: v for k, v in VALIDO.items() if k != 'usuario'}
+            resultados.append(await _pedir(puerto, _post(sin_usuario)))
+            resultados.append(await _pedir(puerto, _post(VALIDO)))
+            return resultados
+
+        resultados = self._con_servidor(prueba)
+        for cambio, (estado, cuerpo) in zip(casos + ['sin usuario'], resultados):
+            with self.subTest(cambio=cambio):
+                self.assertEqual(estado, 400)
+                self.assertIn('error', cuerpo)
+        estado, cuerpo = resultados[-1]
+        self.assertEqual(estado, 201)
+        self.assertEqual(cuerpo['total'], 3)
+
+    def test_content_length_invalido(self):
+        async def prueba(puerto):
+            return [await _pedir(puerto, _post(VALIDO, content_length=largo)) for largo in (-5, 'x')]
+
+        for estado, cuerpo in self._con_servidor(prueba):
+            self.assertEqual(estado, 400)
+            self.assertIn('Content-Length', cuerpo['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()